@@ -1,11 +1,37 @@
 """
 TrackBets Backend - Package Initialization
 ==========================================
-Exports all modules for easy imports.
+Exports all modules for easy imports. Submodules are loaded on first
+attribute access, so importing one module (e.g. api.backend.main) does not
+pull in the others.
 """
 
-from .scrapers import get_stock_price, get_news, get_reddit_posts, fetch_all_data
-from .brain import FinancialAnalyst, quick_analyze
+from importlib import import_module
+
+from dotenv import load_dotenv
+
+# Module-level settings are read from the environment at import time, so
+# .env has to be loaded before any submodule.
+load_dotenv()
+
+_EXPORTS = {
+    'get_stock_price': '.scrapers',
+    'get_news': '.scrapers',
+    'get_reddit_posts': '.scrapers',
+    'fetch_all_data': '.scrapers',
+    'FinancialAnalyst': '.brain',
+    'quick_analyze': '.brain',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'get_stock_price',
@@ -5,13 +5,60 @@ Google Gemini-powered financial analysis with strict JSON output.
 """
 
 import os
+import re
 import json
-import time
+import math
+import hashlib
+import threading
 from typing import Dict, Optional
-from dotenv import load_dotenv
-import google.generativeai as genai
 
-load_dotenv()
+from .cache import TTLCache
+from .json_stream import IncrementalJSONParser
+from .ratelimit import acquire
+from .breaker import guard, circuit_open
+from .metrics import stage, record_fallback
+from .news_store import NEW_HEADLINE_TAG
+from .replay import upstream, upstream_stream
+
+MODEL_NAME = "gemini-2.5-flash"
+
+
+# ============================================================================
+# SHARED MODEL CLIENT
+# ============================================================================
+_models: Dict[str, "genai.GenerativeModel"] = {}
+_model_lock = threading.Lock()
+
+
+def get_model(api_key: Optional[str]) -> Optional["genai.GenerativeModel"]:
+    """
+    Return the process-wide Gemini model for api_key, configuring the SDK only
+    the first time. The model object is stateless between calls and safe to
+    share across request threads.
+    """
+    if not api_key:
+        return None
+    with _model_lock:
+        model = _models.get(api_key)
+        if model is None:
+            # The SDK takes most of a second to import; load it on first use
+            # rather than on every process start.
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(MODEL_NAME)
+            _models[api_key] = model
+        return model
+
+
+_TICKER_LINE = re.compile(r"Ticker: '?([^\s']+)")
+
+
+def _replay_key(prompt: str) -> str:
+    """Record/replay key of a Gemini prompt: its ticker plus a hash of the prompt."""
+    match = _TICKER_LINE.search(prompt)
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+    return f"{match.group(1) if match else '-'}|{digest}"
 
 
 # ============================================================================
@@ -48,9 +95,7 @@ def generate_flashcard(ticker: str, user_context: dict, market_data: dict, deep_
             "ai_explanation": "Verdict generated using rule-based metrics due to missing AI key."
         }
 
-    # Configure Gemini
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.5-flash")
+    model = get_model(api_key)
     
     context_str = f"""
     STOCK: {ticker}
@@ -74,14 +119,17 @@ def generate_flashcard(ticker: str, user_context: dict, market_data: dict, deep_
     }}
     """
     
-    # Retry Logic (3 attempts)
+    # Retry Logic (3 attempts), paced by the Gemini request budget
     for attempt in range(3):
+        if circuit_open("gemini") or not acquire("gemini"):
+            break
         try:
-            response = model.generate_content(prompt)
-            clean_text = response.text.replace("```json", "").replace("```", "").strip()
+            with guard("gemini"):
+                text = upstream("gemini", _replay_key(prompt), lambda: model.generate_content(prompt).text)
+            clean_text = text.replace("```json", "").replace("```", "").strip()
             return json.loads(clean_text)
         except:
-            time.sleep(1)
+            continue
             
     # Final Fallback after retries
     signal, reasons = rule_based_verdict(market_data)
@@ -107,11 +155,8 @@ class FinancialAnalyst:
     
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_API_KEY")
-        self.model = None
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel("gemini-2.5-flash")
-        else:
+        self.model = get_model(self.api_key)
+        if not self.model:
             print("[BRAIN] Warning: GOOGLE_API_KEY not found in environment")
 
     def get_ticker_identity(self, ticker: str) -> Dict:
@@ -143,8 +188,14 @@ Example Output:
 Target Ticker: {ticker}"""
 
         try:
-            response = self.model.generate_content(f"{system_prompt}\n\n{user_prompt}")
-            return self._parse_response(response.text)
+            if circuit_open("gemini"):
+                raise RuntimeError("Gemini circuit open")
+            if not acquire("gemini"):
+                raise RuntimeError("Gemini request budget exhausted")
+            prompt = f"{system_prompt}\n\n{user_prompt}"
+            with guard("gemini"):
+                text = upstream("gemini", _replay_key(prompt), lambda: self.model.generate_content(prompt).text)
+            return self._parse_response(text)
             
         except Exception as e:
             print(f"[BRAIN] Identity error: {str(e)}")
@@ -195,8 +246,14 @@ Target Ticker: {ticker}"""
         }}"""
         
         try:
-            response = self.model.generate_content(f"{system_prompt}\n\n{user_prompt}")
-            return self._parse_response(response.text)
+            if circuit_open("gemini"):
+                raise RuntimeError("Gemini circuit open")
+            if not acquire("gemini"):
+                raise RuntimeError("Gemini request budget exhausted")
+            prompt = f"{system_prompt}\n\n{user_prompt}"
+            with guard("gemini"):
+                text = upstream("gemini", _replay_key(prompt), lambda: self.model.generate_content(prompt).text)
+            return self._parse_response(text)
         except Exception as e:
             print(f"[BRAIN] Search error: {e}")
             return {"error": "Search failed"}
@@ -212,12 +269,73 @@ Target Ticker: {ticker}"""
         Returns:
             Dict with verdict, confidence, reasons, and explanation
         """
-        if not self.model:
-            return self._fallback_response("AI model not available - GOOGLE_API_KEY missing")
+        with stage("analyze"):
+            if not self.model:
+                return self._fallback_response("AI model not available - GOOGLE_API_KEY missing", "no_model")
+            if circuit_open("gemini"):
+                return self._fallback_response("Gemini temporarily unavailable (circuit open)", "circuit_open")
+            if not acquire("gemini"):
+                return self._fallback_response("Gemini request budget exhausted", "budget")
         
-        try:
-            # System prompt enforcing strict JSON output
-            system_prompt = """You are a senior financial analyst at a prestigious hedge fund. 
+            try:
+                # Generate response using Gemini
+                prompt = self._analysis_prompt(context)
+                with guard("gemini"):
+                    text = upstream("gemini", _replay_key(prompt), lambda: self.model.generate_content(prompt).text)
+            
+                # Parse JSON from response
+                return self._parse_response(text)
+            
+            except Exception as e:
+                print(f"[BRAIN] Analysis error: {str(e)}")
+                return self._fallback_response(str(e))
+    
+    def analyze_stream(self, context: str):
+        """
+        Streamed variant of analyze(). Yields events while Gemini generates:
+            ("field", name, value)    - a top-level field became complete
+            ("explanation", delta)    - new ai_explanation text
+            ("result", dict)          - the final parsed verdict (always last)
+        """
+        with stage("analyze_stream"):
+            if not self.model:
+                yield ("result", self._fallback_response("AI model not available - GOOGLE_API_KEY missing", "no_model"))
+                return
+            if circuit_open("gemini"):
+                yield ("result", self._fallback_response("Gemini temporarily unavailable (circuit open)", "circuit_open"))
+                return
+            if not acquire("gemini"):
+                yield ("result", self._fallback_response("Gemini request budget exhausted", "budget"))
+                return
+        
+            parser = IncrementalJSONParser()
+            sent_explanation = ""
+            try:
+                # Only opening the stream is timed; generation time depends on output length.
+                prompt = self._analysis_prompt(context)
+                with guard("gemini"):
+                    response = upstream_stream("gemini", _replay_key(prompt),
+                                               lambda: self.model.generate_content(prompt, stream=True))
+                for chunk in response:
+                    for name, value in parser.feed(chunk.text or ""):
+                        if name != "ai_explanation":
+                            yield ("field", name, self._normalize_field(name, value))
+                
+                    explanation = parser.partial("ai_explanation") or ""
+                    if len(explanation) > len(sent_explanation):
+                        yield ("explanation", explanation[len(sent_explanation):])
+                        sent_explanation = explanation
+            
+                yield ("result", self._parse_response(parser.buffer))
+            
+            except Exception as e:
+                print(f"[BRAIN] Streaming analysis error: {str(e)}")
+                yield ("result", self._fallback_response(str(e)))
+    
+    def _analysis_prompt(self, context: str) -> str:
+        """Full verdict prompt (system + user) for a context string."""
+        # System prompt enforcing strict JSON output
+        system_prompt = """You are a senior financial analyst at a prestigious hedge fund. 
 You analyze stocks using fundamental analysis, technical indicators, news sentiment, and social media trends.
 
 CRITICAL INSTRUCTION: You MUST respond with ONLY valid JSON. No markdown, no code blocks, no explanation outside the JSON.
@@ -241,23 +359,14 @@ Guidelines:
 - Be specific in reasons, cite actual data points
 - Be concise and punchy in the explanation"""
 
-            # User prompt with the actual data
-            user_prompt = f"""Analyze this stock and provide your verdict:
+        # User prompt with the actual data
+        user_prompt = f"""Analyze this stock and provide your verdict:
 
 {context}
 
 Remember: Respond with ONLY the JSON object, no other text."""
 
-            # Generate response using Gemini
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
-            response = self.model.generate_content(full_prompt)
-            
-            # Parse JSON from response
-            return self._parse_response(response.text)
-            
-        except Exception as e:
-            print(f"[BRAIN] Analysis error: {str(e)}")
-            return self._fallback_response(str(e))
+        return f"{system_prompt}\n\n{user_prompt}"
     
     def _parse_response(self, response_text: str) -> Dict:
         """Parse Gemini response and extract JSON."""
@@ -284,22 +393,25 @@ Remember: Respond with ONLY the JSON object, no other text."""
                 if field not in result:
                     result[field] = self._get_default_value(field)
             
-            # Normalize verdict
-            if "verdict" in result and isinstance(result["verdict"], str):
-                result["verdict"] = result["verdict"].upper()
-                if result["verdict"] not in ["BUY", "SELL", "HOLD"]:
-                    result["verdict"] = "HOLD"
-            
-            # Ensure confidence is integer 0-100
-            if "confidence" in result:
-                result["confidence"] = max(0, min(100, int(result["confidence"])))
+            for field in ("verdict", "confidence"):
+                result[field] = self._normalize_field(field, result[field])
             
             return result
             
         except json.JSONDecodeError as e:
             print(f"[BRAIN] JSON parse error: {str(e)}")
             print(f"[BRAIN] Raw response: {response_text[:500]}")
-            return self._fallback_response("Failed to parse AI response")
+            return self._fallback_response("Failed to parse AI response", "parse")
+    
+    def _normalize_field(self, field: str, value):
+        """Normalize verdict to BUY/SELL/HOLD and confidence to an int 0-100."""
+        if field == "verdict" and isinstance(value, str):
+            value = value.upper()
+            if value not in ["BUY", "SELL", "HOLD"]:
+                value = "HOLD"
+        elif field == "confidence":
+            value = max(0, min(100, int(value)))
+        return value
     
     def _get_default_value(self, field: str):
         """Get default value for missing fields."""
@@ -314,8 +426,9 @@ Remember: Respond with ONLY the JSON object, no other text."""
         }
         return defaults.get(field)
     
-    def _fallback_response(self, error_msg: str) -> Dict:
+    def _fallback_response(self, error_msg: str, reason: str = "error") -> Dict:
         """Return a safe fallback response when AI fails."""
+        record_fallback("analyze", reason)
         return {
             "verdict": "HOLD",
             "confidence": 50,
@@ -333,27 +446,125 @@ Remember: Respond with ONLY the JSON object, no other text."""
 
 
 # ============================================================================
-# QUICK ANALYSIS FUNCTION (for simple use cases)
+# PROCESS-WIDE ANALYST
 # ============================================================================
-def quick_analyze(ticker: str, price_data: Dict, news: str, social: str) -> Dict:
+_analyst: Optional[FinancialAnalyst] = None
+_analyst_lock = threading.Lock()
+
+
+def get_analyst() -> FinancialAnalyst:
     """
-    Quick analysis function that combines all data and runs through AI.
+    Return the shared analyst, creating it on first use. App startup calls
+    this on the analyze pool to warm it up.
     """
-    analyst = FinancialAnalyst()
-    
-    # Build context string
+    global _analyst
+    with _analyst_lock:
+        if _analyst is None:
+            _analyst = FinancialAnalyst()
+        return _analyst
+
+
+def shutdown_analyst() -> None:
+    """Drop the shared analyst and model clients (called on app shutdown)."""
+    global _analyst
+    with _analyst_lock:
+        _analyst = None
+    with _model_lock:
+        _models.clear()
+
+
+# ============================================================================
+# VERDICT CACHE
+# ============================================================================
+# Width of a price bucket, in percent. Prices inside the same bucket (and the
+# same headline/post sets) reuse the cached verdict.
+VERDICT_PRICE_BUCKET_PCT = float(os.getenv("VERDICT_PRICE_BUCKET_PCT", "0.5"))
+
+_verdict_cache = TTLCache(
+    maxsize=int(os.getenv("VERDICT_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("VERDICT_CACHE_TTL", "600")),
+    name="verdicts"
+)
+
+_LIST_PREFIX = re.compile(r"^\s*\d+\.\s*")
+_UPVOTES = re.compile(r"\|\s*⬆️\s*-?\d+\s*$")
+_NEW_TAG = re.compile(r"^" + re.escape(NEW_HEADLINE_TAG) + r"\s*")
+
+
+def _price_bucket(price) -> str:
+    """Log-scale bucket so the tolerance is relative to the price."""
+    try:
+        price = float(price)
+    except (TypeError, ValueError):
+        return "NA"
+    if price <= 0:
+        return "NA"
+    return str(math.floor(math.log(price) / math.log1p(VERDICT_PRICE_BUCKET_PCT / 100)))
+
+
+def _text_set_hash(text: str) -> str:
+    """Hash a numbered list of headlines/posts, ignoring order, numbering, [NEW] tags and vote counts."""
+    items = set()
+    for line in (text or "").splitlines():
+        line = _UPVOTES.sub("", _NEW_TAG.sub("", _LIST_PREFIX.sub("", line)))
+        line = " ".join(line.lower().split())
+        if line:
+            items.add(line)
+    return hashlib.sha1("\n".join(sorted(items)).encode("utf-8")).hexdigest()[:16]
+
+
+def analysis_fingerprint(ticker: str, price_data: Dict, news: str, social: str,
+                         indicators: Optional[Dict] = None) -> str:
+    """Normalized key of the inputs quick_analyze feeds to the model."""
+    return "|".join([
+        ticker.upper(),
+        _price_bucket(price_data.get("price")),
+        _text_set_hash(news),
+        _text_set_hash(social),
+        hashlib.sha1(_format_indicators(indicators).encode("utf-8")).hexdigest()[:16],
+    ])
+
+
+def verdict_cache_stats() -> Dict:
+    return _verdict_cache.stats()
+
+
+# ============================================================================
+# QUICK ANALYSIS FUNCTION (for simple use cases)
+# ============================================================================
+_INDICATOR_LABELS = [
+    ("sma_20", "SMA 20"), ("sma_50", "SMA 50"), ("ema_12", "EMA 12"), ("ema_26", "EMA 26"),
+    ("rsi_14", "RSI 14"), ("macd", "MACD"), ("macd_signal", "MACD Signal"), ("macd_hist", "MACD Histogram"),
+    ("bb_upper", "Bollinger Upper"), ("bb_lower", "Bollinger Lower"), ("bb_percent_b", "Bollinger %B"),
+    ("atr_14", "ATR 14"), ("volume_z_20", "Volume Z-Score (20d)"),
+]
+
+
+def _format_indicators(indicators: Optional[Dict]) -> str:
+    if not indicators or "error" in indicators:
+        return ""
+    lines = [f"- {label}: {indicators[key]}" for key, label in _INDICATOR_LABELS
+             if indicators.get(key) is not None]
+    if not lines:
+        return ""
+    return f"\nTECHNICAL INDICATORS (daily, as of {indicators.get('as_of', 'N/A')}):\n" + "\n".join(lines) + "\n"
+
+
+def _build_context(ticker: str, price_data: Dict, news: str, social: str,
+                   indicators: Optional[Dict] = None) -> str:
+    """Combine price, news, social and indicator data into the analyst's context string."""
     currency = price_data.get("currency", "$")
     price = price_data.get("price", "N/A")
     change = price_data.get("change_percent", 0)
     
-    context = f"""
+    return f"""
 STOCK ANALYSIS REQUEST
 ======================
 Ticker: {ticker}
 Current Price: {currency}{price}
 Daily Change: {change}%
 
-RECENT NEWS:
+RECENT NEWS ({NEW_HEADLINE_TAG} = since the last refresh):
 {news}
 
 SOCIAL SENTIMENT (Reddit/Twitter):
@@ -364,12 +575,52 @@ Additional Data:
 - 52-Week High: {price_data.get('52_week_high', 'N/A')}
 - 52-Week Low: {price_data.get('52_week_low', 'N/A')}
 - Volume: {price_data.get('volume', 'N/A')}
-"""
+{_format_indicators(indicators)}"""
+
+
+def quick_analyze(ticker: str, price_data: Dict, news: str, social: str,
+                  indicators: Optional[Dict] = None) -> Dict:
+    """
+    Quick analysis function that combines all data and runs through AI.
+    Verdicts are cached by analysis_fingerprint, so unchanged inputs skip the model.
+    """
+    fingerprint = analysis_fingerprint(ticker, price_data, news, social, indicators)
+    cached = _verdict_cache.get(fingerprint)
+    if cached is not None:
+        return dict(cached)
+    
+    result = get_analyst().analyze(_build_context(ticker, price_data, news, social, indicators))
+    # Fallback responses carry an "error" key; only cache real verdicts.
+    if "error" not in result:
+        _verdict_cache.set(fingerprint, dict(result))
+    return result
+
+
+def quick_analyze_stream(ticker: str, price_data: Dict, news: str, social: str,
+                         indicators: Optional[Dict] = None):
+    """
+    Streaming counterpart of quick_analyze; yields the events of
+    FinancialAnalyst.analyze_stream. A cached verdict is replayed as the
+    same event sequence without calling the model.
+    """
+    fingerprint = analysis_fingerprint(ticker, price_data, news, social, indicators)
+    cached = _verdict_cache.get(fingerprint)
+    if cached is not None:
+        for name, value in cached.items():
+            if name != "ai_explanation":
+                yield ("field", name, value)
+        yield ("explanation", cached.get("ai_explanation", ""))
+        yield ("result", dict(cached))
+        return
     
-    return analyst.analyze(context)
+    for event in get_analyst().analyze_stream(_build_context(ticker, price_data, news, social, indicators)):
+        if event[0] == "result" and "error" not in event[1]:
+            _verdict_cache.set(fingerprint, dict(event[1]))
+        yield event
 
 
 # ============================================================================
 # EXPORTS
 # ============================================================================
-__all__ = ['FinancialAnalyst', 'quick_analyze', 'generate_flashcard', 'rule_based_verdict']
+__all__ = ['FinancialAnalyst', 'quick_analyze', 'quick_analyze_stream', 'generate_flashcard', 'rule_based_verdict', 'analysis_fingerprint', 'verdict_cache_stats',
+           'get_model', 'get_analyst', 'shutdown_analyst']
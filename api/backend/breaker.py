@@ -0,0 +1,252 @@
+"""
+TrackBets Backend - Circuit Breaker Module
+===========================================
+One circuit breaker per upstream data source. Each tracks the outcome and
+latency of its recent calls; when too many fail (or are too slow) the
+circuit opens and callers skip straight to their fallback, until a single
+half-open probe shows the source has recovered.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .metrics import record_upstream, record_rejected
+
+
+# Per-source "slow call" threshold in seconds: calls slower than this count
+# as failures even if they succeed. Override with BREAKER_SLOW_CALL_<SOURCE>.
+DEFAULT_SLOW_CALL_SECONDS = {
+    "yfinance_info": 5.0,
+    "yfinance_history": 8.0,
+    "twelvedata": 5.0,
+    "googlenews": 8.0,
+    "reddit": 8.0,
+    "ddgs": 8.0,
+    "gemini": 30.0,
+}
+SOURCES = list(DEFAULT_SLOW_CALL_SECONDS)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Calls remembered per source, and how many are needed before it can trip.
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+# Failure share of the window that opens the circuit.
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+# Seconds an open circuit waits before letting one probe through.
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a source whose circuit is open."""
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+class CircuitBreaker:
+    """Sliding-window breaker: closed -> open -> half-open (one probe) -> closed."""
+
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate: float = BREAKER_FAILURE_RATE, open_seconds: float = BREAKER_OPEN_SECONDS,
+                 slow_call_seconds: float = 5.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self._outcomes = deque(maxlen=window)  # (ok, latency seconds)
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    def _current_state(self, now: float) -> str:
+        if self._state == STATE_OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = STATE_HALF_OPEN
+            self._probing = False
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected (open, or half-open with a probe in flight)."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == STATE_OPEN or (state == STATE_HALF_OPEN and self._probing)
+
+    def allow(self) -> bool:
+        """Reserve a call. In half-open state only one probe is let through."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, ok: bool, latency: float, error: Optional[str] = None) -> None:
+        """Record the outcome of an allowed call."""
+        if ok and latency > self.slow_call_seconds:
+            ok, error = False, f"slow call ({latency:.1f}s)"
+        with self._lock:
+            self.calls += 1
+            self._outcomes.append((ok, latency))
+            if not ok:
+                self.failures += 1
+                self.last_error = error
+            state = self._current_state(time.monotonic())
+
+            if state == STATE_HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self._state = STATE_CLOSED
+                    self._outcomes.clear()
+                    print(f"[BREAKER] {self.name} recovered, circuit closed")
+                else:
+                    self._trip()
+            elif state == STATE_CLOSED and len(self._outcomes) >= self.min_calls:
+                failed = sum(1 for o, _ in self._outcomes if not o)
+                if failed / len(self._outcomes) >= self.failure_rate:
+                    self._trip()
+
+    def release(self) -> None:
+        """Free the half-open probe slot of a call abandoned without an outcome."""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probing = False
+
+    def _trip(self) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        print(f"[BREAKER] {self.name} circuit opened ({self.last_error})")
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile (0-1) of the successful calls in the window."""
+        with self._lock:
+            latencies = sorted(l for ok, l in self._outcomes if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(pct * len(latencies)))]
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            window = list(self._outcomes)
+            retry_in = max(0.0, self.open_seconds - (now - self._opened_at)) if state == STATE_OPEN else 0.0
+            stats = {
+                "state": state,
+                "window_calls": len(window),
+                "window_failure_rate": round(sum(1 for o, _ in window if not o) / len(window), 3) if window else 0.0,
+                "calls": self.calls,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+                "retry_in": round(retry_in, 1),
+            }
+        p50, p95 = self.latency_percentile(0.5), self.latency_percentile(0.95)
+        stats["p50_ms"] = round(p50 * 1000, 1) if p50 is not None else None
+        stats["p95_ms"] = round(p95 * 1000, 1) if p95 is not None else None
+        return stats
+
+
+# ============================================================================
+# PER-SOURCE REGISTRY
+# ============================================================================
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(source)
+        if breaker is None:
+            slow = os.getenv(f"BREAKER_SLOW_CALL_{source.upper()}", DEFAULT_SLOW_CALL_SECONDS.get(source, 5.0))
+            breaker = _breakers[source] = CircuitBreaker(source, slow_call_seconds=float(slow))
+        return breaker
+
+
+def circuit_open(source: str) -> bool:
+    """True if calls to source are currently being skipped."""
+    return get_breaker(source).is_open()
+
+
+class _Call:
+    """Handle for a guarded call; lets the block report non-exception outcomes."""
+
+    def __init__(self):
+        self.failed: Optional[str] = None
+
+    def fail(self, reason: str) -> None:
+        """Count the call as failed (e.g. an error payload or HTTP 429)."""
+        self.failed = reason
+
+
+@contextmanager
+def guard(source: str):
+    """
+    Run one upstream call under source's breaker. Raises CircuitOpenError
+    (a RuntimeError, so existing fallbacks catch it) without running the
+    block when the circuit is open; otherwise times the block and records
+    it as failed if it raises or calls .fail().
+    """
+    breaker = get_breaker(source)
+    if not breaker.allow():
+        record_rejected(source)
+        raise CircuitOpenError(f"{source} circuit open")
+    call = _Call()
+    started = time.monotonic()
+    try:
+        yield call
+    except Exception as e:
+        elapsed = time.monotonic() - started
+        breaker.record(False, elapsed, str(e) or type(e).__name__)
+        record_upstream(source, elapsed, ok=False)
+        raise
+    except BaseException:
+        # Cancelled or abandoned (e.g. a closed generator): no verdict on the source.
+        breaker.release()
+        raise
+    else:
+        elapsed = time.monotonic() - started
+        breaker.record(call.failed is None, elapsed, call.failed)
+        record_upstream(source, elapsed, ok=call.failed is None)
+
+
+def breaker_stats() -> Dict:
+    """State, recent failure rate and latency of every source's breaker."""
+    for source in SOURCES:
+        get_breaker(source)
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {name: breaker.stats() for name, breaker in breakers.items()}
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = [
+    'guard', 'circuit_open', 'get_breaker', 'breaker_stats', 'reset_breakers',
+    'CircuitBreaker', 'CircuitOpenError', 'SOURCES'
+]
@@ -0,0 +1,116 @@
+"""
+TrackBets Backend - Cache Module
+=================================
+Small thread-safe in-process caches shared by the scrapers and the brain.
+"""
+
+import time
+import weakref
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+# ============================================================================
+# TTL + LRU CACHE
+# ============================================================================
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a per-entry TTL.
+
+    Each entry may also carry a stale window: after its TTL it is still
+    returned by `lookup` (flagged "stale") until the window closes, which lets
+    callers serve the old value while they refresh it in the background.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0, stale_ttl: float = 0.0, name: str = "cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches.add(self)
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], str]:
+        """Return (value, state) where state is "fresh", "stale" or "miss"."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, "miss"
+
+            value, expires_at, stale_until = entry
+            if now < expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value, "fresh"
+            if now < stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                return value, "stale"
+
+            del self._data[key]
+            self.misses += 1
+            return None, "miss"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the fresh value for key, or default."""
+        value, state = self.lookup(key)
+        return value if state == "fresh" else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, stale_ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at, expires_at + stale_ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.stale_hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict:
+        """Counters for inspection (and the metrics endpoint)."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_caches: "weakref.WeakSet[TTLCache]" = weakref.WeakSet()
+
+
+def all_caches():
+    """Every live TTLCache (for the metrics endpoint)."""
+    return list(_caches)
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['TTLCache', 'all_caches']
@@ -0,0 +1,102 @@
+"""
+TrackBets Backend - Graph Format Module
+========================================
+Wire formats for graph_data (daily closes):
+
+    points   {"points": [{"time": "2024-01-02", "value": 187.5}, ...]}
+    columns  {"format": "columns", "times": ["2024-01-02", ...], "values": [187.5, ...]}
+    delta    {"format": "delta", "start": 1704153600, "step": 86400,
+              "time_deltas": [0, 1, 1, 3, ...], "value_scale": 100,
+              "value_deltas": [18750, 12, -40, ...]}
+
+points is the original format and the default. columns drops the repeated
+keys. delta additionally sends each bar as the whole number of steps and
+cents since the previous one, so most numbers are one or two digits.
+Decoding: time[i] = start + step * cumsum(time_deltas)[i] and
+value[i] = cumsum(value_deltas)[i] / value_scale.
+
+GRAPH_FORMAT sets the format scrapers produce. Endpoints can re-encode per
+request with format_graph().
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+FORMAT_POINTS = "points"
+FORMAT_COLUMNS = "columns"
+FORMAT_DELTA = "delta"
+GRAPH_FORMATS = (FORMAT_POINTS, FORMAT_COLUMNS, FORMAT_DELTA)
+
+GRAPH_FORMAT = os.getenv("GRAPH_FORMAT", FORMAT_POINTS).lower()
+if GRAPH_FORMAT not in GRAPH_FORMATS:
+    print(f"[GRAPH] Unknown GRAPH_FORMAT {GRAPH_FORMAT!r}, using {FORMAT_POINTS}")
+    GRAPH_FORMAT = FORMAT_POINTS
+
+DAY_SECONDS = 86400
+# Closes are rounded to 2 decimals, so cents are exact.
+VALUE_SCALE = 100
+
+# Keys that hold the series itself; anything else (source, error) is copied
+# through unchanged when re-encoding.
+_SERIES_KEYS = {"format", "points", "times", "values", "start", "step", "time_deltas", "value_scale", "value_deltas"}
+
+
+def encode_series(times: Sequence[str], values: Sequence[float], graph_format: Optional[str] = None) -> Dict:
+    """Build graph_data from parallel date/close columns (oldest first)."""
+    graph_format = graph_format or GRAPH_FORMAT
+    if graph_format == FORMAT_POINTS:
+        return {"points": [{"time": t, "value": v} for t, v in zip(times, values)]}
+    if graph_format == FORMAT_COLUMNS:
+        return {"format": FORMAT_COLUMNS, "times": list(times), "values": list(values)}
+
+    import numpy as np
+
+    days = np.array([t[:10] for t in times], dtype="datetime64[D]").astype(np.int64)
+    cents = np.rint(np.asarray(values, dtype=np.float64) * VALUE_SCALE).astype(np.int64)
+    return {
+        "format": FORMAT_DELTA,
+        "start": int(days[0]) * DAY_SECONDS if len(days) else None,
+        "step": DAY_SECONDS,
+        "time_deltas": np.diff(days, prepend=days[:1]).tolist(),
+        "value_scale": VALUE_SCALE,
+        "value_deltas": np.diff(cents, prepend=0).tolist(),
+    }
+
+
+def decode_series(graph: Dict) -> Tuple[List[str], List[float]]:
+    """Inverse of encode_series: (times, values) from graph_data in any format."""
+    graph_format = graph.get("format", FORMAT_POINTS)
+    if graph_format == FORMAT_COLUMNS:
+        return list(graph.get("times", [])), list(graph.get("values", []))
+    if graph_format == FORMAT_DELTA:
+        if not graph.get("time_deltas"):
+            return [], []
+        import numpy as np
+
+        days = np.cumsum(graph["time_deltas"]) + graph["start"] // graph["step"]
+        values = np.cumsum(graph["value_deltas"]) / graph["value_scale"]
+        return days.astype("datetime64[D]").astype(str).tolist(), values.round(2).tolist()
+    points = graph.get("points", [])
+    return [p["time"] for p in points], [p["value"] for p in points]
+
+
+def format_graph(graph: Dict, graph_format: Optional[str]) -> Dict:
+    """Re-encode graph_data as graph_format (None keeps it as it is)."""
+    if not graph_format or graph.get("format", FORMAT_POINTS) == graph_format:
+        return graph
+    times, values = decode_series(graph)
+    encoded = encode_series(times, values, graph_format)
+    encoded.update((k, v) for k, v in graph.items() if k not in _SERIES_KEYS)
+    return encoded
+
+
+def empty_graph(error: str, graph_format: Optional[str] = None) -> Dict:
+    """graph_data with no bars (default GRAPH_FORMAT)."""
+    return dict(encode_series([], [], graph_format), error=error)
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['GRAPH_FORMATS', 'GRAPH_FORMAT', 'encode_series', 'decode_series', 'format_graph', 'empty_graph']
@@ -0,0 +1,159 @@
+"""
+TrackBets Backend - History Store Module
+=========================================
+Local SQLite store of OHLCV bars, keyed by ticker and interval, so graph
+requests only fetch the bars after the last one we already have.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+DEFAULT_DB_PATH = os.getenv("HISTORY_DB_PATH", os.path.join(".cache", "history.sqlite"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker   TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts       TEXT NOT NULL,
+    open     REAL,
+    high     REAL,
+    low      REAL,
+    close    REAL NOT NULL,
+    volume   REAL,
+    PRIMARY KEY (ticker, interval, ts)
+);
+CREATE TABLE IF NOT EXISTS history_start (
+    ticker   TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts       TEXT NOT NULL,
+    PRIMARY KEY (ticker, interval)
+)
+"""
+
+
+# ============================================================================
+# HISTORY STORE
+# ============================================================================
+class HistoryStore:
+    """
+    Append-only (per bar) OHLCV store.
+
+    Bars are dicts with "time" (ISO date or datetime string, sortable),
+    "open", "high", "low", "close" and "volume". Re-appending an existing
+    timestamp replaces it, so the still-forming latest bar can be updated.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def bounds(self, ticker: str, interval: str) -> tuple:
+        """Return (first_ts, last_ts) stored for ticker/interval, or (None, None)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(ts), MAX(ts) FROM bars WHERE ticker = ? AND interval = ?",
+                (ticker, interval)
+            ).fetchone()
+        return row if row else (None, None)
+
+    def last_timestamp(self, ticker: str, interval: str) -> Optional[str]:
+        return self.bounds(ticker, interval)[1]
+
+    def append(self, ticker: str, interval: str, bars: List[Dict]) -> int:
+        """Insert or replace bars; returns the number written."""
+        rows = [
+            (ticker, interval, b["time"], b.get("open"), b.get("high"), b.get("low"), b["close"], b.get("volume"))
+            for b in bars
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bars (ticker, interval, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def set_history_start(self, ticker: str, interval: str, ts: str) -> None:
+        """Record that no bars exist before ts (e.g. the ticker listed then)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO history_start (ticker, interval, ts) VALUES (?, ?, ?)",
+                (ticker, interval, ts)
+            )
+            self._conn.commit()
+
+    def history_start(self, ticker: str, interval: str) -> Optional[str]:
+        """First bar the upstream has for ticker/interval, if known."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ts FROM history_start WHERE ticker = ? AND interval = ?", (ticker, interval)
+            ).fetchone()
+        return row[0] if row else None
+
+    def load(self, ticker: str, interval: str, since: Optional[str] = None) -> List[Dict]:
+        """Return stored bars (oldest first), optionally from `since` onwards."""
+        query = "SELECT ts, open, high, low, close, volume FROM bars WHERE ticker = ? AND interval = ?"
+        params = [ticker, interval]
+        if since:
+            query += " AND ts >= ?"
+            params.append(since)
+        query += " ORDER BY ts"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {"time": ts, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for ts, o, h, l, c, v in rows
+        ]
+
+    def load_closes(self, ticker: str, interval: str, since: Optional[str] = None) -> tuple:
+        """
+        Return (timestamps, closes rounded to 2 decimals) as parallel lists,
+        oldest first. Cheaper than load() when only the close is needed.
+        """
+        query = "SELECT ts, ROUND(close, 2) FROM bars WHERE ticker = ? AND interval = ? AND close IS NOT NULL"
+        params = [ticker, interval]
+        if since:
+            query += " AND ts >= ?"
+            params.append(since)
+        query += " ORDER BY ts"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        if not rows:
+            return [], []
+        times, closes = zip(*rows)
+        return list(times), list(closes)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[HistoryStore] = None
+_default_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """Process-wide store at HISTORY_DB_PATH, opened on first use."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = HistoryStore(DEFAULT_DB_PATH)
+        return _default_store
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['HistoryStore', 'get_history_store']
@@ -0,0 +1,60 @@
+"""
+TrackBets Backend - HTTP Client Module
+=======================================
+One pooled, keep-alive HTTP session shared by every direct outbound call,
+so repeat requests to the same upstream skip DNS, TCP and TLS setup.
+"""
+
+import os
+import threading
+from typing import Optional
+
+
+# Number of per-host connection pools kept, and connections kept per host.
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+# When true, callers wait for a free connection instead of exceeding the
+# per-host limit with throwaway connections.
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "true").lower() in ("1", "true", "yes")
+
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+
+def build_session(pool_connections: int = HTTP_POOL_CONNECTIONS, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                  pool_block: bool = HTTP_POOL_BLOCK) -> "requests.Session":
+    """Create a keep-alive session with bounded per-host pools."""
+    # Imported here so processes that never call out don't pay for requests.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": "TrackBets/1.0"})
+    return session
+
+
+def get_session() -> "requests.Session":
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+        return _session
+
+
+def close_session() -> None:
+    """Close pooled connections (called on app shutdown)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['get_session', 'close_session', 'build_session']
@@ -0,0 +1,298 @@
+"""
+TrackBets Backend - Technical Indicators Module
+================================================
+Vectorized SMA/EMA, RSI, MACD, Bollinger Bands, ATR and volume z-scores
+over the daily OHLCV bars kept in the history store, plus an incremental
+path that folds in one new bar without recomputing the whole series.
+"""
+
+import math
+import threading
+from collections import deque, OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+SMA_WINDOWS = (20, 50)
+EMA_SPANS = (12, 26)
+MACD_SIGNAL_SPAN = 9
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2.0
+VOLUME_WINDOW = 20
+
+FIELDS = [
+    "sma_20", "sma_50", "ema_12", "ema_26", "rsi_14",
+    "macd", "macd_signal", "macd_hist",
+    "bb_upper", "bb_middle", "bb_lower", "bb_percent_b",
+    "atr_14", "volume_z_20",
+]
+
+
+def to_frame(bars: List[Dict]) -> pd.DataFrame:
+    """History-store bars -> OHLCV DataFrame indexed by bar time."""
+    frame = pd.DataFrame(bars, columns=["time", "open", "high", "low", "close", "volume"])
+    return frame.set_index("time").astype(float)
+
+
+# ============================================================================
+# VECTORIZED ENGINE
+# ============================================================================
+def compute_indicators(frame: pd.DataFrame) -> pd.DataFrame:
+    """All indicator series for an OHLCV frame (NaN until enough bars)."""
+    close, high, low, volume = frame["close"], frame["high"], frame["low"], frame["volume"]
+    out = pd.DataFrame(index=frame.index)
+
+    for window in SMA_WINDOWS:
+        out[f"sma_{window}"] = close.rolling(window).mean()
+    for span in EMA_SPANS:
+        out[f"ema_{span}"] = close.ewm(span=span, adjust=False).mean()
+
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    avg_loss = (-delta).clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False, min_periods=RSI_PERIOD).mean()
+    out["rsi_14"] = _rsi(avg_gain, avg_loss)
+
+    out["macd"] = out["ema_12"] - out["ema_26"]
+    out["macd_signal"] = out["macd"].ewm(span=MACD_SIGNAL_SPAN, adjust=False).mean()
+    out["macd_hist"] = out["macd"] - out["macd_signal"]
+
+    middle = close.rolling(BOLLINGER_WINDOW).mean()
+    std = close.rolling(BOLLINGER_WINDOW).std(ddof=0)
+    out["bb_middle"] = middle
+    out["bb_upper"] = middle + BOLLINGER_WIDTH * std
+    out["bb_lower"] = middle - BOLLINGER_WIDTH * std
+    out["bb_percent_b"] = (close - out["bb_lower"]) / (out["bb_upper"] - out["bb_lower"])
+
+    prev_close = close.shift()
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    out["atr_14"] = true_range.ewm(alpha=1 / ATR_PERIOD, adjust=False, min_periods=ATR_PERIOD).mean()
+
+    vol_mean = volume.rolling(VOLUME_WINDOW).mean()
+    vol_std = volume.rolling(VOLUME_WINDOW).std(ddof=0)
+    out["volume_z_20"] = (volume - vol_mean) / vol_std.replace(0, np.nan)
+
+    return out.replace([np.inf, -np.inf], np.nan)
+
+
+def _rsi(avg_gain, avg_loss):
+    """RSI from Wilder-smoothed gains/losses; 100 when there were no losses."""
+    if isinstance(avg_gain, pd.Series):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        return rsi.where(~((avg_loss == 0) & (avg_gain > 0)), 100.0)
+    # Scalars (the incremental path): Python floats raise on division by
+    # zero, so a window without losses is handled before dividing. A flat
+    # window (no gains either) has no RSI, as in the vectorized path.
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else None
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _clean(value) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else round(value, 4)
+
+
+def summarize(as_of, close: float, bars: int, values: Dict) -> Dict:
+    """Latest indicator values as a JSON-friendly dict."""
+    return {
+        "as_of": str(as_of),
+        "close": _clean(close),
+        "bars": int(bars),
+        **{field: _clean(values.get(field)) for field in FIELDS},
+    }
+
+
+def latest_indicators(frame: pd.DataFrame) -> Dict:
+    """Vectorized compute over the frame, summarized at its last bar."""
+    if frame.empty:
+        return {}
+    values = compute_indicators(frame).iloc[-1].to_dict()
+    return summarize(frame.index[-1], frame["close"].iloc[-1], len(frame), values)
+
+
+# ============================================================================
+# INCREMENTAL ENGINE
+# ============================================================================
+class IncrementalIndicators:
+    """
+    Indicator state that advances one bar at a time with O(window) work.
+    Re-sending the latest bar (same time, new close) replaces it, since the
+    history store refreshes the still-forming bar on every delta fetch.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self._state = self._initial_state()
+        self._prev_state = None
+        self.first_time = frame.index[0] if not frame.empty else None
+        if not frame.empty:
+            self._seed(frame.iloc[:-1])
+            last = frame.iloc[-1]
+            self.update({"time": frame.index[-1], **last.to_dict()})
+
+    @staticmethod
+    def _initial_state() -> Dict:
+        return {
+            "n": 0, "prev_close": None,
+            "ema_12": None, "ema_26": None, "macd_signal": None,
+            "avg_gain": None, "avg_loss": None, "deltas": 0,
+            "atr": None,
+            "closes": deque(maxlen=max(SMA_WINDOWS + (BOLLINGER_WINDOW,))),
+            "volumes": deque(maxlen=VOLUME_WINDOW),
+            "last_time": None,
+        }
+
+    def _seed(self, frame: pd.DataFrame) -> None:
+        """Load state from a frame with the vectorized engine."""
+        if frame.empty:
+            return
+        close, high, low = frame["close"], frame["high"], frame["low"]
+        delta = close.diff()
+        prev_close = close.shift()
+        true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+        ema_12 = close.ewm(span=12, adjust=False).mean()
+        ema_26 = close.ewm(span=26, adjust=False).mean()
+        macd = ema_12 - ema_26
+
+        state = self._state
+        state["n"] = len(frame)
+        state["prev_close"] = float(close.iloc[-1])
+        state["ema_12"] = float(ema_12.iloc[-1])
+        state["ema_26"] = float(ema_26.iloc[-1])
+        state["macd_signal"] = float(macd.ewm(span=MACD_SIGNAL_SPAN, adjust=False).mean().iloc[-1])
+        state["deltas"] = int(delta.notna().sum())
+        if state["deltas"]:
+            state["avg_gain"] = float(delta.clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False).mean().iloc[-1])
+            state["avg_loss"] = float((-delta).clip(lower=0).ewm(alpha=1 / RSI_PERIOD, adjust=False).mean().iloc[-1])
+        state["atr"] = float(true_range.ewm(alpha=1 / ATR_PERIOD, adjust=False).mean().iloc[-1])
+        state["closes"].extend(close.tolist())
+        state["volumes"].extend(frame["volume"].tolist())
+        state["last_time"] = frame.index[-1]
+
+    @staticmethod
+    def _copy(state: Dict) -> Dict:
+        copied = dict(state)
+        copied["closes"] = deque(state["closes"], maxlen=state["closes"].maxlen)
+        copied["volumes"] = deque(state["volumes"], maxlen=state["volumes"].maxlen)
+        return copied
+
+    @property
+    def last_time(self):
+        return self._state["last_time"]
+
+    def update(self, bar: Dict) -> Dict:
+        """Fold in one bar (dict with time/open/high/low/close/volume)."""
+        if self._prev_state is not None and bar["time"] == self._state["last_time"]:
+            self._state = self._copy(self._prev_state)
+        self._prev_state = self._copy(self._state)
+
+        s = self._state
+        close, high, low, volume = float(bar["close"]), float(bar["high"]), float(bar["low"]), float(bar["volume"])
+        prev_close = s["prev_close"]
+
+        def ema(prev, value, alpha):
+            return value if prev is None else prev + alpha * (value - prev)
+
+        s["ema_12"] = ema(s["ema_12"], close, 2 / (12 + 1))
+        s["ema_26"] = ema(s["ema_26"], close, 2 / (26 + 1))
+        s["macd_signal"] = ema(s["macd_signal"], s["ema_12"] - s["ema_26"], 2 / (MACD_SIGNAL_SPAN + 1))
+
+        if prev_close is None:
+            true_range = high - low
+        else:
+            delta = close - prev_close
+            s["avg_gain"] = ema(s["avg_gain"], max(delta, 0.0), 1 / RSI_PERIOD)
+            s["avg_loss"] = ema(s["avg_loss"], max(-delta, 0.0), 1 / RSI_PERIOD)
+            s["deltas"] += 1
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        s["atr"] = ema(s["atr"], true_range, 1 / ATR_PERIOD)
+
+        s["n"] += 1
+        s["prev_close"] = close
+        s["closes"].append(close)
+        s["volumes"].append(volume)
+        s["last_time"] = bar["time"]
+        return self.latest()
+
+    def latest(self) -> Dict:
+        s = self._state
+        if not s["n"]:
+            return {}
+        closes = np.fromiter(s["closes"], dtype=float)
+        volumes = np.fromiter(s["volumes"], dtype=float)
+        values = {"ema_12": s["ema_12"], "ema_26": s["ema_26"]}
+
+        for window in SMA_WINDOWS:
+            values[f"sma_{window}"] = closes[-window:].mean() if len(closes) >= window else None
+
+        values["macd"] = s["ema_12"] - s["ema_26"]
+        values["macd_signal"] = s["macd_signal"]
+        values["macd_hist"] = values["macd"] - s["macd_signal"]
+
+        if s["deltas"] >= RSI_PERIOD:
+            values["rsi_14"] = _rsi(s["avg_gain"], s["avg_loss"])
+        if s["n"] >= ATR_PERIOD:
+            values["atr_14"] = s["atr"]
+
+        if len(closes) >= BOLLINGER_WINDOW:
+            window = closes[-BOLLINGER_WINDOW:]
+            middle, std = window.mean(), window.std()
+            values["bb_middle"] = middle
+            values["bb_upper"] = middle + BOLLINGER_WIDTH * std
+            values["bb_lower"] = middle - BOLLINGER_WIDTH * std
+            width = values["bb_upper"] - values["bb_lower"]
+            values["bb_percent_b"] = (closes[-1] - values["bb_lower"]) / width if width else None
+
+        if len(volumes) >= VOLUME_WINDOW:
+            std = volumes.std()
+            values["volume_z_20"] = (volumes[-1] - volumes.mean()) / std if std else None
+
+        return summarize(s["last_time"], s["prev_close"], s["n"], values)
+
+
+# ============================================================================
+# PER-TICKER STATE
+# ============================================================================
+_MAX_STATES = 1024
+_states: "OrderedDict[str, IncrementalIndicators]" = OrderedDict()
+_states_lock = threading.Lock()
+
+
+def indicators_for(key: str, bars: List[Dict]) -> Dict:
+    """
+    Latest indicators for a ticker's bars (oldest first). When the bars
+    start where they did last time and reach the last bar seen, only that
+    bar (refreshed) and the newer ones are folded in.
+    """
+    if not bars:
+        return {}
+
+    with _states_lock:
+        state = _states.get(key)
+        if state is not None and state.first_time == bars[0]["time"]:
+            times = [b["time"] for b in bars]
+            if state.last_time in times:
+                result = {}
+                for bar in bars[times.index(state.last_time):]:
+                    result = state.update(bar)
+                _states.move_to_end(key)
+                return result
+
+        state = IncrementalIndicators(to_frame(bars))
+        _states[key] = state
+        _states.move_to_end(key)
+        while len(_states) > _MAX_STATES:
+            _states.popitem(last=False)
+        return state.latest()
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['compute_indicators', 'latest_indicators', 'IncrementalIndicators', 'indicators_for', 'to_frame']
@@ -0,0 +1,145 @@
+"""
+TrackBets Backend - Incremental JSON Module
+============================================
+Extracts top-level fields from a JSON object while it is still being
+streamed, so completed fields (and a long string field in progress) can be
+forwarded before the model has finished generating.
+"""
+
+import re
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_TRAILING_UNICODE_ESCAPE = re.compile(r"\\u[0-9a-fA-F]{0,3}$")
+
+
+def _decode_partial_string(raw: str) -> str:
+    """Decode the body of an unterminated JSON string, dropping a cut-off escape."""
+    raw = _TRAILING_UNICODE_ESCAPE.sub("", raw)
+    trailing = len(raw) - len(raw.rstrip("\\"))
+    if trailing % 2:
+        raw = raw[:-1]
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+# ============================================================================
+# INCREMENTAL PARSER
+# ============================================================================
+class IncrementalJSONParser:
+    """
+    Feed chunks of a JSON object; get back the top-level fields that became
+    complete. Anything before the first "{" (e.g. a ```json fence) and after
+    the closing "}" is ignored.
+
+        parser = IncrementalJSONParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+            parser.partial("ai_explanation")  # text generated so far
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "object"
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Append a chunk; return (key, value) for each field completed by it."""
+        self.buffer += chunk
+        completed = []
+        buf = self.buffer
+        i = self._pos
+
+        while i < len(buf) and not self.done:
+            ch = buf[i]
+
+            if self._expect == "object":
+                if ch == "{":
+                    self._depth = 1
+                    self._expect = "key"
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_string":
+                        self._key = json.loads(buf[self._key_start:i + 1])
+                        self._expect = "colon"
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = i
+                    self._expect = "key_string"
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._expect = "in_value"
+            elif ch in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._value_start = i
+                    self._expect = "in_value"
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(i, completed)
+                    self.done = True
+            elif self._depth == 1:
+                if ch == ":" and self._expect == "colon":
+                    self._expect = "value"
+                elif ch == ",":
+                    self._finish_value(i, completed)
+                    self._expect = "key"
+                elif self._expect == "value" and not ch.isspace():
+                    self._value_start = i
+                    self._expect = "in_value"
+
+            i += 1
+
+        self._pos = i
+        return completed
+
+    def _finish_value(self, end: int, completed: List) -> None:
+        if self._key is not None and self._value_start is not None:
+            raw = self.buffer[self._value_start:end].strip()
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                value = None
+            else:
+                self.fields[self._key] = value
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+    def partial(self, key: str) -> Optional[str]:
+        """Text received so far for a top-level string field (None if not started)."""
+        value = self.fields.get(key)
+        if isinstance(value, str):
+            return value
+        if self._key != key or self._value_start is None or self.buffer[self._value_start] != '"':
+            return None
+
+        raw = self.buffer[self._value_start + 1:self._pos]
+        if not self._in_string:
+            raw = raw[:raw.rfind('"')]
+        return _decode_partial_string(raw)
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['IncrementalJSONParser']
@@ -1,13 +1,82 @@
 from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, StreamingResponse, PlainTextResponse
 import os
-import uvicorn
-from api.backend.brain import quick_analyze
-from api.backend.scrapers import fetch_all_data
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from api.backend.brain import quick_analyze, quick_analyze_stream, verdict_cache_stats, shutdown_analyst, get_analyst
+from api.backend.scrapers import (fetch_all_data, fetch_bulk_market_data, iter_all_data, get_stock_price,
+                                  quote_cache_stats, hedge_stats)
+from api.backend.sentiment import sentiment_cache_stats
+from api.backend.news_store import get_news_store
+from api.backend.singleflight import SingleFlight, SharedStream
+from api.backend.http_client import close_session
+from api.backend.ratelimit import scheduler_stats, submit_with_context
+from api.backend.metrics import stage, collect_timings, server_timing, render_prometheus
+from api.backend.breaker import breaker_stats
+from api.backend.prefetch import Prefetcher, DEFAULT_HOT_TICKERS, PREFETCH_ENABLED
+from api.backend.symbols import get_symbol_index, normalize_query
+from api.backend.cache import TTLCache
+from api.backend.graph_format import GRAPH_FORMATS, format_graph
+from api.backend.responses import FastJSONResponse, dumps
 
-app = FastAPI()
+# Scraping and Gemini calls are blocking; run them on a dedicated pool so a
+# slow upstream never stalls the event loop (and with it /api/health).
+ANALYZE_WORKERS = int(os.getenv("ANALYZE_WORKERS", "8"))
+_analyze_pool = ThreadPoolExecutor(max_workers=ANALYZE_WORKERS, thread_name_prefix="analyze")
+
+# Concurrent analyses of the same ticker share one pipeline run; concurrent
+# streams of the same ticker share one streamed run.
+_analysis_flights = SingleFlight(name="analyze")
+_stream_flights = SharedStream(name="analyze_stream")
+
+# Keeps the hot tickers (and frequently requested ones) warm in the caches.
+prefetcher = Prefetcher()
+
+# Watchlist limits: tickers per batch request and per-batch analyses in flight.
+BATCH_MAX_TICKERS = int(os.getenv("BATCH_MAX_TICKERS", "100"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+# Ticker search: the local symbol index answers first; the LLM resolver is
+# only asked about misses, once per query. Its answers are remembered per
+# query in a bounded layer of their own (the CSV-backed index is never
+# modified), and only for tickers that actually quote; failures are
+# remembered for SEARCH_MISS_TTL seconds.
+SEARCH_MISS_TTL = float(os.getenv("SEARCH_MISS_TTL", "600"))
+_search_misses = TTLCache(maxsize=1024, ttl=SEARCH_MISS_TTL, name="search_misses")
+_search_learned = TTLCache(
+    maxsize=int(os.getenv("SEARCH_LEARNED_MAX", "1024")),
+    ttl=float(os.getenv("SEARCH_LEARNED_TTL", "86400")),
+    name="search_learned"
+)
+_search_flights = SingleFlight(name="search")
+SEARCH_MAX_QUERY_LENGTH = int(os.getenv("SEARCH_MAX_QUERY_LENGTH", "100"))
+
+# Responses at least this large are gzipped for clients that accept it
+# (event streams are never compressed).
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Configure the Gemini client once per process instead of per request.
+    # The SDK import is slow, so it happens on the pool rather than holding
+    # up startup; a request that arrives first waits for the same build.
+    _analyze_pool.submit(get_analyst)
+    if PREFETCH_ENABLED:
+        prefetcher.start()
+    yield
+    prefetcher.stop()
+    shutdown_analyst()
+    close_session()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
 
 # Enable CORS
 app.add_middleware(
@@ -25,40 +94,271 @@ async def health_check():
 
 @app.get("/api/mock-tickers")
 async def get_mock_tickers():
-    return {"mock_tickers": ["ZOMATO.NS", "RELIANCE.NS", "TATA.NS", "BTC-USD", "TSLA"]}
+    return {"mock_tickers": DEFAULT_HOT_TICKERS}
 
-@app.get("/api/analyze")
-async def analyze_stock(ticker: str):
-    try:
-        if not ticker:
-            raise HTTPException(status_code=400, detail="Ticker is required")
-            
-        # 1. Fetch Data
-        data = fetch_all_data(ticker)
-        
-        # 2. Run AI Analysis
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    return {
+        "quotes": quote_cache_stats(),
+        "verdicts": verdict_cache_stats(),
+        "sentiment": sentiment_cache_stats(),
+        "news": get_news_store().stats(),
+    }
+
+@app.get("/api/coalescing-stats")
+async def get_coalescing_stats():
+    return {**_analysis_flights.stats(), "stream": _stream_flights.stats()}
+
+@app.get("/api/scheduler-stats")
+async def get_scheduler_stats():
+    return scheduler_stats()
+
+@app.get("/api/breaker-stats")
+async def get_breaker_stats():
+    return breaker_stats()
+
+@app.get("/api/hedge-stats")
+async def get_hedge_stats():
+    return hedge_stats()
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of stage/upstream latencies, fallbacks, caches and circuits."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/prefetch-status")
+async def get_prefetch_status():
+    return prefetcher.status()
+
+def normalize_ticker(ticker: str) -> str:
+    return ticker.strip().upper()
+
+def check_graph_format(graph_format: Optional[str]) -> Optional[str]:
+    if graph_format and graph_format not in GRAPH_FORMATS:
+        raise HTTPException(status_code=400, detail=f"graph_format must be one of {', '.join(GRAPH_FORMATS)}")
+    return graph_format
+
+def run_analysis(ticker: str, prefetched: Optional[dict] = None) -> dict:
+    """Blocking analyze pipeline: fetch all sources, then run the AI verdict."""
+    # 1. Fetch Data
+    data = fetch_all_data(ticker, prefetched=prefetched)
+    
+    # 2. Run AI Analysis
+    with stage("verdict"):
         analysis = quick_analyze(
             ticker, 
             data['price_data'], 
             data['news'], 
-            data['social']
+            data['social'],
+            indicators=data.get('indicators')
         )
+    
+    # 3. Construct Response
+    return {
+        "success": True,
+        "ticker": ticker,
+        "currency": data['price_data'].get('currency', '$'),
+        "price_data": data['price_data'],
+        "graph_data": data['graph_data'],
+        "indicators": data.get('indicators'),
+        "sentiment": data.get('sentiment'),
+        "news": data['news'],
+        "social": data['social'],
+        "analysis": analysis,
+        "source": "live"
+    }
+
+@app.get("/api/analyze")
+async def analyze_stock(ticker: str, graph_format: Optional[str] = None):
+    try:
+        ticker = normalize_ticker(ticker or "")
+        if not ticker:
+            raise HTTPException(status_code=400, detail="Ticker is required")
+        check_graph_format(graph_format)
         
-        # 3. Construct Response
-        return {
+        prefetcher.record_request(ticker)
+        started = time.monotonic()
+        # Stages run by this request (not by one it was coalesced into) are
+        # collected for the Server-Timing header.
+        with collect_timings() as timings:
+            result = await _analysis_flights.do(
+                ticker, lambda: asyncio.wrap_future(submit_with_context(_analyze_pool, run_analysis, ticker))
+            )
+        if graph_format:
+            # The result may be shared with coalesced requests; don't mutate it.
+            result = dict(result, graph_data=format_graph(result["graph_data"], graph_format))
+        return FastJSONResponse(result, headers={
+            "Server-Timing": server_timing(timings, total=time.monotonic() - started)
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Analysis Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _sse(event: str, payload) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {dumps(payload).decode('utf-8')}\n\n"
+
+async def stream_analysis(ticker: str):
+    """
+    Streamed analyze pipeline: yields (event, payload) pairs for every
+    source as it arrives, then the verdict as the model generates it.
+    """
+    loop = asyncio.get_running_loop()
+    data = {}
+    sources = iter_all_data(ticker)
+    try:
+        while True:
+            item = await loop.run_in_executor(_analyze_pool, next, sources, None)
+            if item is None:
+                break
+            key, value = item
+            data[key] = value
+            yield key, value
+        
+        verdict = quick_analyze_stream(ticker, data['price_data'], data['news'], data['social'],
+                                       indicators=data.get('indicators'))
+        while True:
+            event = await loop.run_in_executor(_analyze_pool, next, verdict, None)
+            if event is None:
+                break
+            if event[0] == "field":
+                yield "analysis_field", {"field": event[1], "value": event[2]}
+            elif event[0] == "explanation":
+                yield "explanation", {"delta": event[1]}
+            else:
+                yield "analysis", event[1]
+        yield "done", {
             "success": True,
             "ticker": ticker,
             "currency": data['price_data'].get('currency', '$'),
-            "price_data": data['price_data'],
-            "graph_data": data['graph_data'],
-            "news": data['news'],
-            "social": data['social'],
-            "analysis": analysis,
             "source": "live"
         }
     except Exception as e:
-        print(f"Analysis Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"Stream Analysis Error: {e}")
+        yield "error", {"detail": str(e)}
+    finally:
+        try:
+            sources.close()
+        except ValueError:
+            # Cancelled while a source was still being awaited
+            pass
+
+@app.get("/api/analyze/stream")
+async def analyze_stock_stream(ticker: str, graph_format: Optional[str] = None):
+    """
+    Streaming variant of /api/analyze. Emits price_data, graph_data,
+    indicators, news, social and sentiment as separate SSE events in the
+    order they arrive. The verdict then streams as analysis_field events
+    (verdict, confidence, ...) and explanation deltas while the model
+    generates, followed by the complete analysis and done (or error).
+    
+    Concurrent streams of the same ticker share one run; a client joining
+    late is sent the events it missed first.
+    """
+    ticker = normalize_ticker(ticker or "")
+    if not ticker:
+        raise HTTPException(status_code=400, detail="Ticker is required")
+    check_graph_format(graph_format)
+    
+    prefetcher.record_request(ticker)
+    
+    async def events():
+        async for event, payload in _stream_flights.subscribe(ticker, lambda: stream_analysis(ticker)):
+            if event == "graph_data":
+                # Shared with other subscribers; format_graph returns a new dict.
+                payload = format_graph(payload, graph_format)
+            yield _sse(event, payload)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+class BatchAnalyzeRequest(BaseModel):
+    tickers: List[str]
+
+@app.post("/api/analyze/batch")
+async def analyze_batch(request: BatchAnalyzeRequest, graph_format: Optional[str] = None):
+    # Normalize and de-duplicate while keeping the watchlist order
+    tickers = list(dict.fromkeys(normalize_ticker(t) for t in request.tickers if t and t.strip()))
+    if not tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required")
+    if len(tickers) > BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_TICKERS} tickers per batch")
+    check_graph_format(graph_format)
+    
+    loop = asyncio.get_running_loop()
+    
+    # 1. Quotes + history for the whole list in one download
+    bulk = await loop.run_in_executor(_analyze_pool, fetch_bulk_market_data, tickers)
+    
+    # 2. Per-ticker news/social/AI with bounded parallelism
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def analyze_one(ticker: str) -> dict:
+        async with semaphore:
+            try:
+                return await _analysis_flights.do(
+                    ticker, lambda: loop.run_in_executor(_analyze_pool, run_analysis, ticker, bulk.get(ticker))
+                )
+            except Exception as e:
+                print(f"Batch Analysis Error ({ticker}): {e}")
+                return {"success": False, "ticker": ticker, "error": str(e)}
+    
+    results = await asyncio.gather(*(analyze_one(t) for t in tickers))
+    if graph_format:
+        results = [dict(r, graph_data=format_graph(r["graph_data"], graph_format)) if "graph_data" in r else r
+                   for r in results]
+    return FastJSONResponse({
+        "success": True,
+        "count": len(results),
+        "failed": sum(1 for r in results if not r.get("success")),
+        "results": results
+    })
+
+class SearchRequest(BaseModel):
+    query: str = Field(..., max_length=SEARCH_MAX_QUERY_LENGTH)
+
+@app.post("/api/search")
+async def search_ticker(request: SearchRequest):
+    query = (request.query or "").strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is required")
+    
+    index = get_symbol_index()
+    matches = index.search(query)
+    if matches:
+        return {**matches[0], "matches": matches, "source": "index"}
+    
+    key = normalize_query(query)
+    learned = _search_learned.get(key)
+    if learned is not None:
+        return {**learned, "matches": [learned], "source": "learned"}
+    
+    # True miss: ask the LLM resolver (once per normalized query)
+    if _search_misses.get(key) is not None:
+        return {"error": "No matching ticker found"}
+    
+    result = await _search_flights.do(key, lambda: _resolve_with_llm(key, query))
+    if result.get("ticker"):
+        return {**result, "matches": [result], "source": "ai"}
+    
+    _search_misses.set(key, True)
+    return {"error": result.get("error", "No matching ticker found")}
+
+async def _resolve_with_llm(key: str, query: str) -> dict:
+    """Ask the LLM resolver; remember the answer if its ticker gets a real quote."""
+    # get_analyst() may build the model on first use; keep that off the loop.
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_analyze_pool, lambda: get_analyst().search_ticker(query))
+    if result.get("ticker"):
+        quote = await loop.run_in_executor(_analyze_pool, get_stock_price, result["ticker"])
+        if quote.get("source") != "Emergency Mock":
+            _search_learned.set(key, result)
+    return result
 
 # Static Files - Frontend
 # Ensure directory exists to avoid crash locally if build missing
@@ -75,4 +375,6 @@ async def custom_404_handler(request, __):
     return {"error": "Frontend not built"}
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
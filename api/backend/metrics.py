@@ -0,0 +1,239 @@
+"""
+TrackBets Backend - Metrics Module
+===================================
+Latency histograms and counters for the analyze pipeline: every fetch
+stage, every upstream call (timed by the circuit breakers) and the Gemini
+verdict. Rendered in Prometheus text format for /api/metrics, together
+with cache hit rates and circuit states; the stages a request ran are also
+collected per request for its Server-Timing header.
+"""
+
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+# Histogram bucket upper bounds, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = "trackbets_stage_duration_seconds"
+STAGE_ERRORS = "trackbets_stage_errors_total"
+STAGE_FALLBACKS = "trackbets_stage_fallbacks_total"
+UPSTREAM_SECONDS = "trackbets_upstream_duration_seconds"
+UPSTREAM_ERRORS = "trackbets_upstream_errors_total"
+UPSTREAM_REJECTED = "trackbets_upstream_rejected_total"
+
+_HELP = {
+    STAGE_SECONDS: ("histogram", "Duration of each analyze pipeline stage."),
+    STAGE_ERRORS: ("counter", "Pipeline stages that raised."),
+    STAGE_FALLBACKS: ("counter", "Pipeline stages that answered with a fallback, by reason."),
+    UPSTREAM_SECONDS: ("histogram", "Duration of upstream calls, by source."),
+    UPSTREAM_ERRORS: ("counter", "Failed upstream calls, by source."),
+    UPSTREAM_REJECTED: ("counter", "Upstream calls skipped because the circuit was open."),
+}
+
+_lock = threading.Lock()
+_histograms: Dict[Tuple[str, Tuple], List] = {}  # (name, labels) -> [bucket counts..., sum, count]
+_counters: Dict[Tuple[str, Tuple], float] = {}
+
+# Per-request list of (name, seconds), shared with worker threads through
+# submit_with_context.
+_timings: contextvars.ContextVar = contextvars.ContextVar("stage_timings", default=None)
+
+
+def _key(name: str, labels: Dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    """Add one observation to a latency histogram."""
+    key = _key(name, labels)
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                series[i] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    """Increment a counter."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def _note_timing(name: str, seconds: float) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+# ============================================================================
+# INSTRUMENTATION HOOKS
+# ============================================================================
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage; exceptions are counted and re-raised."""
+    started = time.monotonic()
+    try:
+        yield
+    except Exception:
+        inc(STAGE_ERRORS, stage=name)
+        raise
+    finally:
+        elapsed = time.monotonic() - started
+        observe(STAGE_SECONDS, elapsed, stage=name)
+        _note_timing(name, elapsed)
+
+
+def timed_stage(name: str, fn, *args, **kwargs):
+    """Call fn inside stage(name) (convenient for pool.submit)."""
+    with stage(name):
+        return fn(*args, **kwargs)
+
+
+def record_fallback(stage_name: str, reason: str) -> None:
+    """Count a stage answering with its fallback (reason: error, timeout, mock, ...)."""
+    inc(STAGE_FALLBACKS, stage=stage_name, reason=reason)
+
+
+def record_upstream(source: str, seconds: float, ok: bool) -> None:
+    """Record one upstream call (called by the circuit breakers)."""
+    observe(UPSTREAM_SECONDS, seconds, source=source)
+    if not ok:
+        inc(UPSTREAM_ERRORS, source=source)
+    _note_timing(source, seconds)
+
+
+def record_rejected(source: str) -> None:
+    inc(UPSTREAM_REJECTED, source=source)
+
+
+# ============================================================================
+# PER-REQUEST TIMINGS (Server-Timing)
+# ============================================================================
+@contextmanager
+def collect_timings():
+    """Collect the stages and upstream calls run in this context (and its pool tasks)."""
+    timings: List[Tuple[str, float]] = []
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def server_timing(timings: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """Server-Timing header value; repeated names are summed, in first-seen order."""
+    merged: Dict[str, float] = {}
+    for name, seconds in list(timings):
+        merged[name] = merged.get(name, 0.0) + seconds
+    if total is not None:
+        merged["total"] = total
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in merged.items())
+
+
+# ============================================================================
+# PROMETHEUS EXPORT
+# ============================================================================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _header(lines: List[str], name: str, kind: str, text: str) -> None:
+    lines.append(f"# HELP {name} {text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _cache_lines(lines: List[str]) -> None:
+    from .cache import all_caches
+
+    totals: Dict[str, Dict] = {}
+    for cache in all_caches():
+        stats = cache.stats()
+        entry = totals.setdefault(stats["name"], {"hits": 0, "stale_hits": 0, "misses": 0, "size": 0})
+        for field in entry:
+            entry[field] += stats[field]
+
+    _header(lines, "trackbets_cache_lookups_total", "counter", "Cache lookups by result.")
+    for name, t in sorted(totals.items()):
+        for result, field in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses")):
+            lines.append(f"trackbets_cache_lookups_total{_labels([('cache', name), ('result', result)])} {t[field]}")
+    _header(lines, "trackbets_cache_hit_ratio", "gauge", "Share of lookups served from cache (fresh or stale).")
+    for name, t in sorted(totals.items()):
+        lookups = t["hits"] + t["stale_hits"] + t["misses"]
+        ratio = (t["hits"] + t["stale_hits"]) / lookups if lookups else 0.0
+        lines.append(f"trackbets_cache_hit_ratio{_labels([('cache', name)])} {ratio:.4f}")
+    _header(lines, "trackbets_cache_entries", "gauge", "Entries currently cached.")
+    for name, t in sorted(totals.items()):
+        lines.append(f"trackbets_cache_entries{_labels([('cache', name)])} {t['size']}")
+
+
+def _number(value) -> str:
+    """Sample value with full precision; whole numbers print as integers."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _breaker_lines(lines: List[str]) -> None:
+    from .breaker import breaker_stats, STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+
+    codes = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+    _header(lines, "trackbets_circuit_state", "gauge", "Circuit state per source (0 closed, 1 half-open, 2 open).")
+    for source, stats in sorted(breaker_stats().items()):
+        lines.append(f"trackbets_circuit_state{_labels([('source', source)])} {codes[stats['state']]}")
+
+
+def render_prometheus() -> str:
+    """All metrics in Prometheus text exposition format (0.0.4)."""
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    lines: List[str] = []
+    for name, (kind, text) in _HELP.items():
+        _header(lines, name, kind, text)
+        if kind == "histogram":
+            for (metric, labels), series in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, count in zip(LATENCY_BUCKETS, series):
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {count}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {series[-1]}")
+                lines.append(f"{name}_sum{_labels(labels)} {series[-2]:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {series[-1]}")
+        else:
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    _cache_lines(lines)
+    _breaker_lines(lines)
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = [
+    'stage', 'timed_stage', 'record_fallback', 'record_upstream', 'record_rejected',
+    'collect_timings', 'server_timing', 'render_prometheus', 'reset_metrics', 'observe', 'inc'
+]
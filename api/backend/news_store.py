@@ -0,0 +1,179 @@
+"""
+TrackBets Backend - News Store Module
+======================================
+Per-ticker rolling window of news articles. Articles are deduplicated by a
+hash of their normalized title and URL, so a refresh only adds headlines we
+have not seen, and each ingest reports which articles are new.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+NEWS_WINDOW_SIZE = int(os.getenv("NEWS_WINDOW_SIZE", "50"))
+NEWS_MAX_AGE_DAYS = float(os.getenv("NEWS_MAX_AGE_DAYS", "7"))
+NEWS_MAX_TICKERS = int(os.getenv("NEWS_MAX_TICKERS", "512"))
+
+# Prefix for formatted headlines from the latest ingest.
+NEW_HEADLINE_TAG = "[NEW]"
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+# Dedup keys kept per ticker, as a multiple of the window size.
+_SEEN_KEYS_FACTOR = 8
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, punctuation-free title, so re-syndicated headlines match."""
+    return " ".join(_NON_WORD.sub(" ", (title or "").lower()).split())
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """host + path without scheme, query, fragment or trailing slash."""
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return None
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host + parts.path.rstrip("/")
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def article_keys(article: Dict) -> List[str]:
+    """Dedup keys of an article: its title hash and, if it has one, its URL hash."""
+    keys = []
+    title = normalize_title(article.get("title", ""))
+    if title:
+        keys.append("t:" + _digest(title))
+    url = normalize_url(article.get("url"))
+    if url:
+        keys.append("u:" + _digest(url))
+    return keys
+
+
+# ============================================================================
+# NEWS STORE
+# ============================================================================
+class _TickerNews:
+    def __init__(self):
+        self.articles: "OrderedDict[str, Dict]" = OrderedDict()  # id -> article
+        self.keys: Dict[str, str] = {}  # dedup key -> id, oldest first
+        self.last_new: set = set()
+        self.last_refresh: Optional[float] = None
+
+
+class NewsStore:
+    """
+    In-memory news window per ticker. ingest() adds unseen articles and
+    trims the window to the newest `window` articles younger than
+    `max_age_days`; window() returns them newest first, each flagged "new"
+    if it arrived in the latest ingest.
+    """
+
+    def __init__(self, window: int = NEWS_WINDOW_SIZE, max_age_days: float = NEWS_MAX_AGE_DAYS,
+                 max_tickers: int = NEWS_MAX_TICKERS):
+        self.window_size = window
+        self.max_age = max_age_days * 86400
+        self.max_tickers = max_tickers
+        self._tickers: "OrderedDict[str, _TickerNews]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.ingested = 0
+        self.duplicates = 0
+
+    def _entry(self, ticker: str) -> _TickerNews:
+        entry = self._tickers.get(ticker)
+        if entry is None:
+            entry = self._tickers[ticker] = _TickerNews()
+            while len(self._tickers) > self.max_tickers:
+                self._tickers.popitem(last=False)
+        self._tickers.move_to_end(ticker)
+        return entry
+
+    def last_refresh(self, ticker: str) -> Optional[float]:
+        with self._lock:
+            entry = self._tickers.get(ticker.upper())
+            return entry.last_refresh if entry else None
+
+    def ingest(self, ticker: str, articles: List[Dict], now: Optional[float] = None) -> List[Dict]:
+        """Record a refresh's articles; returns the ones not seen before."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entry(ticker.upper())
+            new = []
+            for article in articles:
+                keys = article_keys(article)
+                if not keys or any(k in entry.keys for k in keys):
+                    self.duplicates += 1
+                    continue
+                stored = {**article, "id": keys[0], "first_seen": now}
+                entry.articles[stored["id"]] = stored
+                for k in keys:
+                    entry.keys[k] = stored["id"]
+                new.append(stored)
+
+            self._trim(entry, now)
+            entry.last_new = {a["id"] for a in new if a["id"] in entry.articles}
+            entry.last_refresh = now
+            self.ingested += len(new)
+            return [{**a, "new": True} for a in new if a["id"] in entry.articles]
+
+    def _trim(self, entry: _TickerNews, now: float) -> None:
+        ordered = sorted(entry.articles.values(), key=_recency, reverse=True)
+        keep = [a for a in ordered if now - _recency(a) <= self.max_age][:self.window_size]
+        entry.articles = OrderedDict((a["id"], a) for a in keep)
+        # Remember keys of recently evicted articles too, so they are not
+        # re-added as new when a search returns them again.
+        overflow = len(entry.keys) - _SEEN_KEYS_FACTOR * self.window_size
+        for k in list(entry.keys)[:max(0, overflow)]:
+            del entry.keys[k]
+
+    def window(self, ticker: str) -> List[Dict]:
+        """Stored articles, newest first, flagged "new" if from the latest ingest."""
+        with self._lock:
+            entry = self._tickers.get(ticker.upper())
+            if entry is None:
+                return []
+            return [{**a, "new": a["id"] in entry.last_new} for a in entry.articles.values()]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tickers": len(self._tickers),
+                "articles": sum(len(e.articles) for e in self._tickers.values()),
+                "ingested": self.ingested,
+                "duplicates": self.duplicates,
+            }
+
+
+def _recency(article: Dict) -> float:
+    return article.get("published") or article.get("first_seen") or 0.0
+
+
+_store: Optional[NewsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_news_store() -> NewsStore:
+    """Process-wide news store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NewsStore()
+        return _store
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['NewsStore', 'get_news_store', 'NEW_HEADLINE_TAG', 'normalize_title', 'normalize_url', 'article_keys']
@@ -0,0 +1,151 @@
+"""
+TrackBets Backend - Prefetch Module
+====================================
+Background warm-up of hot tickers. A fixed hot set (the tickers most users
+click) plus tickers promoted by recent request frequency are refreshed on an
+interval, at background priority, so their quotes, history, news and
+verdicts are already cached when a user asks.
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .ratelimit import background_priority
+from .scrapers import refresh_quote, fetch_all_data
+from .brain import quick_analyze
+
+
+DEFAULT_HOT_TICKERS = ["ZOMATO.NS", "RELIANCE.NS", "TATA.NS", "BTC-USD", "TSLA"]
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "60"))
+# Delay before the first pass, so short-lived processes never hit upstreams.
+PREFETCH_INITIAL_DELAY = float(os.getenv("PREFETCH_INITIAL_DELAY", "5"))
+# Request-frequency promotion: decayed request count needed, its half-life
+# (seconds) and how many promoted tickers are kept warm.
+PREFETCH_PROMOTE_THRESHOLD = float(os.getenv("PREFETCH_PROMOTE_THRESHOLD", "3"))
+PREFETCH_HALF_LIFE = float(os.getenv("PREFETCH_HALF_LIFE", "900"))
+PREFETCH_MAX_PROMOTED = int(os.getenv("PREFETCH_MAX_PROMOTED", "20"))
+_MAX_TRACKED = 1000
+
+
+def _configured_hot_tickers() -> List[str]:
+    raw = os.getenv("PREFETCH_TICKERS")
+    if not raw:
+        return list(DEFAULT_HOT_TICKERS)
+    return [t.strip().upper() for t in raw.split(",") if t.strip()]
+
+
+def warm_ticker(ticker: str) -> None:
+    """Refresh quote, history, news, social and verdict caches for one ticker."""
+    price_data = refresh_quote(ticker)
+    data = fetch_all_data(ticker, prefetched={"price_data": price_data})
+    quick_analyze(ticker, data["price_data"], data["news"], data["social"],
+                  indicators=data.get("indicators"))
+
+
+# ============================================================================
+# PREFETCHER
+# ============================================================================
+class Prefetcher:
+    """Keeps a configurable hot set (plus frequently requested tickers) warm."""
+
+    def __init__(self, hot_tickers: Optional[List[str]] = None, interval: float = PREFETCH_INTERVAL,
+                 warm: Callable[[str], None] = warm_ticker):
+        self.hot_tickers = list(hot_tickers) if hot_tickers is not None else _configured_hot_tickers()
+        self.interval = interval
+        self.warm = warm
+        self._scores: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.runs = 0
+        self.warmed = 0
+        self.failures = 0
+        self.last_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+
+    # --- request frequency -------------------------------------------------
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated) / PREFETCH_HALF_LIFE)
+
+    def record_request(self, ticker: str) -> None:
+        """Count a user request towards promoting ticker into the hot set."""
+        now = time.monotonic()
+        with self._lock:
+            score, updated = self._scores.get(ticker, (0.0, now))
+            self._scores[ticker] = (self._decayed(score, updated, now) + 1, now)
+            if len(self._scores) > _MAX_TRACKED:
+                coldest = min(self._scores, key=lambda t: self._decayed(*self._scores[t], now))
+                del self._scores[coldest]
+
+    def promoted(self) -> List[str]:
+        """Tickers above the promotion threshold, hottest first."""
+        now = time.monotonic()
+        with self._lock:
+            scores = {t: self._decayed(s, u, now) for t, (s, u) in self._scores.items()}
+        hot = [t for t, s in sorted(scores.items(), key=lambda kv: -kv[1])
+               if s >= PREFETCH_PROMOTE_THRESHOLD and t not in self.hot_tickers]
+        return hot[:PREFETCH_MAX_PROMOTED]
+
+    def hot_set(self) -> List[str]:
+        return self.hot_tickers + self.promoted()
+
+    # --- refresh loop ------------------------------------------------------
+    def run_once(self) -> None:
+        """Warm every ticker in the hot set once, at background priority."""
+        started = time.monotonic()
+        with background_priority():
+            for ticker in self.hot_set():
+                if self._stop.is_set():
+                    break
+                try:
+                    self.warm(ticker)
+                    self.warmed += 1
+                except Exception as e:
+                    self.failures += 1
+                    print(f"[PREFETCH] Failed to warm {ticker}: {e}")
+        self.runs += 1
+        self.last_run = time.time()
+        self.last_duration = time.monotonic() - started
+
+    def _loop(self) -> None:
+        if self._stop.wait(PREFETCH_INITIAL_DELAY):
+            return
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def status(self) -> Dict:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval": self.interval,
+            "hot_tickers": self.hot_tickers,
+            "promoted": self.promoted(),
+            "runs": self.runs,
+            "warmed": self.warmed,
+            "failures": self.failures,
+            "last_run": self.last_run,
+            "last_duration": round(self.last_duration, 3) if self.last_duration is not None else None,
+        }
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['Prefetcher', 'warm_ticker', 'DEFAULT_HOT_TICKERS', 'PREFETCH_ENABLED']
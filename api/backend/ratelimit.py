@@ -0,0 +1,199 @@
+"""
+TrackBets Backend - Upstream Scheduler Module
+==============================================
+One token bucket per upstream provider. Callers queue for a token before
+each upstream request; interactive traffic is served ahead of background
+refresh, and callers that cannot get a token in time fall back instead.
+"""
+
+import os
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# "requests per minute:burst" per provider, overridable with RATE_LIMIT_<NAME>.
+DEFAULT_LIMITS = {
+    "yfinance": "120:20",
+    "twelvedata": "8:8",
+    "googlenews": "30:5",
+    "reddit": "60:10",
+    "ddgs": "20:3",
+    "gemini": "15:5",
+}
+
+# Longest a caller queues for a token before giving up, by priority.
+MAX_WAIT = {
+    PRIORITY_INTERACTIVE: float(os.getenv("RATE_LIMIT_MAX_WAIT", "5")),
+    PRIORITY_BACKGROUND: float(os.getenv("RATE_LIMIT_MAX_WAIT_BACKGROUND", "60")),
+}
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("upstream_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def background_priority():
+    """Mark upstream calls made inside the block as background refresh."""
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    """Priority of upstream calls made from the current context."""
+    return _priority.get()
+
+
+def submit_with_context(pool, fn, *args, **kwargs):
+    """pool.submit that carries the caller's priority into the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+class TokenBucket:
+    """
+    Token bucket with a priority wait queue. Tokens are granted strictly to
+    the head of the queue, ordered by (priority, arrival).
+    """
+
+    def __init__(self, name: str, per_minute: float, burst: int):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self.granted = {p: 0 for p in _PRIORITY_NAMES}
+        self.rejected = {p: 0 for p in _PRIORITY_NAMES}
+        self.wait_total = {p: 0.0 for p in _PRIORITY_NAMES}
+        self.wait_max = {p: 0.0 for p in _PRIORITY_NAMES}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        """Wait for a token; False if none could be granted within timeout."""
+        timeout = MAX_WAIT[priority] if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._queue[0] == ticket and self._tokens >= 1:
+                        heapq.heappop(self._queue)
+                        self._tokens -= 1
+                        waited = now - started
+                        self.granted[priority] += 1
+                        self.wait_total[priority] += waited
+                        self.wait_max[priority] = max(self.wait_max[priority], waited)
+                        return True
+
+                    if now >= deadline:
+                        self._queue.remove(ticket)
+                        heapq.heapify(self._queue)
+                        self.rejected[priority] += 1
+                        return False
+
+                    next_token = (1 - self._tokens) / self.rate if self.rate > 0 else deadline - now
+                    self._cond.wait(timeout=max(0.001, min(next_token, deadline - now)))
+            finally:
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            self._refill(time.monotonic())
+            by_priority = {}
+            for p, label in _PRIORITY_NAMES.items():
+                granted = self.granted[p]
+                by_priority[label] = {
+                    "granted": granted,
+                    "rejected": self.rejected[p],
+                    "avg_wait_ms": round(self.wait_total[p] / granted * 1000, 1) if granted else 0.0,
+                    "max_wait_ms": round(self.wait_max[p] * 1000, 1),
+                    "queued": sum(1 for q in self._queue if q[0] == p),
+                }
+            return {
+                "rate_per_minute": round(self.rate * 60, 2),
+                "burst": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "queue_depth": len(self._queue),
+                **by_priority,
+            }
+
+
+# ============================================================================
+# PROVIDER SCHEDULER
+# ============================================================================
+def _parse_limit(spec: str):
+    per_minute, _, burst = spec.partition(":")
+    return float(per_minute), int(burst or 1)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider: str) -> TokenBucket:
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            spec = os.getenv(f"RATE_LIMIT_{provider.upper()}", DEFAULT_LIMITS.get(provider, "60:10"))
+            bucket = TokenBucket(provider, *_parse_limit(spec))
+            _buckets[provider] = bucket
+        return bucket
+
+
+def acquire(provider: str, timeout: Optional[float] = None) -> bool:
+    """
+    Take one request token for provider at the current priority. Returns
+    False when the budget stays exhausted past the wait limit; callers then
+    use their fallback as they would for an HTTP 429.
+    """
+    granted = get_bucket(provider).acquire(_priority.get(), timeout)
+    if not granted:
+        print(f"[SCHEDULER] {provider} budget exhausted, skipping call")
+    return granted
+
+
+def scheduler_stats() -> Dict:
+    """Per-provider budget, queue depth and wait times."""
+    for provider in DEFAULT_LIMITS:
+        get_bucket(provider)
+    with _buckets_lock:
+        buckets = dict(_buckets)
+    return {name: bucket.stats() for name, bucket in buckets.items()}
+
+
+def reset_scheduler() -> None:
+    """Forget all buckets (re-reads limits from the environment)."""
+    with _buckets_lock:
+        _buckets.clear()
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = [
+    'acquire', 'background_priority', 'current_priority', 'submit_with_context', 'scheduler_stats', 'reset_scheduler',
+    'TokenBucket', 'PRIORITY_INTERACTIVE', 'PRIORITY_BACKGROUND'
+]
@@ -0,0 +1,300 @@
+"""
+TrackBets Backend - Record/Replay Module
+=========================================
+Captures raw upstream payloads (yfinance info and frames, Twelve Data JSON,
+GoogleNews results, Reddit posts, DDGS results, Gemini text) into a
+cassette, and plays them back so the fetch_all_data -> quick_analyze
+pipeline can be profiled deterministically without network.
+
+Every upstream call in scrapers/brain goes through upstream() (or
+upstream_stream() for streamed Gemini output). With no cassette active
+that is a plain call. Select a mode with REPLAY_MODE=record|replay and
+REPLAY_CASSETTE=path, or call start_recording()/start_replay().
+
+Cassette format: gzip-compressed JSON lines. The first line is a header
+({"cassette": 1, ...}); each further line is one call:
+
+    [source, key, elapsed_ms, payload, error]
+
+Payloads are plain JSON. DataFrames and datetimes are tagged
+({"__frame__": ...}, {"__dt__": ...}). Keys look like "TICKER|detail". On
+replay, calls are matched by (source, key) in recorded order. If a key was
+not recorded (e.g. a date in it moved on), the next unused call of the same
+source and ticker is used instead. REPLAY_SPEED scales the recorded delays:
+1 reproduces them and 0 replays with no delay.
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+import threading
+from collections import defaultdict, deque
+from datetime import datetime, date
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+
+CASSETTE_VERSION = 1
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+
+class ReplayMissError(RuntimeError):
+    """The cassette has no recorded call for this upstream request."""
+
+
+class ReplayedUpstreamError(RuntimeError):
+    """A call that failed while recording fails again on replay."""
+
+
+# ============================================================================
+# PAYLOAD ENCODING
+# ============================================================================
+def encode(value):
+    """Make a payload JSON-safe (DataFrames and datetimes are tagged)."""
+    if isinstance(value, dict):
+        return {str(k): encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if isinstance(value, (datetime, date)):
+        return {"__dt__": value.isoformat()}
+    if hasattr(value, "to_dict") and hasattr(value, "columns"):
+        split = value.to_dict(orient="split")
+        return {"__frame__": {
+            "index": [ts.isoformat() if hasattr(ts, "isoformat") else ts for ts in split["index"]],
+            "columns": [str(c) for c in split["columns"]],
+            "data": encode(split["data"]),
+        }}
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        return value.item()  # numpy scalar
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def decode(value):
+    """Inverse of encode()."""
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__dt__" in value:
+        return datetime.fromisoformat(value["__dt__"])
+    if "__frame__" in value:
+        import pandas as pd
+
+        frame = value["__frame__"]
+        index = pd.to_datetime(frame["index"]) if frame["index"] else frame["index"]
+        return pd.DataFrame(frame["data"], index=index, columns=frame["columns"])
+    return {k: decode(v) for k, v in value.items()}
+
+
+# ============================================================================
+# CASSETTE
+# ============================================================================
+class Cassette:
+    """In-memory list of recorded calls, with per-key replay queues."""
+
+    def __init__(self, path: str, mode: str, speed: float = 1.0):
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.calls: List[list] = []
+        self.hits = 0
+        self.misses = 0
+        self._queues: Dict[tuple, deque] = defaultdict(deque)
+        self._by_scope: Dict[tuple, deque] = defaultdict(deque)
+        self._used: set = set()
+        self._lock = threading.Lock()
+
+    def load(self) -> "Cassette":
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"{self.path}: unsupported cassette version {header.get('cassette')}")
+            self.calls = [json.loads(line) for line in f if line.strip()]
+        for i, (source, key, *_rest) in enumerate(self.calls):
+            self._queues[(source, key)].append(i)
+            self._by_scope[(source, _scope(key))].append(i)
+        return self
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            calls = list(self.calls)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"cassette": CASSETTE_VERSION, "recorded_at": datetime.now().isoformat(),
+                                "calls": len(calls)}) + "\n")
+            for call in calls:
+                f.write(json.dumps(call, separators=(",", ":")) + "\n")
+
+    def record(self, source: str, key: str, elapsed: float, payload, error: Optional[str]) -> None:
+        with self._lock:
+            self.calls.append([source, key, round(elapsed * 1000, 1), payload, error])
+
+    def next_call(self, source: str, key: str) -> list:
+        """Next unused recording for (source, key), else the next one for the same ticker."""
+        with self._lock:
+            for queue in (self._queues.get((source, key)), self._by_scope.get((source, _scope(key)))):
+                while queue:
+                    i = queue.popleft()
+                    if i not in self._used:
+                        self._used.add(i)
+                        self.hits += 1
+                        return self.calls[i]
+            self.misses += 1
+        raise ReplayMissError(f"no recorded {source} call for {key!r}")
+
+    def delay(self, elapsed_ms: float) -> None:
+        if self.speed > 0 and elapsed_ms:
+            time.sleep(elapsed_ms / 1000 * self.speed)
+
+
+def _scope(key: str) -> str:
+    return key.split("|", 1)[0]
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def start_recording(path: str) -> Cassette:
+    """Record every upstream call from now on; saved by stop() (or at exit)."""
+    global _cassette
+    with _cassette_lock:
+        _cassette = Cassette(path, MODE_RECORD)
+        return _cassette
+
+
+def start_replay(path: str, speed: float = 1.0) -> Cassette:
+    """Serve upstream calls from the cassette at path; speed 0 means no delays."""
+    global _cassette
+    cassette = Cassette(path, MODE_REPLAY, speed).load()
+    with _cassette_lock:
+        _cassette = cassette
+    return cassette
+
+
+def stop() -> Optional[Cassette]:
+    """Leave record/replay mode, saving a recording."""
+    global _cassette
+    with _cassette_lock:
+        cassette, _cassette = _cassette, None
+    if cassette is not None and cassette.mode == MODE_RECORD:
+        cassette.save()
+        print(f"[REPLAY] Saved {len(cassette.calls)} upstream calls to {cassette.path}")
+    return cassette
+
+
+def replay_status() -> Dict:
+    cassette = _cassette
+    if cassette is None:
+        return {"mode": "off"}
+    return {"mode": cassette.mode, "path": cassette.path, "calls": len(cassette.calls),
+            "hits": cassette.hits, "misses": cassette.misses, "speed": cassette.speed}
+
+
+# ============================================================================
+# UPSTREAM BOUNDARY
+# ============================================================================
+def upstream(source: str, key: str, fetch: Callable):
+    """
+    Run one upstream call through the active cassette. fetch must return
+    plain data (dicts, lists, DataFrames), not live client objects, so the
+    value can be stored and rebuilt.
+    """
+    cassette = _cassette
+    if cassette is None:
+        return fetch()
+
+    if cassette.mode == MODE_REPLAY:
+        _, _, elapsed_ms, payload, error = cassette.next_call(source, key)
+        cassette.delay(elapsed_ms)
+        if error is not None:
+            raise ReplayedUpstreamError(error)
+        return decode(payload)
+
+    started = time.monotonic()
+    try:
+        value = fetch()
+    except Exception as e:
+        cassette.record(source, key, time.monotonic() - started, None, str(e) or type(e).__name__)
+        raise
+    cassette.record(source, key, time.monotonic() - started, encode(value), None)
+    return value
+
+
+def upstream_stream(source: str, key: str, fetch: Callable):
+    """
+    Streamed variant for Gemini. fetch opens the stream (it is called right
+    away, so callers can time it); the returned iterable yields objects with
+    a .text attribute. Recordings store each chunk with its offset, so replay
+    keeps the original pacing (scaled by the cassette speed).
+    """
+    cassette = _cassette
+    if cassette is None:
+        return fetch()
+
+    if cassette.mode == MODE_REPLAY:
+        return _replayed_chunks(cassette, cassette.next_call(source, key))
+
+    started = time.monotonic()
+    try:
+        response = fetch()
+    except Exception as e:
+        cassette.record(source, key, time.monotonic() - started, [], str(e) or type(e).__name__)
+        raise
+    return _recorded_chunks(cassette, source, key, started, response)
+
+
+def _replayed_chunks(cassette: Cassette, call: list):
+    _, _, _, chunks, error = call
+    previous = 0.0
+    for offset_ms, text in chunks or []:
+        cassette.delay(offset_ms - previous)
+        previous = offset_ms
+        yield SimpleNamespace(text=text)
+    if error is not None:
+        raise ReplayedUpstreamError(error)
+
+
+def _recorded_chunks(cassette: Cassette, source: str, key: str, started: float, response):
+    chunks, error = [], None
+    try:
+        for chunk in response:
+            chunks.append([round((time.monotonic() - started) * 1000, 1), chunk.text or ""])
+            yield chunk
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        raise
+    finally:
+        cassette.record(source, key, time.monotonic() - started, chunks, error)
+
+
+def _start_from_env() -> None:
+    mode = os.getenv("REPLAY_MODE", "").lower()
+    path = os.getenv("REPLAY_CASSETTE")
+    if not mode or not path:
+        return
+    if mode == MODE_RECORD:
+        start_recording(path)
+        atexit.register(stop)
+    elif mode == MODE_REPLAY:
+        start_replay(path, float(os.getenv("REPLAY_SPEED", "1")))
+    print(f"[REPLAY] {mode} mode, cassette {path}")
+
+
+_start_from_env()
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = [
+    'upstream', 'upstream_stream', 'start_recording', 'start_replay', 'stop', 'replay_status',
+    'Cassette', 'ReplayMissError', 'ReplayedUpstreamError', 'encode', 'decode'
+]
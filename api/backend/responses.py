@@ -0,0 +1,49 @@
+"""
+TrackBets Backend - Response Encoding Module
+=============================================
+Compact, fast JSON for API responses. orjson is used when installed; it
+serializes large payloads (long graph_data histories, batch results) several
+times faster than the stdlib encoder. Without it the stdlib encoder is used
+with compact separators.
+"""
+
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _default(value):
+    """Encode the non-JSON types that reach responses (numpy scalars, datetimes)."""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(content) -> bytes:
+    """Serialize content to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps(). Endpoints that return one directly
+    also skip FastAPI's jsonable_encoder pass over the content.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['FastJSONResponse', 'dumps']
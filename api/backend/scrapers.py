@@ -6,43 +6,214 @@ All functions have try-except blocks to prevent crashing.
 """
 
 import os
+import time
+import threading
+from collections import deque
 from typing import Optional, List, Dict
-from datetime import datetime
+from datetime import datetime, date, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .cache import TTLCache
+from .history_store import get_history_store
+from .news_store import get_news_store, NEW_HEADLINE_TAG
+from .http_client import get_session, build_session
+from .ratelimit import acquire, background_priority, current_priority, submit_with_context, PRIORITY_BACKGROUND
+from .breaker import guard, circuit_open, CircuitOpenError
+from .metrics import timed_stage, record_fallback
+from .replay import upstream
+from .sentiment import score_items, aggregate_sentiment
+from .graph_format import encode_series, empty_graph
+
+
+# Shared pool for interactive scraper work (the per-source fan-out).
+# Bounded so a burst of analyze requests cannot spawn an unbounded number of
+# scraper threads.
+_FETCH_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FETCH_WORKERS", "16")),
+    thread_name_prefix="scraper"
+)
+# Background refreshes (prefetch passes, stale quotes) run on their own pool:
+# they may queue for a rate-limit token for RATE_LIMIT_MAX_WAIT_BACKGROUND
+# seconds and must not hold the slots interactive requests need.
+_BACKGROUND_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BACKGROUND_WORKERS", "4")),
+    thread_name_prefix="background"
+)
+
+
+def _scraper_pool() -> ThreadPoolExecutor:
+    """Pool for scraper work submitted at the current context's priority."""
+    return _BACKGROUND_POOL if current_priority() == PRIORITY_BACKGROUND else _FETCH_POOL
 
 
-# ============================================================================
-# ============================================================================
 # ============================================================================
 # 1. STOCK PRICE SCRAPER (yfinance + Twelve Data)
 # ============================================================================
-def get_stock_price(ticker: str) -> Dict:
+CRYPTO_MARKERS = ["BTC", "ETH", "DOGE", "SOL", "CRYPTO"]
+
+# Quote freshness per market (seconds). Crypto trades around the clock and
+# moves fastest; NSE/BSE quotes from yfinance are delayed anyway.
+QUOTE_TTL = {
+    "crypto": float(os.getenv("QUOTE_TTL_CRYPTO", "15")),
+    "india": float(os.getenv("QUOTE_TTL_INDIA", "60")),
+    "us": float(os.getenv("QUOTE_TTL_US", "30")),
+}
+# How long past its TTL a quote may still be served while it is refreshed.
+QUOTE_STALE_TTL = float(os.getenv("QUOTE_STALE_TTL", "300"))
+
+_quote_cache = TTLCache(maxsize=int(os.getenv("QUOTE_CACHE_SIZE", "512")), name="quotes")
+_quote_refreshing = set()
+_quote_refresh_lock = threading.Lock()
+
+
+def _market_of(ticker: str) -> str:
+    """Classify a ticker as crypto, india (.NS/.BO) or us."""
+    ticker_upper = ticker.upper()
+    if any(x in ticker_upper for x in CRYPTO_MARKERS) or ticker_upper.endswith(("-USD", "/USD")):
+        return "crypto"
+    if ".NS" in ticker_upper or ".BO" in ticker_upper:
+        return "india"
+    return "us"
+
+
+def get_stock_price(ticker: str, use_cache: bool = True) -> Dict:
+    """
+    Fetch current stock price, served from the in-process quote cache.
+
+    Fresh quotes are returned directly. Expired quotes inside the stale window
+    are returned immediately while a background refresh fetches a new one.
+    Emergency mocks are never cached.
+    """
+    if not use_cache:
+        return _fetch_stock_price(ticker)
+
+    key = ticker.upper().replace("/", "-")
+    quote, state = _quote_cache.lookup(key)
+
+    if state == "fresh":
+        return quote
+    if state == "stale":
+        _refresh_quote_async(key, ticker)
+        return quote
+
+    return _store_quote(key, _fetch_stock_price(ticker))
+
+
+def _store_quote(key: str, quote: Dict) -> Dict:
+    if quote.get("source") != "Emergency Mock":
+        _quote_cache.set(key, quote, ttl=QUOTE_TTL[_market_of(key)], stale_ttl=QUOTE_STALE_TTL)
+    return quote
+
+
+def _refresh_quote_async(key: str, ticker: str) -> None:
+    """Refresh a stale quote in the background, at most once per ticker at a time."""
+    with _quote_refresh_lock:
+        if key in _quote_refreshing:
+            return
+        _quote_refreshing.add(key)
+
+    def refresh():
+        try:
+            with background_priority():
+                _store_quote(key, _fetch_stock_price(ticker))
+        except Exception as e:
+            print(f"[SCRAPER] Background quote refresh failed for {key}: {e}")
+        finally:
+            with _quote_refresh_lock:
+                _quote_refreshing.discard(key)
+
+    submit_with_context(_BACKGROUND_POOL, refresh)
+
+
+def refresh_quote(ticker: str) -> Dict:
+    """Fetch a new quote now and store it in the cache (used by the prefetcher)."""
+    return _store_quote(ticker.upper().replace("/", "-"), _fetch_stock_price(ticker))
+
+
+def quote_cache_stats() -> Dict:
+    """Hit/miss counters of the quote cache."""
+    return {**_quote_cache.stats(), "refreshing": len(_quote_refreshing)}
+
+
+def _fetch_stock_price(ticker: str) -> Dict:
     """
     Fetch current stock price with strict priority:
     1. yfinance (Real)
     2. Twelve Data (Real Backup)
     3. Realistic Mock (Last Resort)
+
+    With HEDGE_QUOTES on, Twelve Data is also fired when yfinance is slower
+    than its recent p95 and whichever valid quote arrives first wins.
     """
     ticker_upper = ticker.upper()
     is_indian = ".NS" in ticker_upper or ".BO" in ticker_upper
+    yf_ticker = ticker_upper.replace("/", "-") # BTC/USD -> BTC-USD
+    td_ticker = ticker_upper.replace("-", "/") # BTC-USD -> BTC/USD
+    twelve_data_key = os.getenv("TWELVE_DATA_API_KEY")
+
+    if HEDGE_QUOTES and twelve_data_key:
+        quote = _hedged_quote(
+            lambda: _price_from_yfinance(yf_ticker, is_indian),
+            lambda: get_price_twelve_data(td_ticker, twelve_data_key)
+        )
+        if quote:
+            if quote.get("source") != "yfinance":
+                record_fallback("price_data", "backup")
+            return quote
+    else:
+        # =========================================================
+        # ATTEMPT 1: yfinance (Primary)
+        # =========================================================
+        quote = _timed_primary(_price_from_yfinance, yf_ticker, is_indian)
+        if quote:
+            return quote
+
+        # =========================================================
+        # ATTEMPT 2: Twelve Data (Backup)
+        # =========================================================
+        if twelve_data_key:
+            print(f"[SCRAPER] Trying Twelve Data backup for {td_ticker}...")
+            td_data = get_price_twelve_data(td_ticker, twelve_data_key)
+            if td_data:
+                record_fallback("price_data", "backup")
+                return td_data
 
     # =========================================================
-    # ATTEMPT 1: yfinance (Primary)
+    # ATTEMPT 3: Emergency Mock (Realistic Values)
     # =========================================================
-    yf_ticker = ticker_upper.replace("/", "-") # BTC/USD -> BTC-USD
+    print(f"[SCRAPER] All APIs failed. Generating realistic mock for {ticker_upper}...")
+    record_fallback("price_data", "mock")
+    return _get_realistic_mock(ticker_upper, is_indian)
+
+
+def _price_from_yfinance(yf_ticker: str, is_indian: bool) -> Optional[Dict]:
+    """Quote from yfinance (.info, then today's .history bar), or None."""
     try:
+        if circuit_open("yfinance_info") and circuit_open("yfinance_history"):
+            raise CircuitOpenError("yfinance circuits open")
+        if not acquire("yfinance"):
+            raise RuntimeError("yfinance request budget exhausted")
         import yfinance as yf
         stock = yf.Ticker(yf_ticker)
         
         # Try .info first (sometimes faster/richer)
         try:
-            info = stock.info
+            with guard("yfinance_info"):
+                try:
+                    info = upstream("yfinance_info", f"{yf_ticker}|info", lambda: stock.info)
+                except Exception as e:
+                    # Unknown or delisted symbols are not the service's fault
+                    if _upstream_exception(e):
+                        raise
+                    info = None
             if info and 'regularMarketPrice' in info and info['regularMarketPrice'] is not None:
                 return _format_contract(info, source="yfinance")
         except:
             pass
             
         # Fallback to .history (more reliable for price)
-        hist = stock.history(period="1d")
+        with guard("yfinance_history"):
+            hist = upstream("yfinance_history", f"{yf_ticker}|1d", lambda: stock.history(period="1d"))
         if not hist.empty:
             current = float(hist['Close'].iloc[-1])
             prev = float(hist['Open'].iloc[-1]) # usage as approximation
@@ -63,24 +234,109 @@ def get_stock_price(ticker: str) -> Dict:
             
     except Exception as e:
         print(f"[SCRAPER] yfinance failed for {yf_ticker}: {e}")
+    return None
 
-    # =========================================================
-    # ATTEMPT 2: Twelve Data (Backup)
-    # =========================================================
-    td_ticker = ticker_upper.replace("-", "/") # BTC-USD -> BTC/USD
-    twelve_data_key = os.getenv("TWELVE_DATA_API_KEY")
-    
-    if twelve_data_key:
-        print(f"[SCRAPER] Trying Twelve Data backup for {td_ticker}...")
-        td_data = get_price_twelve_data(td_ticker, twelve_data_key)
-        if td_data:
-            return td_data
 
-    # =========================================================
-    # ATTEMPT 3: Emergency Mock (Realistic Values)
-    # =========================================================
-    print(f"[SCRAPER] All APIs failed. Generating realistic mock for {ticker_upper}...")
-    return _get_realistic_mock(ticker_upper, is_indian)
+# ----------------------------------------------------------------------------
+# Hedged quotes
+# ----------------------------------------------------------------------------
+HEDGE_QUOTES = os.getenv("HEDGE_QUOTES", "false").lower() in ("1", "true", "yes")
+# The backup fires once the primary has been slower than this percentile of
+# its recent latencies; HEDGE_DEFAULT_DELAY is used until enough samples exist.
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "1.0"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+HEDGE_MAX_DELAY = float(os.getenv("HEDGE_MAX_DELAY", "3.0"))
+HEDGE_MIN_SAMPLES = 20
+
+# Separate from _FETCH_POOL: hedged fetches already run on it and must not
+# wait for slots in the pool they occupy.
+_HEDGE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("HEDGE_WORKERS", "32")),
+    thread_name_prefix="hedge"
+)
+_primary_latencies = deque(maxlen=200)
+_hedge_counts = {"requests": 0, "hedged": 0, "primary_wins": 0, "backup_wins": 0, "failed": 0}
+_hedge_lock = threading.Lock()
+
+
+def _record_primary_latency(seconds: float) -> None:
+    with _hedge_lock:
+        _primary_latencies.append(seconds)
+
+
+def _timed_primary(fn, *args):
+    """
+    Call the primary provider and feed its latency into the hedge delay.
+    Only calls that returned a quote count: fast failures (open circuit,
+    exhausted budget) would otherwise drag the delay down to the minimum.
+    """
+    started = time.monotonic()
+    quote = fn(*args)
+    if quote:
+        _record_primary_latency(time.monotonic() - started)
+    return quote
+
+
+def hedge_delay() -> float:
+    """Current wait before the backup provider is fired."""
+    with _hedge_lock:
+        samples = sorted(_primary_latencies)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    p = samples[min(len(samples) - 1, int(HEDGE_PERCENTILE * len(samples)))]
+    return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, p))
+
+
+def _count_hedge(outcome: str, hedged: bool) -> None:
+    with _hedge_lock:
+        _hedge_counts["requests"] += 1
+        _hedge_counts["hedged"] += int(hedged)
+        _hedge_counts[outcome] += 1
+
+
+def _hedged_quote(primary, backup, delay: Optional[float] = None) -> Optional[Dict]:
+    """
+    Run primary; if it has not returned a quote within `delay` (default: the
+    p95-based hedge_delay()), also run backup and return the first valid
+    quote. The loser is cancelled if it has not started yet; a call already
+    in flight cannot be interrupted, so its result is discarded. Returns
+    None if neither provider produced a quote.
+    """
+    delay = hedge_delay() if delay is None else delay
+    started = time.monotonic()
+    first = submit_with_context(_HEDGE_POOL, primary)
+    first.add_done_callback(
+        lambda f: not f.cancelled() and f.exception() is None and f.result()
+        and _record_primary_latency(time.monotonic() - started)
+    )
+
+    done, _ = wait([first], timeout=delay)
+    if done and first.exception() is None and first.result():
+        _count_hedge("primary_wins", hedged=False)
+        return first.result()
+
+    second = submit_with_context(_HEDGE_POOL, backup)
+    pending = {first, second}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            quote = future.exception() is None and future.result()
+            if quote:
+                for loser in pending:
+                    loser.cancel()
+                _count_hedge("primary_wins" if future is first else "backup_wins", hedged=True)
+                return quote
+
+    _count_hedge("failed", hedged=True)
+    return None
+
+
+def hedge_stats() -> Dict:
+    """Hedging counters and the current hedge delay."""
+    with _hedge_lock:
+        counts = dict(_hedge_counts)
+    return {**counts, "enabled": HEDGE_QUOTES, "delay_ms": round(hedge_delay() * 1000, 1)}
 
 
 def _format_contract(info: Dict, source: str) -> Dict:
@@ -152,15 +408,20 @@ def _get_realistic_mock(ticker: str, is_indian: bool) -> Dict:
 
 def get_price_twelve_data(ticker: str, api_key: str) -> Optional[Dict]:
     """Fetch real-time price from Twelve Data API."""
+    if circuit_open("twelvedata") or not acquire("twelvedata"):
+        return None
     try:
-        import requests
         url = f"https://api.twelvedata.com/quote?symbol={ticker}&apikey={api_key}"
-        response = requests.get(url, timeout=5)
-        
-        try:
-            data = response.json()
-        except:
-            return None
+        with guard("twelvedata") as call:
+            try:
+                data = upstream("twelvedata", f"{ticker}|quote", lambda: get_session().get(url, timeout=5).json())
+            except ValueError:
+                call.fail("invalid JSON response")
+                return None
+            # Errors come back as {"code": ..., "message": ...}; only rate
+            # limiting and server errors count against the source.
+            if "price" not in data and _upstream_error_code(data):
+                call.fail(f"{data.get('code')}: {data.get('message')}")
         
         if "price" not in data:
             return None
@@ -187,42 +448,98 @@ def get_price_twelve_data(ticker: str, api_key: str) -> Optional[Dict]:
         return None
 
 
+def _upstream_exception(error: Exception) -> bool:
+    """True for exceptions that mean the service itself is unwell (network, 429, 5xx)."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # requests/curl_cffi errors and socket timeouts are OSErrors
+    return isinstance(error, OSError) or type(error).__name__ == "YFRateLimitError"
+
+
+def _upstream_error_code(payload) -> bool:
+    """True for Twelve Data error payloads that mean the service itself is unwell."""
+    try:
+        code = int(payload.get("code") or 0)
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return code == 429 or code >= 500
+
+
 # ============================================================================
 # 2. NEWS SCRAPER (GoogleNews)
 # ============================================================================
+# A refresh within this many hours of the previous one only searches the
+# last day; otherwise (and on first fetch) the full week is searched.
+NEWS_DELTA_WINDOW_HOURS = float(os.getenv("NEWS_DELTA_WINDOW_HOURS", "20"))
+
+
 def get_news(ticker: str, max_results: int = 5) -> str:
     """
     Fetch top news headlines for a stock ticker.
     Returns a formatted string of headlines.
+
+    Articles are ingested into the per-ticker news store, which drops ones
+    already seen; the newest max_results from its rolling window are shown.
     """
+    store = get_news_store()
     try:
         from GoogleNews import GoogleNews
         
+        if circuit_open("googlenews"):
+            return _format_stored_news(ticker, max_results, "news source temporarily disabled")
+        if not acquire("googlenews"):
+            return _format_stored_news(ticker, max_results, "request budget exhausted")
+        
         # Clean ticker for search
         search_term = ticker.replace(".NS", "").replace(".BO", "").replace(".NYSE", "")
         
-        # Initialize GoogleNews
-        gn = GoogleNews(lang='en', period='7d')
+        # Only the last day is needed if we refreshed recently
+        last = store.last_refresh(ticker)
+        recent = last is not None and time.time() - last < NEWS_DELTA_WINDOW_HOURS * 3600
+        gn = GoogleNews(lang='en', period='1d' if recent else '7d')
         gn.clear()
-        gn.search(f"{search_term} stock")
-        
-        results = gn.results()[:max_results]
-        
-        if not results:
-            return f"No recent news found for {search_term}."
+        with guard("googlenews"):
+            results = upstream("googlenews", f"{ticker}|{'1d' if recent else '7d'}",
+                               lambda: (gn.search(f"{search_term} stock"), gn.results())[1])
         
-        # Format headlines
-        headlines = []
-        for i, article in enumerate(results, 1):
-            title = article.get('title', 'No title')
-            source = article.get('media', 'Unknown')
-            headlines.append(f"{i}. [{source}] {title}")
+        new = store.ingest(ticker, [{
+            "title": article.get('title', 'No title'),
+            "text": f"{article.get('title', '')} {article.get('desc', '')}",
+            "source": "news",
+            "publisher": article.get('media', 'Unknown'),
+            "published": _epoch(article.get('datetime')),
+            "url": article.get('link'),
+        } for article in results])
+        if new:
+            print(f"[NEWS] {len(new)} new article(s) for {ticker}")
         
-        return "\n".join(headlines)
+        return _format_stored_news(ticker, max_results)
         
     except Exception as e:
         print(f"[SCRAPER ERROR] get_news({ticker}): {str(e)}")
-        return f"News unavailable for {ticker}. Error: {str(e)}"
+        record_fallback("news", "error")
+        return _format_stored_news(ticker, max_results, str(e))
+
+
+def _format_stored_news(ticker: str, max_results: int, error: Optional[str] = None) -> str:
+    """Format the newest stored headlines; on error with nothing stored, the usual fallback."""
+    items = get_news_store().window(ticker)
+    _remember_items("news", ticker, items)
+    if not items:
+        if error:
+            return f"News unavailable for {ticker}. Error: {error}"
+        search_term = ticker.replace(".NS", "").replace(".BO", "").replace(".NYSE", "")
+        return f"No recent news found for {search_term}."
+    
+    # Format headlines; ones from the latest ingest are tagged so the model can weigh them
+    headlines = []
+    for i, article in enumerate(items[:max_results], 1):
+        tag = f"{NEW_HEADLINE_TAG} " if article.get("new") else ""
+        headlines.append(f"{i}. {tag}[{article.get('publisher', 'Unknown')}] {article['title']}")
+    
+    return "\n".join(headlines)
 
 
 # ============================================================================
@@ -234,23 +551,16 @@ def get_reddit_posts(ticker: str, max_posts: int = 5) -> str:
     Returns a formatted string of posts with sentiment hints.
     """
     try:
-        import praw
-        
         # Check for Reddit API credentials
         client_id = os.getenv("REDDIT_CLIENT_ID")
         client_secret = os.getenv("REDDIT_CLIENT_SECRET")
         user_agent = os.getenv("REDDIT_USER_AGENT", "TrackBets/1.0")
         
-        if not client_id or not client_secret:
+        if not client_id or not client_secret or circuit_open("reddit"):
             # Fallback: Use DuckDuckGo search for Reddit posts
             return _get_reddit_via_duckduckgo(ticker)
         
-        # Initialize Reddit client
-        reddit = praw.Reddit(
-            client_id=client_id,
-            client_secret=client_secret,
-            user_agent=user_agent
-        )
+        reddit = _get_reddit_client(client_id, client_secret, user_agent)
         
         # Clean ticker
         search_term = ticker.replace(".NS", "").replace(".BO", "")
@@ -260,22 +570,36 @@ def get_reddit_posts(ticker: str, max_posts: int = 5) -> str:
         posts = []
         
         for sub_name in subreddits:
+            if circuit_open("reddit") or not acquire("reddit"):
+                break
             try:
-                subreddit = reddit.subreddit(sub_name)
-                for post in subreddit.search(search_term, limit=2, time_filter="week"):
-                    sentiment = _quick_sentiment(post.title + " " + (post.selftext[:200] if post.selftext else ""))
+                with guard("reddit"):
+                    found = upstream("reddit", f"{ticker}|{sub_name}", lambda: [{
+                        "title": post.title,
+                        "selftext": post.selftext,
+                        "score": post.score,
+                        "created_utc": getattr(post, "created_utc", None),
+                    } for post in reddit.subreddit(sub_name).search(search_term, limit=2, time_filter="week")])
+                for post in found:
                     posts.append({
-                        "title": post.title[:100],
+                        "title": post["title"][:100],
                         "subreddit": sub_name,
-                        "upvotes": post.score,
-                        "sentiment": sentiment
+                        "upvotes": post["score"],
+                        "text": post["title"] + " " + (post["selftext"][:200] if post["selftext"] else ""),
+                        "source": "reddit",
+                        "published": post["created_utc"]
                     })
             except:
                 continue
         
+        _remember_items("social", ticker, posts)
         if not posts:
             return f"No Reddit discussions found for {search_term} in the past week."
         
+        # Score every post in one batch
+        for p, scored in zip(posts, score_items([p["text"] for p in posts])):
+            p["sentiment"] = scored["label"]
+        
         # Sort by upvotes and format
         posts = sorted(posts, key=lambda x: x['upvotes'], reverse=True)[:max_posts]
         
@@ -287,9 +611,34 @@ def get_reddit_posts(ticker: str, max_posts: int = 5) -> str:
         
     except Exception as e:
         print(f"[SCRAPER ERROR] get_reddit_posts({ticker}): {str(e)}")
+        record_fallback("social", "ddgs")
         return _get_reddit_via_duckduckgo(ticker)
 
 
+_reddit_clients = {}
+_reddit_lock = threading.Lock()
+
+
+def _get_reddit_client(client_id: str, client_secret: str, user_agent: str):
+    """
+    Reuse one praw client per credential set. Each gets its own pooled
+    keep-alive session because prawcore rewrites the session's User-Agent.
+    """
+    key = (client_id, client_secret, user_agent)
+    with _reddit_lock:
+        reddit = _reddit_clients.get(key)
+        if reddit is None:
+            import praw
+            reddit = praw.Reddit(
+                client_id=client_id,
+                client_secret=client_secret,
+                user_agent=user_agent,
+                requestor_kwargs={"session": build_session()}
+            )
+            _reddit_clients[key] = reddit
+        return reddit
+
+
 def _get_reddit_via_duckduckgo(ticker: str) -> str:
     """
     Fallback: Scrape Reddit mentions via DuckDuckGo search.
@@ -297,14 +646,27 @@ def _get_reddit_via_duckduckgo(ticker: str) -> str:
     try:
         from duckduckgo_search import DDGS
         
+        if circuit_open("ddgs"):
+            return "Social media data unavailable (source temporarily disabled)."
+        if not acquire("ddgs"):
+            return "Social media data unavailable (API limit reached)."
+        
         search_term = ticker.replace(".NS", "").replace(".BO", "")
         
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                f"{search_term} stock site:reddit.com",
-                max_results=5
-            ))
+        def search():
+            with DDGS() as ddgs:
+                return list(ddgs.text(
+                    f"{search_term} stock site:reddit.com",
+                    max_results=5
+                ))
         
+        with guard("ddgs"):
+            results = upstream("ddgs", f"{ticker}|reddit", search)
+        
+        _remember_items("social", ticker, [
+            {"title": r.get('title', ''), "text": f"{r.get('title', '')} {r.get('body', '')}", "source": "ddgs"}
+            for r in results
+        ])
         if not results:
             return f"No Reddit posts found for {search_term}."
         
@@ -320,33 +682,74 @@ def _get_reddit_via_duckduckgo(ticker: str) -> str:
         return "Social media data unavailable (API limit reached)."
 
 
-def _quick_sentiment(text: str) -> str:
+# ============================================================================
+# 4. AGGREGATED SENTIMENT (news + social)
+# ============================================================================
+# get_news / get_reddit_posts keep the raw items they fetched for this long,
+# so the sentiment stage can score them without fetching again.
+RECENT_ITEMS_TTL = float(os.getenv("RECENT_ITEMS_TTL", "300"))
+_recent_items = TTLCache(maxsize=512, ttl=RECENT_ITEMS_TTL, name="items")
+
+
+def _remember_items(kind: str, ticker: str, items: List[Dict]) -> None:
+    _recent_items.set((kind, ticker.upper()), items)
+
+
+def _epoch(value) -> Optional[float]:
+    """datetime -> epoch seconds; anything else (None, NaN, strings) -> None."""
+    try:
+        return value.timestamp() if isinstance(value, datetime) else None
+    except ValueError:  # pandas NaT
+        return None
+
+
+def get_aggregated_sentiment(ticker: str, fetch_missing: bool = True) -> Dict:
     """
-    Quick rule-based sentiment detection.
-    Returns: 🟢 Bullish, 🔴 Bearish, 🟡 Neutral
+    Weighted sentiment over the ticker's recent news and social items (see
+    sentiment.aggregate_sentiment). Items fetched by get_news /
+    get_reddit_posts in the last RECENT_ITEMS_TTL seconds are reused; with
+    fetch_missing=False, groups that were not fetched are left empty.
     """
-    text = text.lower()
-    
-    bullish_words = ['buy', 'bullish', 'moon', 'rocket', 'undervalued', 'long', 'calls', 'breakout', 'strong', 'growth']
-    bearish_words = ['sell', 'bearish', 'crash', 'puts', 'overvalued', 'short', 'dump', 'avoid', 'weak', 'decline']
-    
-    bullish_count = sum(1 for word in bullish_words if word in text)
-    bearish_count = sum(1 for word in bearish_words if word in text)
-    
-    if bullish_count > bearish_count:
-        return "🟢 Bullish"
-    elif bearish_count > bullish_count:
-        return "🔴 Bearish"
-    return "🟡 Neutral"
+    items = {}
+    for kind, fetch in (("news", get_news), ("social", get_reddit_posts)):
+        found = _recent_items.get((kind, ticker.upper()))
+        if found is None and fetch_missing:
+            fetch(ticker)
+            found = _recent_items.get((kind, ticker.upper()))
+        items[kind] = found or []
+    return aggregate_sentiment(items["news"], items["social"])
+
+
+# Name used by the original flashcard pipeline.
+fetch_aggregated_sentiment = get_aggregated_sentiment
 
 
 # ============================================================================
 # 5. HISTORICAL DATA SCRAPER (Graph)
 # ============================================================================
-def get_historical_data(ticker: str, period: str = "1mo") -> Dict:
+HISTORY_INTERVAL = "1day"
+
+# Calendar days covered by each supported graph period.
+HISTORY_PERIOD_DAYS = {
+    "5d": 5, "1mo": 30, "3mo": 91, "6mo": 182,
+    "1y": 365, "2y": 730, "5y": 1826,
+}
+# Stored history counts as covering a period if its first bar is within this
+# many days of the period start (weekends and market holidays).
+HISTORY_COVERAGE_SLACK_DAYS = 7
+# The first download for a ticker covers at least this period, so the
+# store holds enough bars for the longest indicator window (SMA 50).
+HISTORY_BOOTSTRAP_PERIOD = os.getenv("HISTORY_BOOTSTRAP_PERIOD", "6mo")
+
+
+def get_historical_data(ticker: str, period: str = "1mo", graph_format: Optional[str] = None) -> Dict:
     """
     Fetch historical data for graphing.
     Priority: Twelve Data -> yfinance
+
+    Bars are persisted in the local history store. Once a ticker's period is
+    covered, only the bars since the last stored one are fetched and appended.
+    graph_format is one of graph_format.GRAPH_FORMATS (default GRAPH_FORMAT).
     """
     ticker = ticker.upper()
     
@@ -354,67 +757,387 @@ def get_historical_data(ticker: str, period: str = "1mo") -> Dict:
     yf_ticker = ticker.replace("/", "-")
     td_ticker = ticker.replace("-", "/")
     
+    store = get_history_store()
+    window_start = _window_start(period)
+    
+    # Coverage is checked against the stored period, not just the graph
+    # period, so tickers first stored with a short history (e.g. by a bulk
+    # 1mo download) are backfilled to the bootstrap period.
+    fetch_period = _storage_period(period)
+    fetch_days = HISTORY_PERIOD_DAYS.get(fetch_period)
+    coverage_start = _window_start(fetch_period)
+    
+    coverage_limit = None
+    if coverage_start:
+        coverage_limit = (date.fromisoformat(coverage_start) + timedelta(days=HISTORY_COVERAGE_SLACK_DAYS)).isoformat()
+    
+    first, last = store.bounds(yf_ticker, HISTORY_INTERVAL)
+    covered = False
+    if last and coverage_limit:
+        # Also covered when the stored bars reach back to the ticker's first
+        # one (recent listings have less history than the period).
+        listed = store.history_start(yf_ticker, HISTORY_INTERVAL)
+        covered = first[:10] <= coverage_limit or (listed is not None and first[:10] <= listed[:10])
+    
+    # Re-fetch from the last stored bar (inclusive) so it gets its final close.
+    since = last[:10] if covered else None
+    bars, source, error = _fetch_history_bars(yf_ticker, td_ticker, fetch_period, fetch_days, since)
+    
+    if bars:
+        store.append(yf_ticker, HISTORY_INTERVAL, bars)
+        if since is None and coverage_limit and bars[0]["time"][:10] > coverage_limit:
+            # A full-period download that starts late: there is no older history.
+            store.set_history_start(yf_ticker, HISTORY_INTERVAL, bars[0]["time"][:10])
+    elif not covered:
+        record_fallback("graph_data", "empty")
+        return empty_graph(error or "No history found", graph_format)
+    elif error:
+        # Serving the stored bars without the latest ones.
+        record_fallback("graph_data", "stored")
+    
+    return _graph_from_store(store, yf_ticker, window_start, source or "store", error, graph_format)
+
+
+def get_indicators(ticker: str) -> Dict:
+    """
+    Technical indicators over the stored daily bars (see indicators.py).
+    Reads only the local history store, so call it after get_historical_data.
+    """
+    from .indicators import indicators_for
+
+    yf_ticker = ticker.upper().replace("/", "-")
+    bars = get_history_store().load(yf_ticker, HISTORY_INTERVAL, since=_window_start("1y"))
+    if not bars:
+        return {"error": "No history found"}
+    return indicators_for(yf_ticker, bars)
+
+
+def _storage_period(period: str) -> str:
+    """The longer of period and HISTORY_BOOTSTRAP_PERIOD, the span to keep stored."""
+    days = HISTORY_PERIOD_DAYS.get(period)
+    bootstrap_days = HISTORY_PERIOD_DAYS.get(HISTORY_BOOTSTRAP_PERIOD)
+    if days and bootstrap_days and bootstrap_days > days:
+        return HISTORY_BOOTSTRAP_PERIOD
+    return period
+
+
+def _window_start(period: str) -> Optional[str]:
+    """First calendar day of a graph period, or None for open-ended periods."""
+    days = HISTORY_PERIOD_DAYS.get(period)
+    return (date.today() - timedelta(days=days)).isoformat() if days else None
+
+
+def _graph_from_store(store, yf_ticker: str, window_start: Optional[str], source: str, error: Optional[str] = None,
+                      graph_format: Optional[str] = None) -> Dict:
+    times, closes = store.load_closes(yf_ticker, HISTORY_INTERVAL, since=window_start)
+    if not times:
+        return empty_graph(error or "No history found", graph_format)
+    
+    return dict(encode_series(times, closes, graph_format), source=source)
+
+
+def _bars_from_frame(hist) -> List[Dict]:
+    """Convert a yfinance OHLCV DataFrame into store bars (oldest first)."""
+    return [{
+        "time": ts.strftime("%Y-%m-%d"),
+        "open": float(o),
+        "high": float(h),
+        "low": float(l),
+        "close": float(c),
+        "volume": float(v),
+    } for ts, o, h, l, c, v in zip(hist.index, hist["Open"], hist["High"], hist["Low"], hist["Close"], hist["Volume"])]
+
+
+def _fetch_history_bars(yf_ticker: str, td_ticker: str, period: str, days: Optional[int], since: Optional[str]) -> tuple:
+    """
+    Download daily OHLCV bars, either the full period or only those on/after
+    `since`. Returns (bars oldest first, source, error).
+    """
+    error = None
+    
     # 1. Try Twelve Data
     twelve_data_key = os.getenv("TWELVE_DATA_API_KEY")
-    if twelve_data_key:
+    if twelve_data_key and not circuit_open("twelvedata") and acquire("twelvedata"):
         try:
-            import requests
-            # interval: 1day for 1mo, maybe 1h for shorter periods? logic can be enhanced.
-            # outputsize=30 for roughly 1 month of trading days
-            url = f"https://api.twelvedata.com/time_series?symbol={td_ticker}&interval=1day&outputsize=30&apikey={twelve_data_key}"
-            response = requests.get(url, timeout=5)
-            data = response.json()
+            url = f"https://api.twelvedata.com/time_series?symbol={td_ticker}&interval=1day&apikey={twelve_data_key}"
+            if since:
+                url += f"&start_date={since}"
+            else:
+                url += f"&outputsize={min(days or 30, 5000)}"
+            with guard("twelvedata") as call:
+                data = upstream("twelvedata", f"{td_ticker}|time_series",
+                                lambda: get_session().get(url, timeout=5).json())
+                if "values" not in data and _upstream_error_code(data):
+                    call.fail(f"{data.get('code')}: {data.get('message')}")
             
             if "values" in data:
                 # Twelve Data returns newest first. We usually want oldest first for graphs.
-                values = data["values"][::-1] 
-                points = [{"time": v["datetime"], "value": float(v["close"])} for v in values]
-                return {"points": points, "source": "TwelveData"}
+                values = data["values"][::-1]
+                bars = [{
+                    "time": v["datetime"],
+                    "open": float(v["open"]),
+                    "high": float(v["high"]),
+                    "low": float(v["low"]),
+                    "close": float(v["close"]),
+                    "volume": float(v.get("volume") or 0),
+                } for v in values]
+                return bars, "TwelveData", None
+            if since and data.get("status") == "error":
+                # No bars after `since` is reported as an error, not an empty list.
+                error = data.get("message")
                 
         except Exception as e:
             print(f"[Graph] Twelve Data failed for {td_ticker}: {e}")
+            error = str(e)
 
     # 2. Fallback: yfinance
     try:
+        if circuit_open("yfinance_history"):
+            return [], None, error or "yfinance history temporarily disabled"
+        if not acquire("yfinance"):
+            return [], None, error or "yfinance request budget exhausted"
         import yfinance as yf
         stock = yf.Ticker(yf_ticker)
-        # period="1mo" is standard
-        hist = stock.history(period=period)
+        with guard("yfinance_history"):
+            hist = upstream("yfinance_history", f"{yf_ticker}|{since or period}",
+                            lambda: stock.history(start=since) if since else stock.history(period=period))
         
         if hist.empty:
-            return {"points": [], "error": "No history found"}
-            
-        points = []
-        for date, row in hist.iterrows():
-            points.append({
-                "time": date.strftime("%Y-%m-%d"),
-                "value": round(float(row["Close"]), 2)
-            })
+            return [], None, "No history found"
             
-        return {"points": points, "source": "yfinance"}
+        return _bars_from_frame(hist), "yfinance", None
         
     except Exception as e:
         print(f"[Graph] yfinance failed for {yf_ticker}: {e}")
-        return {"points": [], "error": str(e)}
+        return [], None, str(e) or error
+
+
+# ============================================================================
+# 5b. BULK QUOTES + HISTORY (Watchlists)
+# ============================================================================
+def fetch_bulk_market_data(tickers: List[str], period: str = "1mo") -> Dict:
+    """
+    Fetch quotes and graph history for many tickers with one multi-symbol
+    yfinance download. Bars go into the history store and quotes into the
+    quote cache, so the per-ticker pipeline can reuse them.
+
+    Returns {ticker: {"price_data": ..., "graph_data": ...}} for the tickers
+    the download covered; missing tickers should use the normal scrapers.
+    """
+    yf_tickers = {t.upper().replace("/", "-"): t for t in tickers}
+    if not yf_tickers or circuit_open("yfinance_history") or not acquire("yfinance"):
+        return {}
+
+    try:
+        import yfinance as yf
+        with guard("yfinance_history"):
+            frame = yf.download(
+                list(yf_tickers), period=_storage_period(period), interval="1d",
+                group_by="ticker", progress=False, threads=True, auto_adjust=False
+            )
+    except Exception as e:
+        print(f"[SCRAPER] Bulk yfinance download failed: {e}")
+        return {}
+
+    if frame is None or frame.empty:
+        return {}
+
+    store = get_history_store()
+    window_start = _window_start(period)
+    results = {}
+
+    for yf_ticker, original in yf_tickers.items():
+        try:
+            if getattr(frame.columns, "nlevels", 1) > 1:
+                if yf_ticker not in frame.columns.get_level_values(0):
+                    continue
+                hist = frame[yf_ticker]
+            else:
+                hist = frame
+            hist = hist.dropna(subset=["Close"])
+            if hist.empty:
+                continue
+
+            store.append(yf_ticker, HISTORY_INTERVAL, _bars_from_frame(hist))
+            price_data = _store_quote(yf_ticker, _quote_from_frame(yf_ticker, hist))
+            results[original] = {
+                "price_data": price_data,
+                "graph_data": _graph_from_store(store, yf_ticker, window_start, "yfinance"),
+            }
+        except Exception as e:
+            print(f"[SCRAPER] Bulk data unusable for {yf_ticker}: {e}")
+
+    return results
+
+
+def _quote_from_frame(yf_ticker: str, hist) -> Dict:
+    """Build a quote from the last two daily bars of a history frame."""
+    is_indian = ".NS" in yf_ticker or ".BO" in yf_ticker
+    current = float(hist["Close"].iloc[-1])
+    prev = float(hist["Close"].iloc[-2]) if len(hist) > 1 else float(hist["Open"].iloc[-1])
+    change_pct = ((current - prev) / prev) * 100 if prev else 0.0
+    return {
+        "price": round(current, 2),
+        "change_percent": round(change_pct, 2),
+        "is_up": current >= prev,
+        "currency": "₹" if is_indian else "$",
+        "name": yf_ticker,
+        "market_cap": "N/A",
+        "volume": int(hist["Volume"].iloc[-1]),
+        "day_high": float(hist["High"].iloc[-1]),
+        "day_low": float(hist["Low"].iloc[-1]),
+        "52_week_high": "N/A",
+        "52_week_low": "N/A",
+        "source": "yfinance"
+    }
 
 
 # ============================================================================
 # 6. COMBINED DATA FETCHER
 # ============================================================================
-def fetch_all_data(ticker: str) -> Dict:
+# Per-source deadlines (seconds), measured from the start of the fan-out.
+SOURCE_DEADLINES = {
+    "price_data": float(os.getenv("DEADLINE_PRICE", "8")),
+    "graph_data": float(os.getenv("DEADLINE_GRAPH", "8")),
+    "news": float(os.getenv("DEADLINE_NEWS", "6")),
+    "social": float(os.getenv("DEADLINE_SOCIAL", "6")),
+}
+
+
+def _source_fallback(key: str, ticker: str, reason: str):
+    """Return the same fallback each scraper uses when its upstream fails."""
+    ticker_upper = ticker.upper()
+    if key == "price_data":
+        is_indian = ".NS" in ticker_upper or ".BO" in ticker_upper
+        return _get_realistic_mock(ticker_upper, is_indian)
+    if key == "graph_data":
+        return empty_graph(reason)
+    if key == "indicators":
+        return {"error": reason}
+    if key == "sentiment":
+        return {"overall_score": 0.0, "error": reason}
+    if key == "news":
+        return f"News unavailable for {ticker}. Error: {reason}"
+    return "Social media data unavailable (API limit reached)."
+
+
+def _data_sources() -> Dict:
+    """Map each response key to the scraper that produces it."""
+    return {
+        "price_data": get_stock_price,
+        "graph_data": get_historical_data,
+        "news": get_news,
+        "social": get_reddit_posts,
+    }
+
+
+def _derived_stages() -> Dict:
+    """
+    Keys computed locally (no upstream calls) once the sources they read
+    from have been yielded: indicators from the bars graph_data stored,
+    sentiment from the items news and social fetched.
+    """
+    return {
+        "indicators": (("graph_data",), get_indicators),
+        "sentiment": (("news", "social"), lambda t: get_aggregated_sentiment(t, fetch_missing=False)),
+    }
+
+
+def _ready_derived(ticker: str, seen: set, emitted: set):
+    """Yield each derived key whose inputs are all in `seen`, once."""
+    for key, (needs, compute) in _derived_stages().items():
+        if key in emitted or not all(n in seen for n in needs):
+            continue
+        emitted.add(key)
+        try:
+            yield key, timed_stage(key, compute, ticker)
+        except Exception as e:
+            print(f"[SCRAPER ERROR] {key} for {ticker}: {e}")
+            record_fallback(key, "error")
+            yield key, _source_fallback(key, ticker, str(e))
+
+
+def iter_all_data(ticker: str, deadlines: Optional[Dict] = None, prefetched: Optional[Dict] = None):
+    """
+    Fan the sources out on the scraper pool and yield (key, value) pairs in
+    the order they become available. Each source has its own deadline
+    (measured from the start of the fan-out); a source that misses it, or
+    fails, is yielded with its usual fallback instead. Derived keys
+    (indicators, sentiment) follow as soon as their inputs are in.
+    """
+    prefetched = prefetched or {}
+    for key, value in prefetched.items():
+        yield key, value
+    seen, emitted = set(prefetched), set(prefetched)
+    yield from _ready_derived(ticker, seen, emitted)
+
+    limits = {**SOURCE_DEADLINES, **(deadlines or {})}
+    started = time.monotonic()
+    pending = {
+        submit_with_context(_scraper_pool(), timed_stage, key, fetch, ticker): key
+        for key, fetch in _data_sources().items() if key not in prefetched
+    }
+
+    while pending:
+        next_deadline = min(limits.get(key, 10.0) for key in pending.values())
+        done, _ = wait(pending, timeout=max(0.0, next_deadline - (time.monotonic() - started)),
+                       return_when=FIRST_COMPLETED)
+
+        for future in done:
+            key = pending.pop(future)
+            try:
+                yield key, future.result()
+            except Exception as e:
+                print(f"[SCRAPER ERROR] {key} for {ticker}: {e}")
+                record_fallback(key, "error")
+                yield key, _source_fallback(key, ticker, str(e))
+            seen.add(key)
+            yield from _ready_derived(ticker, seen, emitted)
+
+        elapsed = time.monotonic() - started
+        for future, key in list(pending.items()):
+            if limits.get(key, 10.0) <= elapsed:
+                del pending[future]
+                future.cancel()
+                print(f"[SCRAPER] {key} for {ticker} missed its {limits.get(key)}s deadline, using fallback")
+                record_fallback(key, "timeout")
+                yield key, _source_fallback(key, ticker, "timed out")
+                seen.add(key)
+                yield from _ready_derived(ticker, seen, emitted)
+
+
+def fetch_all_data(ticker: str, concurrent: bool = True, deadlines: Optional[Dict] = None,
+                   prefetched: Optional[Dict] = None) -> Dict:
     """
     Fetch all data for a ticker in one call.
     Returns a comprehensive data dictionary.
+
+    With concurrent=True (default) the sources are fetched in parallel (see
+    iter_all_data), so the response takes roughly as long as the slowest
+    source that answers within its deadline.
+
+    Keys already present in `prefetched` (e.g. from fetch_bulk_market_data)
+    are used as-is and not fetched again.
     """
-    return {
+    data = {
         "ticker": ticker.upper(),
         "timestamp": datetime.now().isoformat(),
-        "price_data": get_stock_price(ticker),
-        "graph_data": get_historical_data(ticker),
-        "news": get_news(ticker),
-        "social": get_reddit_posts(ticker)
     }
 
+    if not concurrent:
+        prefetched = prefetched or {}
+        data.update(prefetched)
+        for key, fetch in _data_sources().items():
+            if key not in prefetched:
+                data[key] = timed_stage(key, fetch, ticker)
+        for key, value in _ready_derived(ticker, set(data), set(prefetched)):
+            data[key] = value
+        return data
+
+    for key, value in iter_all_data(ticker, deadlines=deadlines, prefetched=prefetched):
+        data[key] = value
+    return data
+
 
 # ============================================================================
 # 7. MOCK TWITTER SCRAPER (Flashcards)
@@ -501,5 +1224,13 @@ __all__ = [
     'get_news', 
     'get_reddit_posts',
     'get_mock_tweets',
-    'fetch_all_data'
+    'fetch_all_data',
+    'iter_all_data',
+    'fetch_bulk_market_data',
+    'get_indicators',
+    'get_aggregated_sentiment',
+    'fetch_aggregated_sentiment',
+    'refresh_quote',
+    'quote_cache_stats',
+    'hedge_stats'
 ]
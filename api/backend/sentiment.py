@@ -0,0 +1,200 @@
+"""
+TrackBets Backend - Sentiment Module
+=====================================
+Lexicon sentiment scorer for headlines and Reddit posts. A whole batch is
+lowercased and split into words in one pass, and each text's words are
+matched against the lexicon with a single set intersection, so "long" never
+matches inside "belonging" and the cost no longer grows with the number of
+lexicon terms.
+
+Scored items are aggregated into one overall score weighted by recency,
+source and upvotes; per-item scores are cached by content hash.
+"""
+
+import os
+import math
+import time
+import string
+import hashlib
+from typing import Dict, List, Optional
+
+from .cache import TTLCache
+
+
+# Word -> weight.
+BULLISH_TERMS = {
+    "buy": 1.0, "buying": 1.0, "bullish": 1.5, "moon": 1.0, "mooning": 1.0, "rocket": 1.0,
+    "undervalued": 1.0, "long": 0.5, "calls": 0.5, "breakout": 1.0, "strong": 0.5,
+    "growth": 0.5, "beat": 1.0, "beats": 1.0, "surge": 1.0, "surges": 1.0, "rally": 1.0,
+    "upgrade": 1.0, "upgraded": 1.0, "outperform": 1.0,
+}
+BEARISH_TERMS = {
+    "sell": 1.0, "selling": 1.0, "bearish": 1.5, "crash": 1.5, "crashes": 1.5, "puts": 0.5,
+    "overvalued": 1.0, "short": 0.5, "dump": 1.0, "dumping": 1.0, "avoid": 1.0, "weak": 0.5,
+    "decline": 1.0, "declines": 1.0, "miss": 1.0, "misses": 1.0, "plunge": 1.5, "plunges": 1.5,
+    "downgrade": 1.0, "downgraded": 1.0, "underperform": 1.0, "fraud": 1.5, "lawsuit": 1.0,
+}
+
+# Added to the denominator so a single hit scores +/-0.5 rather than +/-1.
+SENTIMENT_SMOOTHING = 1.0
+
+LABEL_BULLISH = "🟢 Bullish"
+LABEL_BEARISH = "🔴 Bearish"
+LABEL_NEUTRAL = "🟡 Neutral"
+
+_WEIGHTS = {**{t: w for t, w in BULLISH_TERMS.items()}, **{t: -w for t, w in BEARISH_TERMS.items()}}
+_TERMS = frozenset(_WEIGHTS)
+# Separates texts in the joined batch; every other punctuation, digit or
+# whitespace character becomes a word break.
+_SEPARATOR = "\x1f"
+_WORD_BREAKS = str.maketrans({c: " " for c in string.punctuation + string.digits + string.whitespace})
+
+
+def sentiment_label(score: float) -> str:
+    """Map a score in [-1, 1] to the labels shown next to posts."""
+    if score > 0:
+        return LABEL_BULLISH
+    if score < 0:
+        return LABEL_BEARISH
+    return LABEL_NEUTRAL
+
+
+def _normalize_batch(texts: List[str]) -> List[str]:
+    """Lowercase every text and turn non-letters into spaces, in one pass."""
+    texts = [t or "" for t in texts]
+    lines = _SEPARATOR.join(texts).lower().translate(_WORD_BREAKS).split(_SEPARATOR)
+    if len(lines) != len(texts):
+        # A text contained the separator itself; normalize one by one.
+        lines = [t.lower().translate(_WORD_BREAKS).replace(_SEPARATOR, " ") for t in texts]
+    return lines
+
+
+def score_texts(texts: List[str]) -> List[Dict]:
+    """
+    Score a batch of texts. Returns one {"score", "label", "bullish",
+    "bearish"} dict per text, where score is in [-1, 1] and bullish/bearish
+    are the weighted lexicon hits.
+    """
+    results = []
+    for line in _normalize_batch(texts):
+        words = line.split()
+        bull = bear = 0.0
+        for term in _TERMS.intersection(words):
+            weight = _WEIGHTS[term] * words.count(term)
+            if weight > 0:
+                bull += weight
+            else:
+                bear -= weight
+        score = round((bull - bear) / (bull + bear + SENTIMENT_SMOOTHING), 4)
+        results.append({"score": score, "label": sentiment_label(score), "bullish": bull, "bearish": bear})
+    return results
+
+
+def score_text(text: str) -> Dict:
+    """Score a single text (see score_texts)."""
+    return score_texts([text])[0]
+
+
+# ============================================================================
+# CACHED ITEM SCORES
+# ============================================================================
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "4096"))
+SENTIMENT_CACHE_TTL = float(os.getenv("SENTIMENT_CACHE_TTL", "86400"))
+
+_score_cache = TTLCache(maxsize=SENTIMENT_CACHE_SIZE, ttl=SENTIMENT_CACHE_TTL, name="sentiment")
+
+
+def content_hash(text: str) -> str:
+    """Hash of a text, ignoring case and whitespace differences."""
+    normalized = " ".join((text or "").lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def score_items(texts: List[str]) -> List[Dict]:
+    """score_texts with a content-hash cache; only unseen texts are scored."""
+    keys = [content_hash(t) for t in texts]
+    results = [_score_cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        for i, scored in zip(missing, score_texts([texts[i] for i in missing])):
+            _score_cache.set(keys[i], scored)
+            results[i] = scored
+    return results
+
+
+def sentiment_cache_stats() -> Dict:
+    return _score_cache.stats()
+
+
+# ============================================================================
+# WEIGHTED AGGREGATE
+# ============================================================================
+# Relative trust per source; items from unknown sources get DEFAULT_SOURCE_WEIGHT.
+SOURCE_WEIGHTS = {"news": 1.0, "reddit": 0.8, "ddgs": 0.5}
+DEFAULT_SOURCE_WEIGHT = 0.5
+# An item's weight halves every SENTIMENT_HALF_LIFE_HOURS; undated items
+# count as SENTIMENT_UNDATED_AGE_HOURS old.
+SENTIMENT_HALF_LIFE_HOURS = float(os.getenv("SENTIMENT_HALF_LIFE_HOURS", "24"))
+SENTIMENT_UNDATED_AGE_HOURS = float(os.getenv("SENTIMENT_UNDATED_AGE_HOURS", "24"))
+
+
+def item_weight(item: Dict, now: Optional[float] = None) -> float:
+    """Recency x source x upvote weight of one news/social item."""
+    now = time.time() if now is None else now
+    published = item.get("published")
+    age_hours = max(0.0, (now - published) / 3600) if published else SENTIMENT_UNDATED_AGE_HOURS
+    recency = 0.5 ** (age_hours / SENTIMENT_HALF_LIFE_HOURS)
+    source = SOURCE_WEIGHTS.get(item.get("source"), DEFAULT_SOURCE_WEIGHT)
+    upvotes = 1.0 + math.log1p(max(0, item.get("upvotes") or 0))
+    return recency * source * upvotes
+
+
+def _weighted(scored: List[Dict]) -> Optional[float]:
+    total = sum(i["weight"] for i in scored)
+    if not total:
+        return None
+    return round(sum(i["score"] * i["weight"] for i in scored) / total, 4)
+
+
+def aggregate_sentiment(news: List[Dict], social: List[Dict], now: Optional[float] = None) -> Dict:
+    """
+    Combine news and social items into one weighted sentiment.
+
+    Items are dicts with "title" (and optionally "text", "source",
+    "published" epoch seconds, "upvotes", "new"). Returns overall_score in
+    [-1, 1] plus per-group scores, new-item counts and the scored items.
+    """
+    now = time.time() if now is None else now
+    groups = {"news": news or [], "social": social or []}
+    flat = [item for items in groups.values() for item in items]
+    scores = score_items([item.get("text") or item.get("title", "") for item in flat])
+
+    result, scored_all, position = {}, [], 0
+    for name, items in groups.items():
+        scored = []
+        for item in items:
+            s = scores[position]
+            position += 1
+            scored.append({**item, "score": s["score"], "label": s["label"],
+                           "weight": item_weight(item, now)})
+        result[name] = {
+            "score": _weighted(scored),
+            "count": len(scored),
+            "new": sum(1 for i in scored if i.get("new")),
+            "items": scored,
+        }
+        scored_all.extend(scored)
+
+    overall = _weighted(scored_all)
+    result["overall_score"] = overall if overall is not None else 0.0
+    result["label"] = sentiment_label(result["overall_score"])
+    return result
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = [
+    'score_texts', 'score_text', 'score_items', 'sentiment_label', 'content_hash',
+    'aggregate_sentiment', 'item_weight', 'sentiment_cache_stats', 'BULLISH_TERMS', 'BEARISH_TERMS'
+]
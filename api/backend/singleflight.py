@@ -0,0 +1,140 @@
+"""
+TrackBets Backend - Single-Flight Module
+=========================================
+Coalesces concurrent requests for the same key into one execution whose
+result every caller shares. SharedStream does the same for event streams.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+# ============================================================================
+# ASYNC SINGLE-FLIGHT GROUP
+# ============================================================================
+class SingleFlight:
+    """
+    While a call for `key` is running, later calls for the same key wait for
+    it instead of starting their own. The shared work is shielded, so a
+    caller that disconnects does not cancel it for the others.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+            try:
+                return await asyncio.shield(future)
+            finally:
+                self._waiters[key] -= 1
+                if not self._waiters[key]:
+                    del self._waiters[key]
+
+        future = asyncio.ensure_future(fn())
+        self._inflight[key] = future
+        self.executions += 1
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict:
+        """Counters for inspection: executions run, callers coalesced, current waiters."""
+        return {
+            "name": self.name,
+            "executions": self.executions,
+            "coalesced_waiters": self.coalesced,
+            "inflight_keys": len(self._inflight),
+            "waiting_now": sum(self._waiters.values()),
+        }
+
+
+# ============================================================================
+# SHARED EVENT STREAMS
+# ============================================================================
+class _StreamRun:
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Event()
+
+    def publish(self) -> None:
+        # Wake everyone waiting on the current event; later waiters get a fresh one.
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class SharedStream:
+    """
+    While a stream for `key` is running, later subscribers attach to it
+    instead of starting their own: they are first sent the events already
+    produced, then every new one. The producer runs as its own task, so a
+    subscriber that disconnects does not stop it for the others.
+    """
+
+    def __init__(self, name: str = "shared_stream"):
+        self.name = name
+        self._runs: Dict[str, _StreamRun] = {}
+        self._subscribers: Dict[str, int] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def _produce(self, key: str, run: _StreamRun, producer: Callable[[], AsyncIterator[Any]]) -> None:
+        try:
+            async for event in producer():
+                run.events.append(event)
+                run.publish()
+        except Exception as e:
+            run.error = e
+        finally:
+            run.done = True
+            self._runs.pop(key, None)
+            run.publish()
+
+    async def subscribe(self, key: str, producer: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        run = self._runs.get(key)
+        if run is None:
+            run = self._runs[key] = _StreamRun()
+            self.executions += 1
+            asyncio.ensure_future(self._produce(key, run, producer))
+        else:
+            self.coalesced += 1
+        self._subscribers[key] = self._subscribers.get(key, 0) + 1
+        try:
+            sent = 0
+            while True:
+                while sent < len(run.events):
+                    sent += 1
+                    yield run.events[sent - 1]
+                if run.done:
+                    break
+                await run.changed.wait()
+            if run.error is not None:
+                raise run.error
+        finally:
+            self._subscribers[key] -= 1
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+
+    def stats(self) -> Dict:
+        """Counters for inspection: streams run, subscribers coalesced, current subscribers."""
+        return {
+            "name": self.name,
+            "executions": self.executions,
+            "coalesced_subscribers": self.coalesced,
+            "inflight_keys": len(self._runs),
+            "subscribed_now": sum(self._subscribers.values()),
+        }
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['SingleFlight', 'SharedStream']
@@ -0,0 +1,207 @@
+"""
+TrackBets Backend - Symbol Index Module
+========================================
+Local ticker resolver behind /api/search. NSE/BSE/US/crypto symbols,
+company names and brand aliases (including rebrands such as Zomato ->
+ETERNAL.NS) are indexed for exact, prefix and typo-tolerant lookup, so the
+LLM resolver is only consulted for queries the index cannot place.
+"""
+
+import os
+import csv
+import re
+import threading
+from bisect import bisect_left, insort
+from itertools import combinations
+from typing import Dict, List, Optional
+
+
+DEFAULT_SYMBOLS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "symbols.csv")
+SYMBOLS_PATH = os.getenv("SYMBOLS_PATH", DEFAULT_SYMBOLS_PATH)
+SEARCH_LIMIT = 5
+# Longest prefix scan per query (keys sharing the prefix), to bound 1-2 char queries.
+_MAX_PREFIX_SCAN = 200
+# Longest normalized query given the fuzzy pass. Delete variants grow with the
+# cube of the length, and no ticker, alias or name key comes close to this.
+_MAX_FUZZY_LENGTH = 32
+
+# Key kinds, best first: ticker symbol, alias/brand, full name, single name word.
+KIND_SYMBOL, KIND_ALIAS, KIND_NAME, KIND_WORD = 0, 1, 2, 3
+
+_NON_KEY = re.compile(r"[^a-z0-9&]+")
+_NAME_SUFFIXES = {"ltd", "limited", "inc", "corp", "corporation", "co", "company", "plc", "the", "of", "and", "adr"}
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase, keep letters/digits/&, collapse everything else to single spaces."""
+    return " ".join(_NON_KEY.sub(" ", (text or "").lower()).split())
+
+
+def _max_distance(length: int) -> int:
+    """Typos tolerated for a query of this length."""
+    if length < 4:
+        return 0
+    return 1 if length < 7 else 2
+
+
+def _deletes(key: str, distance: int) -> set:
+    """All strings reachable from key by removing up to `distance` characters."""
+    out = {key}
+    for d in range(1, min(distance, len(key) - 1) + 1):
+        for drop in combinations(range(len(key)), d):
+            out.add("".join(c for i, c in enumerate(key) if i not in drop))
+    return out
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal-string-alignment distance (adjacent swaps count as one), capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+# ============================================================================
+# SYMBOL INDEX
+# ============================================================================
+class SymbolIndex:
+    """
+    In-memory index of symbol entries. Every entry is reachable by several
+    keys (symbol, aliases, name, name words); keys are kept sorted for
+    prefix scans and expanded into deletion variants for fuzzy lookup
+    (symmetric-delete: a query matches keys sharing a deletion variant).
+    """
+
+    def __init__(self):
+        self.entries: List[Dict] = []
+        self._by_symbol: Dict[str, int] = {}
+        self._keys: Dict[str, List[tuple]] = {}  # key -> [(kind, entry index)]
+        self._sorted: List[str] = []
+        self._variants: Dict[str, set] = {}  # deletion variant -> keys
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def load_csv(self, path: str) -> "SymbolIndex":
+        """Load rows of symbol,name,exchange,currency,aliases (aliases |-separated)."""
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                aliases = [a for a in (row.get("aliases") or "").split("|") if a.strip()]
+                self.add(row["symbol"], row["name"], row.get("exchange", ""), row.get("currency", ""), aliases)
+        return self
+
+    def add(self, symbol: str, name: str, exchange: str = "", currency: str = "",
+            aliases: Optional[List[str]] = None) -> Dict:
+        """Add an entry (or more aliases for an existing symbol)."""
+        symbol = symbol.strip().upper()
+        with self._lock:
+            idx = self._by_symbol.get(symbol)
+            if idx is None:
+                idx = len(self.entries)
+                self.entries.append({"ticker": symbol, "name": name.strip(), "exchange": exchange, "currency": currency})
+                self._by_symbol[symbol] = idx
+                base = symbol.split(".")[0]
+                self._add_key(normalize_query(symbol), KIND_SYMBOL, idx)
+                self._add_key(normalize_query(base), KIND_SYMBOL, idx)
+                name_key = normalize_query(name)
+                self._add_key(name_key, KIND_NAME, idx)
+                words = [w for w in name_key.split() if w not in _NAME_SUFFIXES]
+                self._add_key(" ".join(words), KIND_NAME, idx)
+                for word in words:
+                    if len(word) >= 3:
+                        self._add_key(word, KIND_WORD, idx)
+            for alias in aliases or []:
+                self._add_key(normalize_query(alias), KIND_ALIAS, idx)
+            return self.entries[idx]
+
+    def _add_key(self, key: str, kind: int, idx: int) -> None:
+        if not key:
+            return
+        refs = self._keys.get(key)
+        if refs is None:
+            refs = self._keys[key] = []
+            insort(self._sorted, key)
+            # Keys store single deletions only; the query side deletes up to
+            # two characters, which still finds most two-typo matches and
+            # keeps the variant table small.
+            for variant in _deletes(key, min(1, _max_distance(len(key)))):
+                self._variants.setdefault(variant, set()).add(key)
+        if (kind, idx) not in refs:
+            refs.append((kind, idx))
+            refs.sort()
+
+    # --- lookup ------------------------------------------------------------
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """
+        Best entries for a query: exact key matches, then prefix matches,
+        then (only if neither found anything) fuzzy matches within 1-2 typos.
+        Queries longer than _MAX_FUZZY_LENGTH skip the fuzzy pass.
+        Each result carries "match": "exact", "prefix" or "fuzzy".
+        """
+        q = normalize_query(query)
+        if not q:
+            return []
+        with self._lock:
+            ranked = {}  # entry index -> (rank tuple, match)
+
+            def offer(key, match_rank, match, extra=0):
+                for kind, idx in self._keys[key]:
+                    rank = (match_rank, extra, kind, len(key) - len(q), idx)
+                    if idx not in ranked or rank < ranked[idx][0]:
+                        ranked[idx] = (rank, match)
+
+            if q in self._keys:
+                offer(q, 0, "exact")
+            start = bisect_left(self._sorted, q)
+            for key in self._sorted[start:start + _MAX_PREFIX_SCAN]:
+                if not key.startswith(q):
+                    break
+                if key != q:
+                    offer(key, 1, "prefix")
+
+            if not ranked and len(q) <= _MAX_FUZZY_LENGTH:
+                limit_d = _max_distance(len(q))
+                candidates = set()
+                for variant in _deletes(q, limit_d):
+                    candidates |= self._variants.get(variant, set())
+                for key in candidates:
+                    distance = edit_distance(q, key, limit_d)
+                    if distance <= limit_d:
+                        offer(key, 2, "fuzzy", distance)
+
+            best = sorted(ranked.items(), key=lambda item: item[1][0])[:limit]
+            return [{**self.entries[idx], "match": match} for idx, (_, match) in best]
+
+
+_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """Process-wide index, built from SYMBOLS_PATH on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SymbolIndex().load_csv(SYMBOLS_PATH)
+        return _index
+
+
+def resolve_symbol(query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+    return get_symbol_index().search(query, limit)
+
+
+# ============================================================================
+# EXPORTS
+# ============================================================================
+__all__ = ['SymbolIndex', 'get_symbol_index', 'resolve_symbol', 'normalize_query', 'edit_distance']
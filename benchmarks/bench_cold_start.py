@@ -0,0 +1,159 @@
+"""
+Benchmark: cold start, i.e. server import time and first-request latency.
+
+Every sample runs in a fresh interpreter, so nothing is warm:
+
+    python benchmarks/bench_cold_start.py --runs 7
+    python benchmarks/bench_cold_start.py --baseline benchmarks/cold_start_baseline.json
+    python benchmarks/bench_cold_start.py --import-budget-ms 600 --top 15
+
+"import" is the time taken by `import api.backend.main`. "first health" and
+"first analyze" are the first /api/health and /api/analyze requests after
+that import, served in-process. Upstreams are the zero-latency stand-ins
+from benchmarks/fakes.py, so the analyze number is the backend's own
+first-use cost (lazy imports, pools, stores) and not the network's.
+
+With --baseline, medians are compared against the saved file (written on
+the first run or with --update-baseline) and the run exits non-zero if any
+of them regresses by more than --tolerance. --import-budget-ms and
+--request-budget-ms set absolute limits on top of that.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+CHILD = r"""
+import os, sys, json, time, asyncio, contextlib
+os.environ["PREFETCH_ENABLED"] = "false"
+os.environ.setdefault("HISTORY_DB_PATH", ":memory:")
+with_requests = sys.argv[1] == "1"
+if with_requests:
+    from benchmarks import fakes
+    fakes.install(scale=0)
+
+start = time.perf_counter()
+from api.backend import main
+result = {"import_ms": (time.perf_counter() - start) * 1000}
+
+if with_requests:
+    import httpx
+    fakes.patch_http()
+
+    async def first_requests():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://cold") as client:
+            for name, path, params in (("health_ms", "/api/health", None),
+                                       ("analyze_ms", "/api/analyze", {"ticker": "TSLA"})):
+                start = time.perf_counter()
+                response = await client.get(path, params=params)
+                response.raise_for_status()
+                result[name] = (time.perf_counter() - start) * 1000
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        asyncio.run(first_requests())
+print(json.dumps(result))
+"""
+
+METRICS = [("import_ms", "import"), ("health_ms", "first health"), ("analyze_ms", "first analyze")]
+
+
+def sample(with_requests=True):
+    out = subprocess.run([sys.executable, "-c", CHILD, "1" if with_requests else "0"], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top):
+    """Cumulative import time of the modules api.backend.main imports directly."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import api.backend.main"], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nesting is shown by indentation: the root has one space, its direct
+        # imports three.
+        if cumulative.strip().isdigit() and name.startswith("   ") and not name.startswith("     "):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def compare(report, baseline, tolerance):
+    problems = []
+    for key, label in METRICS:
+        old = baseline.get(key)
+        if old and report[key] > old * (1 + tolerance):
+            problems.append(f"{label}: {report[key]:.1f} ms > baseline {old:.1f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest direct imports")
+    parser.add_argument("--import-budget-ms", type=float, help="fail if the median import exceeds this")
+    parser.add_argument("--request-budget-ms", type=float, help="fail if the median first analyze exceeds this")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--baseline", help="compare against (or create) this baseline file")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed regression vs baseline")
+    args = parser.parse_args()
+
+    # Import alone runs without the stand-ins, so it is the real module graph.
+    imports = [sample(with_requests=False)["import_ms"] for _ in range(args.runs)]
+    requests = [sample() for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "import_ms": round(median(imports), 1),
+        "health_ms": round(median(r["health_ms"] for r in requests), 1),
+        "analyze_ms": round(median(r["analyze_ms"] for r in requests), 1),
+    }
+
+    print(f"=== Cold start, median of {args.runs} fresh interpreters ===")
+    for key, label in METRICS:
+        print(f"{label:<14} {report[key]:9.1f} ms")
+    if args.top:
+        print("slowest imports (cumulative):")
+        for ms, name in slowest_imports(args.top):
+            print(f"  {ms:9.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    problems = []
+    if args.import_budget_ms and report["import_ms"] > args.import_budget_ms:
+        problems.append(f"import: {report['import_ms']:.1f} ms > budget {args.import_budget_ms:.1f} ms")
+    if args.request_budget_ms and report["analyze_ms"] > args.request_budget_ms:
+        problems.append(f"first analyze: {report['analyze_ms']:.1f} ms > budget {args.request_budget_ms:.1f} ms")
+
+    if args.baseline:
+        if args.update_baseline or not os.path.exists(args.baseline):
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"baseline written to {args.baseline}")
+        else:
+            with open(args.baseline) as f:
+                problems += compare(report, json.load(f), args.tolerance)
+            if not problems:
+                print(f"within {args.tolerance:.0%} of baseline")
+
+    if problems:
+        print("REGRESSION:\n  " + "\n  ".join(problems))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: graph_data build time, serialization time and payload size per format.
+
+Fills an in-memory history store with daily bars and times, for each
+graph format, building graph_data from the store, serializing it with the
+stdlib encoder and with the response encoder, and the JSON size before and
+after gzip:
+
+    python benchmarks/bench_graph_payload.py
+    python benchmarks/bench_graph_payload.py --years 1,5,20 --repeat 50
+
+"legacy" is the original path: full bars from store.load(), then one
+{"time", "value"} dict per bar.
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend.graph_format import GRAPH_FORMATS, encode_series
+from api.backend.history_store import HistoryStore
+from api.backend.responses import dumps, orjson
+
+
+def fill_store(store, years):
+    bars, day, price = [], date.today() - timedelta(days=int(365.25 * years)), 100.0
+    while day <= date.today():
+        if day.weekday() < 5:
+            price *= 1 + ((hash(day) % 2001) - 1000) / 50000
+            bars.append({"time": day.isoformat(), "open": price, "high": price, "low": price,
+                         "close": price, "volume": 1e6})
+        day += timedelta(days=1)
+    store.append("BENCH", "1day", bars)
+    return len(bars)
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", default="1,2,5,10", help="comma-separated history lengths")
+    parser.add_argument("--repeat", type=int, default=20, help="timing runs per cell (best is reported)")
+    args = parser.parse_args()
+
+    print(f"=== graph_data per format (best of {args.repeat}; response encoder: "
+          f"{'orjson' if orjson is not None else 'stdlib json'}) ===")
+    print(f"{'years':>5} {'bars':>6} {'format':>8} {'build ms':>9} {'json ms':>8} {'fast ms':>8} "
+          f"{'bytes':>9} {'gzipped':>8}")
+    for years in (float(y) for y in args.years.split(",") if y):
+        store = HistoryStore(":memory:")
+        bars = fill_store(store, years)
+
+        def legacy():
+            stored = store.load("BENCH", "1day")
+            return {"points": [{"time": b["time"], "value": round(float(b["close"]), 2)} for b in stored]}
+
+        builders = {"legacy": legacy}
+        for graph_format in GRAPH_FORMATS:
+            builders[graph_format] = lambda f=graph_format: encode_series(*store.load_closes("BENCH", "1day"), f)
+
+        for name, build in builders.items():
+            build_ms, graph = best_of(build, args.repeat)
+            json_ms, _ = best_of(lambda: json.dumps(graph).encode("utf-8"), args.repeat)
+            fast_ms, body = best_of(lambda: dumps(graph), args.repeat)
+            print(f"{years:>5g} {bars:>6} {name:>8} {build_ms:>9.2f} {json_ms:>8.2f} {fast_ms:>8.2f} "
+                  f"{len(body):>9} {len(gzip.compress(body)):>8}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
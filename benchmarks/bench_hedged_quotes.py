@@ -0,0 +1,89 @@
+"""
+Benchmark: hedged vs sequential quote fetching against local stand-ins.
+
+The two providers are replaced by sleeps drawn from long-tailed latency
+distributions (most calls fast, a few stalled), so the benchmark needs no
+network. Sequential mode waits for the primary and only falls back on
+failure; hedged mode fires the backup after the primary's p95 delay.
+
+    python benchmarks/bench_hedged_quotes.py --requests 400 --concurrency 8
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import scrapers
+
+
+def stand_in(name, median, stall_rate, stall, fail_rate, rng):
+    """Provider that sleeps a lognormal latency, sometimes stalls, sometimes fails."""
+    def fetch():
+        delay = stall if rng.random() < stall_rate else rng.lognormvariate(0, 0.4) * median
+        time.sleep(delay)
+        if rng.random() < fail_rate:
+            return None
+        return {"price": 100.0, "source": name}
+    return fetch
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def run(mode, primary, backup, requests, concurrency):
+    def one(_):
+        start = time.perf_counter()
+        if mode == "hedged":
+            scrapers._hedged_quote(primary, backup)
+        else:
+            scrapers._timed_primary(primary) or backup()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, range(requests)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--primary-ms", type=float, default=40, help="primary median latency")
+    parser.add_argument("--backup-ms", type=float, default=60, help="backup median latency")
+    parser.add_argument("--stall-rate", type=float, default=0.03, help="share of primary calls that stall")
+    parser.add_argument("--stall-ms", type=float, default=1000)
+    parser.add_argument("--fail-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    primary = stand_in("yfinance", args.primary_ms / 1000, args.stall_rate, args.stall_ms / 1000, args.fail_rate, rng)
+    backup = stand_in("TwelveData", args.backup_ms / 1000, 0.005, args.stall_ms / 1000, args.fail_rate, rng)
+
+    print(f"=== Quote hedging benchmark: {args.requests} requests, concurrency {args.concurrency}, "
+          f"{args.stall_rate:.0%} primary stalls of {args.stall_ms:.0f} ms ===")
+    print(f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'backup calls':>13}")
+
+    results = {}
+    for mode in ("sequential", "hedged"):
+        before = scrapers.hedge_stats()
+        latencies = run(mode, primary, backup, args.requests, args.concurrency)
+        hedged = scrapers.hedge_stats()["hedged"] - before["hedged"]
+        results[mode] = latencies
+        backups = f"{hedged / args.requests:.1%}" if mode == "hedged" else "on failure"
+        print(f"{mode:<12} {percentile(latencies, 0.5) * 1000:8.1f} {percentile(latencies, 0.95) * 1000:8.1f} "
+              f"{percentile(latencies, 0.99) * 1000:8.1f} {backups:>13}")
+
+    print(f"hedge delay after run: {scrapers.hedge_stats()['delay_ms']} ms; p99 speedup "
+          f"{percentile(results['sequential'], 0.99) / percentile(results['hedged'], 0.99):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
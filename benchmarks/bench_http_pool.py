@@ -0,0 +1,110 @@
+"""
+Benchmark: pooled keep-alive session vs. a new connection per request.
+
+Runs a local stand-in for the Twelve Data quote endpoint and times N
+requests made the old way (requests.get, new TCP/TLS connection each time)
+and through the shared pooled session used by the scrapers.
+
+    python benchmarks/bench_http_pool.py --requests 200 --connect-ms 20 --tls
+
+--connect-ms adds a per-connection delay on the server to stand in for the
+network round trips of a real TCP + TLS handshake.
+"""
+
+import os
+import sys
+import ssl
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import warnings
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from api.backend.http_client import build_session
+
+QUOTE = json.dumps({"symbol": "TSLA", "price": "250.10", "percent_change": "1.2"}).encode()
+
+
+def make_server(connect_ms: float, tls: bool):
+    class QuoteHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        connections = 0
+
+        def setup(self):
+            type(self).connections += 1
+            time.sleep(connect_ms / 1000)
+            super().setup()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(QUOTE)))
+            self.end_headers()
+            self.wfile.write(QUOTE)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QuoteHandler)
+    scheme = "http"
+    if tls:
+        certdir = tempfile.mkdtemp()
+        cert, key = os.path.join(certdir, "cert.pem"), os.path.join(certdir, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+            check=True, capture_output=True
+        )
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, QuoteHandler, f"{scheme}://127.0.0.1:{server.server_port}/quote?symbol=TSLA"
+
+
+def timed(label, n, get):
+    start = time.perf_counter()
+    for _ in range(n):
+        get().json()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms total  {elapsed / n * 1000:7.2f} ms/request")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--connect-ms", type=float, default=10.0)
+    parser.add_argument("--tls", action="store_true", help="serve HTTPS with a throwaway self-signed cert")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+    server, handler, url = make_server(args.connect_ms, args.tls)
+    print(f"=== HTTP pool benchmark: {args.requests} requests to {url} ===")
+
+    handler.connections = 0
+    fresh = timed("new connection each", args.requests, lambda: requests.get(url, timeout=5, verify=False))
+    fresh_connections = handler.connections
+
+    handler.connections = 0
+    session = build_session()
+    pooled = timed("pooled session", args.requests, lambda: session.get(url, timeout=5, verify=False))
+    pooled_connections = handler.connections
+
+    print(f"connections opened: {fresh_connections} -> {pooled_connections}")
+    print(f"saved: {(fresh - pooled) * 1000:.1f} ms ({(1 - pooled / fresh) * 100:.0f}%)")
+    session.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
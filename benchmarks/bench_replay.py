@@ -0,0 +1,126 @@
+"""
+Benchmark: replay the fetch_all_data -> quick_analyze pipeline from a cassette.
+
+Record once (live upstreams, or the local stand-ins with --fake), then
+replay as often as needed with the recorded timings or with no delay:
+
+    python benchmarks/bench_replay.py record cassettes/sample.jsonl.gz --tickers TSLA,RELIANCE.NS
+    python benchmarks/bench_replay.py record cassettes/fake.jsonl.gz --fake
+    python benchmarks/bench_replay.py replay cassettes/sample.jsonl.gz --speed 1 --rounds 3
+    python benchmarks/bench_replay.py replay cassettes/sample.jsonl.gz --speed 0 --rounds 20 --profile
+
+Each replay round starts from empty caches and stores, so every round runs
+the same upstream calls in the same order. Upstream rate limits are lifted,
+since replayed calls never reach the providers.
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_TICKERS = "TSLA,AAPL,RELIANCE.NS,ETERNAL.NS,BTC-USD"
+
+
+def reset_state():
+    """Empty every cache and store the pipeline reads, so rounds are identical."""
+    from api.backend import scrapers, brain, indicators
+    from api.backend.history_store import HistoryStore
+    from api.backend.news_store import NewsStore
+
+    history, news = HistoryStore(":memory:"), NewsStore()
+    scrapers.get_history_store = lambda: history
+    scrapers.get_news_store = lambda: news
+    scrapers._quote_cache.clear()
+    scrapers._recent_items.clear()
+    brain._verdict_cache.clear()
+    indicators._states.clear()
+
+
+def run_pipeline(tickers):
+    from api.backend.scrapers import fetch_all_data
+    from api.backend.brain import quick_analyze
+
+    timings = {}
+    for ticker in tickers:
+        start = time.perf_counter()
+        data = fetch_all_data(ticker)
+        quick_analyze(ticker, data["price_data"], data["news"], data["social"], indicators=data.get("indicators"))
+        timings[ticker] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("cassette")
+    parser.add_argument("--tickers", default=DEFAULT_TICKERS)
+    parser.add_argument("--fake", action="store_true", help="record from the local stand-ins instead of the network")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay delay scale (0 = no delay)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--profile", action="store_true", help="cProfile the replay rounds")
+    parser.add_argument("--verbose", action="store_true", help="show the backend's own log lines")
+    args = parser.parse_args()
+    tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+
+    os.environ["PREFETCH_ENABLED"] = "false"
+    os.environ.setdefault("HISTORY_DB_PATH", ":memory:")
+    for provider in ("yfinance", "twelvedata", "googlenews", "reddit", "ddgs", "gemini"):
+        os.environ.setdefault(f"RATE_LIMIT_{provider.upper()}", "1000000:1000000")
+    if args.fake or args.mode == "replay":
+        # Replay never reaches the clients, but the code paths that use
+        # them only run when their credentials are set.
+        from benchmarks import fakes
+        fakes.install()
+    from api.backend import replay
+    if args.fake:
+        from benchmarks import fakes
+        fakes.patch_http()
+
+    quiet = None if args.verbose else open(os.devnull, "w")
+    if args.mode == "record":
+        replay.start_recording(args.cassette)
+        with contextlib.redirect_stdout(quiet or sys.stdout):
+            timings = run_pipeline(tickers)
+        cassette = replay.stop()
+        size = os.path.getsize(args.cassette)
+        print(f"=== Recorded {len(cassette.calls)} upstream calls for {len(tickers)} tickers "
+              f"to {args.cassette} ({size / 1024:.1f} KiB) ===")
+        for ticker, seconds in timings.items():
+            print(f"{ticker:<14} {seconds * 1000:9.1f} ms")
+        return
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    print(f"=== Replaying {args.cassette} at speed {args.speed:g}, {args.rounds} rounds ===")
+    totals = []
+    for round_no in range(args.rounds):
+        reset_state()
+        cassette = replay.start_replay(args.cassette, args.speed)
+        with contextlib.redirect_stdout(quiet or sys.stdout):
+            if profiler:
+                profiler.enable()
+            start = time.perf_counter()
+            timings = run_pipeline(tickers)
+            totals.append(time.perf_counter() - start)
+            if profiler:
+                profiler.disable()
+        replay.stop()
+        detail = "  ".join(f"{t}={s * 1000:.1f}" for t, s in timings.items())
+        print(f"round {round_no + 1}: {totals[-1] * 1000:9.1f} ms  (misses {cassette.misses})  {detail}")
+
+    totals.sort()
+    print(f"median round: {totals[len(totals) // 2] * 1000:.1f} ms")
+    if profiler:
+        import pstats
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: batch sentiment scorer throughput (texts/second).
+
+Scores a synthetic batch of headlines/posts three ways: the old per-post
+substring checks, VADER's polarity_scores in a loop (if installed) and
+sentiment.score_texts, which normalizes the whole batch at once and matches
+each text's words against the lexicon with one set intersection.
+
+    python benchmarks/bench_sentiment.py --texts 20000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend.sentiment import score_texts, BULLISH_TERMS, BEARISH_TERMS
+
+WORDS = (
+    "the company reported quarterly results shares traded higher after analysts said margins "
+    "improved while guidance stayed cautious investors belonging to retail funds watched volume"
+).split()
+SIGNALS = ["buy", "bullish", "breakout", "strong", "sell", "crash", "puts", "weak", "long", "short"]
+
+OLD_BULLISH = ['buy', 'bullish', 'moon', 'rocket', 'undervalued', 'long', 'calls', 'breakout', 'strong', 'growth']
+OLD_BEARISH = ['sell', 'bearish', 'crash', 'puts', 'overvalued', 'short', 'dump', 'avoid', 'weak', 'decline']
+
+
+def old_quick_sentiment(text, bullish_words=OLD_BULLISH, bearish_words=OLD_BEARISH):
+    """The scorer this module replaced: one substring check per lexicon word."""
+    text = text.lower()
+    bullish_count = sum(1 for word in bullish_words if word in text)
+    bearish_count = sum(1 for word in bearish_words if word in text)
+    if bullish_count > bearish_count:
+        return "🟢 Bullish"
+    elif bearish_count > bullish_count:
+        return "🔴 Bearish"
+    return "🟡 Neutral"
+
+
+def make_texts(n, seed=1):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(8, 40)) + rng.choices(SIGNALS, k=rng.randint(0, 3))
+        rng.shuffle(words)
+        texts.append(" ".join(words).capitalize())
+    return texts
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26} {elapsed * 1000:9.1f} ms  {n / elapsed:12,.0f} texts/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=10000)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    print(f"=== Sentiment benchmark: {args.texts} texts, {sum(map(len, texts)) / len(texts):.0f} chars avg ===")
+
+    old = timed("substring, old lexicon", len(texts), lambda: [old_quick_sentiment(t) for t in texts])
+    old_full = timed("substring, full lexicon", len(texts),
+                     lambda: [old_quick_sentiment(t, list(BULLISH_TERMS), list(BEARISH_TERMS)) for t in texts])
+    try:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        analyzer = SentimentIntensityAnalyzer()
+        timed("VADER per text", len(texts), lambda: [analyzer.polarity_scores(t) for t in texts])
+    except ImportError:
+        print(f"{'VADER per text':<26} (vaderSentiment not installed)")
+    new = timed("score_texts (batch)", len(texts), lambda: score_texts(texts))
+    print(f"vs old lexicon: {old / new:.1f}x  vs same lexicon: {old_full / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: local symbol index lookup latency.
+
+Builds the index from the bundled symbols.csv and times exact, prefix and
+typo queries of the kind AssetForm sends while the user types.
+
+    python benchmarks/bench_symbol_search.py --rounds 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend.symbols import SymbolIndex, SYMBOLS_PATH
+
+QUERIES = {
+    "exact": ["Zomato", "Tata", "Reliance", "HDFC", "Tesla", "bitcoin"],
+    "prefix": ["zom", "relia", "infos", "micro", "nvi", "adani p"],
+    "fuzzy": ["relaince", "teslaa", "nvdia", "micorsoft", "wirpo", "infosis"],
+    "miss": ["qqqzzx", "hyundai motor india", "unknowncorp"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = SymbolIndex().load_csv(SYMBOLS_PATH)
+    print(f"=== Symbol search benchmark: {len(index)} symbols, built in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms ===")
+
+    for label, queries in QUERIES.items():
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for q in queries:
+                index.search(q)
+        per_query = (time.perf_counter() - start) / (args.rounds * len(queries))
+        print(f"{label:<8} {per_query * 1e6:8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
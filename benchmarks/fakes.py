@@ -0,0 +1,356 @@
+"""
+Local stand-ins for every upstream the backend talks to: yfinance, Twelve
+Data, GoogleNews, praw, DuckDuckGo search and Gemini.
+
+install() puts fake modules into sys.modules (and swaps the scrapers' HTTP
+session for Twelve Data), so the real scrapers, breakers, caches and rate
+limiters run unchanged while every upstream call just sleeps a sampled
+latency and returns synthetic data. Call it before importing api.backend.
+
+Each upstream has a latency/error profile:
+
+    median_ms   lognormal median latency
+    sigma       lognormal shape (spread of the tail)
+    error_rate  share of calls that raise
+    stall_rate  share of calls that take stall_ms instead
+
+Profiles can be overridden with "source=median_ms[:error_rate[:stall_rate[:stall_ms]]]"
+specs, e.g. "gemini=900:0.02" or "yfinance_info=80:0:0.05:3000".
+"""
+
+import sys
+import json
+import time
+import random
+import hashlib
+import threading
+from types import ModuleType
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+class FakeUpstreamError(RuntimeError):
+    """Raised by a stand-in to simulate an upstream failure."""
+
+
+class Upstream:
+    """Latency and error model of one upstream source."""
+
+    def __init__(self, name: str, median_ms: float, sigma: float = 0.4, error_rate: float = 0.0,
+                 stall_rate: float = 0.0, stall_ms: float = 0.0):
+        self.name = name
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        self.calls = 0
+        self.errors = 0
+        self._rng = random.Random(hash(name) & 0xFFFF)
+        self._lock = threading.Lock()
+
+    def call(self) -> None:
+        """Sleep one sampled latency; raise FakeUpstreamError on a sampled failure."""
+        with self._lock:
+            self.calls += 1
+            stalled = self._rng.random() < self.stall_rate
+            delay = self.stall_ms if stalled else self.median_ms * self._rng.lognormvariate(0, self.sigma)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        time.sleep(delay / 1000)
+        if failed:
+            raise FakeUpstreamError(f"{self.name}: simulated failure")
+
+    def describe(self) -> str:
+        text = f"{self.name}={self.median_ms:g}ms"
+        if self.error_rate:
+            text += f" err={self.error_rate:.0%}"
+        if self.stall_rate:
+            text += f" stall={self.stall_rate:.0%}x{self.stall_ms:g}ms"
+        return text
+
+
+# Medians roughly as observed from a cloud instance in ap-south-1.
+DEFAULT_PROFILES = {
+    "yfinance_info": (250, 0.5),
+    "yfinance_history": (180, 0.5),
+    "twelvedata": (120, 0.4),
+    "googlenews": (600, 0.5),
+    "reddit": (350, 0.5),
+    "ddgs": (700, 0.6),
+    "gemini": (1800, 0.4),
+}
+
+UPSTREAMS: Dict[str, Upstream] = {}
+
+
+def configure(specs: Optional[List[str]] = None, scale: float = 1.0) -> Dict[str, Upstream]:
+    """(Re)build the upstream profiles, applying "source=ms[:err[:stall[:stall_ms]]]" overrides."""
+    UPSTREAMS.clear()
+    for name, (median, sigma) in DEFAULT_PROFILES.items():
+        UPSTREAMS[name] = Upstream(name, median * scale, sigma)
+    for spec in specs or []:
+        name, _, values = spec.partition("=")
+        if name not in UPSTREAMS:
+            raise ValueError(f"unknown upstream {name!r} (expected one of {', '.join(UPSTREAMS)})")
+        parts = [float(p) for p in values.split(":") if p]
+        up = UPSTREAMS[name]
+        up.median_ms = parts[0] * scale
+        if len(parts) > 1:
+            up.error_rate = parts[1]
+        if len(parts) > 2:
+            up.stall_rate = parts[2]
+        if len(parts) > 3:
+            up.stall_ms = parts[3] * scale
+    return UPSTREAMS
+
+
+def _call(name: str) -> None:
+    UPSTREAMS[name].call()
+
+
+def _seed(*parts) -> random.Random:
+    """Deterministic per-ticker data, so repeated fetches agree."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return random.Random(int(digest[:12], 16))
+
+
+def _base_price(ticker: str) -> float:
+    return round(_seed(ticker).uniform(20, 3000), 2)
+
+
+# ============================================================================
+# yfinance
+# ============================================================================
+def _history_frame(ticker: str, days: int, start: Optional[str] = None):
+    import pandas as pd
+
+    end = datetime.now().date()
+    first = datetime.strptime(start, "%Y-%m-%d").date() if start else end - timedelta(days=days)
+    index = pd.bdate_range(first, end)
+    rng = _seed(ticker, "history")
+    price, rows = _base_price(ticker), []
+    for _ in index:
+        price *= 1 + rng.gauss(0, 0.015)
+        rows.append((price * 0.995, price * 1.01, price * 0.99, price, rng.randint(10_000, 900_000)))
+    return pd.DataFrame(rows, index=index, columns=["Open", "High", "Low", "Close", "Volume"])
+
+
+_PERIOD_DAYS = {"1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827, "max": 3650}
+
+
+class _Ticker:
+    def __init__(self, symbol: str):
+        self.ticker = symbol
+
+    @property
+    def info(self) -> Dict:
+        _call("yfinance_info")
+        price = _base_price(self.ticker)
+        return {
+            "regularMarketPrice": price, "currentPrice": price, "previousClose": round(price * 0.99, 2),
+            "currency": "INR" if self.ticker.endswith((".NS", ".BO")) else "USD",
+            "shortName": self.ticker, "marketCap": int(price * 1e7), "volume": 123456,
+            "dayHigh": round(price * 1.01, 2), "dayLow": round(price * 0.98, 2),
+            "fiftyTwoWeekHigh": round(price * 1.3, 2), "fiftyTwoWeekLow": round(price * 0.7, 2),
+        }
+
+    def history(self, period: str = "1mo", start: Optional[str] = None, **kwargs):
+        _call("yfinance_history")
+        return _history_frame(self.ticker, _PERIOD_DAYS.get(period, 31), start)
+
+
+def _download(tickers, period="1mo", **kwargs):
+    import pandas as pd
+
+    _call("yfinance_history")
+    frames = {t: _history_frame(t, _PERIOD_DAYS.get(period, 31)) for t in tickers}
+    return pd.concat(frames, axis=1)
+
+
+# ============================================================================
+# Twelve Data (HTTP)
+# ============================================================================
+class _Response:
+    def __init__(self, payload: Dict):
+        self._payload = payload
+        self.status_code = 200
+
+    def json(self) -> Dict:
+        return self._payload
+
+
+class TwelveDataSession:
+    """Stand-in for the pooled requests session, answering Twelve Data URLs."""
+
+    def get(self, url: str, timeout=None, **kwargs):
+        from urllib.parse import urlsplit, parse_qs
+
+        _call("twelvedata")
+        parts = urlsplit(url)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        symbol = query.get("symbol", "UNKNOWN")
+        if parts.path.endswith("/quote"):
+            price = _base_price(symbol)
+            return _Response({"symbol": symbol, "name": symbol, "price": str(price), "percent_change": "0.8",
+                              "high": str(price * 1.01), "low": str(price * 0.98), "volume": "100000"})
+        frame = _history_frame(symbol, int(query.get("outputsize", 30)), query.get("start_date"))
+        values = [{"datetime": ts.strftime("%Y-%m-%d"), "open": o, "high": h, "low": l, "close": c, "volume": v}
+                  for ts, (o, h, l, c, v) in zip(frame.index, frame.itertuples(index=False))]
+        return _Response({"values": values[::-1], "status": "ok"})
+
+
+# ============================================================================
+# GoogleNews / praw / DDGS
+# ============================================================================
+_WORDS = ["surges", "beats estimates", "faces lawsuit", "upgraded", "declines", "announces buyback",
+          "misses targets", "rally continues", "downgraded", "steady quarter"]
+
+
+class _GoogleNews:
+    def __init__(self, lang: str = "en", period: str = "7d", **kwargs):
+        self._results: List[Dict] = []
+
+    def clear(self) -> None:
+        self._results = []
+
+    def search(self, query: str) -> None:
+        _call("googlenews")
+        rng = _seed(query, datetime.now().strftime("%Y-%m-%d %H"))
+        now = datetime.now()
+        self._results = [{
+            "title": f"{query.split()[0]} {rng.choice(_WORDS)} ({i})",
+            "desc": "Synthetic article body.",
+            "media": rng.choice(["Reuters", "Mint", "CNBC", "Bloomberg"]),
+            "datetime": now - timedelta(hours=rng.randint(1, 100)),
+            "link": f"https://news.example/{query.split()[0].lower()}/{i}",
+        } for i in range(10)]
+
+    def results(self) -> List[Dict]:
+        return list(self._results)
+
+
+class _Post:
+    def __init__(self, rng: random.Random, term: str, sub: str, i: int):
+        self.title = f"{term} {rng.choice(_WORDS)}? ({sub} #{i})"
+        self.selftext = "Synthetic post body, long calls or puts."
+        self.score = rng.randint(1, 3000)
+        self.created_utc = time.time() - rng.randint(600, 500_000)
+
+
+class _Subreddit:
+    def __init__(self, name: str):
+        self.name = name
+
+    def search(self, term: str, limit: int = 2, time_filter: str = "week"):
+        _call("reddit")
+        rng = _seed(term, self.name)
+        return [_Post(rng, term, self.name, i) for i in range(limit)]
+
+
+class _Reddit:
+    def __init__(self, **kwargs):
+        pass
+
+    def subreddit(self, name: str) -> _Subreddit:
+        return _Subreddit(name)
+
+
+class _DDGS:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def text(self, query: str, max_results: int = 5):
+        _call("ddgs")
+        rng = _seed(query)
+        return [{"title": f"{query.split()[0]} {rng.choice(_WORDS)} - reddit", "body": "Synthetic snippet.",
+                 "href": f"https://reddit.example/{i}"} for i in range(max_results)]
+
+
+# ============================================================================
+# Gemini
+# ============================================================================
+def _verdict_text(prompt: str) -> str:
+    rng = _seed(prompt[-400:])
+    verdict = rng.choice(["BUY", "SELL", "HOLD"])
+    return json.dumps({
+        "verdict": verdict,
+        "confidence": rng.randint(40, 90),
+        "reasons": ["Synthetic reason one", "Synthetic reason two", "Synthetic reason three"],
+        "ai_explanation": f"Stand-in verdict {verdict} generated locally for benchmarking.",
+        "risk_level": rng.choice(["LOW", "MEDIUM", "HIGH"]),
+        "target_price": None,
+        "timeframe": "Short-term",
+    })
+
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _GenerativeModel:
+    def __init__(self, model_name: str = "", **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        _call("gemini")
+        text = _verdict_text(prompt)
+        if stream:
+            return [_Chunk(text[i:i + 40]) for i in range(0, len(text), 40)]
+        return _Chunk(text)
+
+
+# ============================================================================
+# INSTALL
+# ============================================================================
+def _module(name: str, **attrs) -> ModuleType:
+    module = ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def install(specs: Optional[List[str]] = None, scale: float = 1.0) -> Dict[str, Upstream]:
+    """
+    Register the fake upstream modules and credentials. Must run before
+    api.backend is imported; call patch_http() after importing it.
+    """
+    import os
+
+    configure(specs, scale)
+    sys.modules["yfinance"] = _module("yfinance", Ticker=_Ticker, download=_download)
+    sys.modules["GoogleNews"] = _module("GoogleNews", GoogleNews=_GoogleNews)
+    sys.modules["praw"] = _module("praw", Reddit=_Reddit)
+    sys.modules["duckduckgo_search"] = _module("duckduckgo_search", DDGS=_DDGS)
+    genai = _module("google.generativeai", configure=lambda **kwargs: None, GenerativeModel=_GenerativeModel)
+    sys.modules["google.generativeai"] = genai
+    try:
+        import google
+        google.generativeai = genai
+    except ImportError:
+        sys.modules["google"] = _module("google", generativeai=genai, __path__=[])
+
+    for key, value in {
+        "GOOGLE_API_KEY": "fake-key",
+        "TWELVE_DATA_API_KEY": "fake-key",
+        "REDDIT_CLIENT_ID": "fake-id",
+        "REDDIT_CLIENT_SECRET": "fake-secret",
+    }.items():
+        os.environ[key] = value
+    return UPSTREAMS
+
+
+def patch_http() -> None:
+    """Point the scrapers' shared HTTP session at the Twelve Data stand-in."""
+    from api.backend import scrapers
+
+    session = TwelveDataSession()
+    scrapers.get_session = lambda: session
+
+
+def upstream_stats() -> Dict[str, Dict]:
+    return {name: {"calls": up.calls, "errors": up.errors} for name, up in UPSTREAMS.items()}
@@ -0,0 +1,167 @@
+"""
+Load test: /api/analyze throughput and latency, fully offline.
+
+Runs the real FastAPI app in-process (httpx ASGI transport) with every
+upstream replaced by the stand-ins in benchmarks/fakes.py, then drives
+/api/analyze at several concurrency levels and reports throughput and
+p50/p95/p99 latency per level.
+
+    python benchmarks/loadtest.py --concurrency 1,8,32 --requests 200
+    python benchmarks/loadtest.py --upstream gemini=900:0.05 --upstream yfinance_info=250:0:0.05:4000
+    python benchmarks/loadtest.py --scale 0.1 --baseline benchmarks/loadtest_baseline.json
+
+Each level uses its own set of --tickers symbols, requested in random order,
+so a level sees a realistic mix of cold fetches, cache hits and coalesced
+requests. Upstream rate limits are lifted unless --keep-rate-limits is set.
+
+With --baseline, results are compared against the saved file (written on
+the first run or with --update-baseline) and the run exits non-zero if any
+level's p99 or throughput regresses by more than --tolerance.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import contextlib
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+
+def prepare_environment(args):
+    """Settings that must be in place before api.backend is imported."""
+    os.environ.setdefault("HISTORY_DB_PATH", ":memory:")
+    os.environ["PREFETCH_ENABLED"] = "false"
+    os.environ.setdefault("ANALYZE_WORKERS", str(max(8, max(args.levels))))
+    os.environ.setdefault("FETCH_WORKERS", str(max(16, 4 * max(args.levels))))
+    if not args.keep_rate_limits:
+        for provider in ("yfinance", "twelvedata", "googlenews", "reddit", "ddgs", "gemini"):
+            os.environ.setdefault(f"RATE_LIMIT_{provider.upper()}", "1000000:1000000")
+
+
+async def run_level(app, level, requests, tickers, seed):
+    import httpx
+
+    rng = random.Random(seed)
+    symbols = [f"L{level}S{i:03d}.NS" if i % 2 else f"L{level}S{i:03d}" for i in range(tickers)]
+    queue = [rng.choice(symbols) for _ in range(requests)]
+    latencies, failures, degraded = [], 0, 0
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+        async def worker():
+            nonlocal failures, degraded
+            while queue:
+                ticker = queue.pop()
+                start = time.perf_counter()
+                response = await client.get("/api/analyze", params={"ticker": ticker})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    failures += 1
+                    continue
+                body = response.json()
+                if body["price_data"].get("source") == "Emergency Mock" or body["analysis"].get("error"):
+                    degraded += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(level)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": level,
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "failures": failures,
+        "degraded": degraded,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Regression messages for levels worse than the baseline by more than tolerance."""
+    problems = []
+    previous = {str(r["concurrency"]): r for r in baseline.get("levels", [])}
+    for r in results:
+        old = previous.get(str(r["concurrency"]))
+        if not old:
+            continue
+        if r["p99_ms"] > old["p99_ms"] * (1 + tolerance):
+            problems.append(f"c={r['concurrency']}: p99 {r['p99_ms']} ms > baseline {old['p99_ms']} ms")
+        if r["throughput_rps"] < old["throughput_rps"] * (1 - tolerance):
+            problems.append(f"c={r['concurrency']}: {r['throughput_rps']} rps < baseline {old['throughput_rps']} rps")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=120, help="requests per level")
+    parser.add_argument("--tickers", type=int, default=40, help="distinct tickers per level")
+    parser.add_argument("--upstream", action="append", default=[], metavar="SPEC",
+                        help="latency/error override, source=median_ms[:error_rate[:stall_rate[:stall_ms]]]")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every upstream latency")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="keep the default upstream rate limits")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--baseline", help="compare against (or create) this baseline file")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression vs baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the backend's own log lines")
+    args = parser.parse_args()
+    args.levels = [int(c) for c in args.concurrency.split(",") if c]
+
+    upstreams = fakes.install(args.upstream, args.scale)
+    prepare_environment(args)
+    from api.backend import main as app_main
+    fakes.patch_http()
+
+    print(f"=== /api/analyze load test: {args.requests} requests x {len(args.levels)} levels, "
+          f"{args.tickers} tickers per level ===")
+    print("upstreams: " + ", ".join(up.describe() for up in upstreams.values()))
+    print(f"{'conc':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'failed':>7} {'degraded':>9}")
+
+    results = []
+    quiet = open(os.devnull, "w")
+    for i, level in enumerate(args.levels):
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else quiet):
+            r = asyncio.run(run_level(app_main.app, level, args.requests, args.tickers, args.seed + i))
+        results.append(r)
+        print(f"{level:>5} {r['throughput_rps']:>8.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+              f"{r['p99_ms']:>9.1f} {r['failures']:>7} {r['degraded']:>9}")
+
+    calls = fakes.upstream_stats()
+    print("upstream calls: " + ", ".join(f"{k}={v['calls']}" for k, v in calls.items()))
+
+    report = {"scale": args.scale, "upstreams": [up.describe() for up in upstreams.values()], "levels": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        if args.update_baseline or not os.path.exists(args.baseline):
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"baseline written to {args.baseline}")
+            return
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        if problems:
+            print("REGRESSION:\n  " + "\n  ".join(problems))
+            sys.exit(1)
+        print(f"within {args.tolerance:.0%} of baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,7 +47,8 @@ const AssetForm = ({ intent, onComplete, onBack }) => {
       const data = await response.json();
 
       if (data && data.ticker) {
-        setSuggestions([data]); // Valid result
+        // Index lookups return several ranked matches; AI results just one
+        setSuggestions(data.matches && data.matches.length ? data.matches : [data]);
         setSearchError(null);
       } else if (data && data.error) {
         // Gemini couldn't find a valid ticker
@@ -5,10 +5,11 @@
  */
 
 import { useState, useEffect } from 'react';
-import { analyzeStock } from '../services/api';
+import { analyzeStockStream } from '../services/api';
 
 /**
- * Hook to fetch stock analysis from backend API
+ * Hook to fetch stock analysis from backend API.
+ * `data` is filled in progressively as the streamed sections arrive.
  * @param {string} ticker - Stock ticker to analyze
  * @param {boolean} enabled - Whether to fetch (default: true)
  * @returns {Object} { data, loading, error, refetch }
@@ -25,7 +26,7 @@ export function useStockAnalysis(ticker, enabled = true) {
         setError(null);
 
         try {
-            const result = await analyzeStock(ticker);
+            const result = await analyzeStockStream(ticker, setData);
             setData(result);
         } catch (err) {
             setError(err.message);
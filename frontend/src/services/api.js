@@ -56,6 +56,62 @@ export async function analyzeStock(ticker) {
     }
 }
 
+const STREAM_EVENTS = ['price_data', 'graph_data', 'indicators', 'news', 'social', 'sentiment', 'analysis'];
+
+/**
+ * Analyze a stock ticker via the streaming (SSE) endpoint.
+ * Sections arrive as soon as the backend has them instead of all at once.
+ * @param {string} ticker - Stock ticker symbol
+ * @param {function(Object): void} onUpdate - Called with the partial result after each event
+ * @returns {Promise<Object>} Complete analysis result (same shape as analyzeStock)
+ */
+export function analyzeStockStream(ticker, onUpdate = () => {}) {
+    if (typeof EventSource === 'undefined') {
+        return analyzeStock(ticker);
+    }
+
+    return new Promise((resolve) => {
+        const result = { ticker, success: false };
+        const source = new EventSource(`${API_BASE_URL}/api/analyze/stream?ticker=${encodeURIComponent(ticker)}`);
+
+        STREAM_EVENTS.forEach((name) => {
+            source.addEventListener(name, (event) => {
+                result[name] = JSON.parse(event.data);
+                if (name === 'price_data') {
+                    result.currency = result.price_data.currency || '$';
+                }
+                onUpdate({ ...result });
+            });
+        });
+
+        // Verdict fields and explanation text arrive while the model generates
+        source.addEventListener('analysis_field', (event) => {
+            const { field, value } = JSON.parse(event.data);
+            result.analysis = { ...(result.analysis || {}), [field]: value };
+            onUpdate({ ...result });
+        });
+
+        source.addEventListener('explanation', (event) => {
+            const { delta } = JSON.parse(event.data);
+            const analysis = result.analysis || {};
+            result.analysis = { ...analysis, ai_explanation: (analysis.ai_explanation || '') + delta };
+            onUpdate({ ...result });
+        });
+
+        source.addEventListener('done', (event) => {
+            source.close();
+            resolve({ ...result, ...JSON.parse(event.data) });
+        });
+
+        // Server-side 'error' events and dropped connections both land here;
+        // fall back to the one-shot endpoint so the UI still gets a result.
+        source.addEventListener('error', () => {
+            source.close();
+            resolve(analyzeStock(ticker));
+        });
+    });
+}
+
 /**
  * Health check for API
  */
@@ -87,6 +143,7 @@ export async function getMockTickers() {
 
 export default {
     analyzeStock,
+    analyzeStockStream,
     checkApiHealth,
     getMockTickers,
     API_BASE_URL
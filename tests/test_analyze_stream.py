@@ -0,0 +1,109 @@
+import sys
+import os
+import json
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi.testclient import TestClient
+from api.backend import main, scrapers
+from api.backend.singleflight import SharedStream
+
+
+def _slow(value, delay):
+    def fetch(ticker):
+        time.sleep(delay)
+        return value
+    return fetch
+
+
+def _fake_verdict_stream(ticker, price_data, news, social, indicators=None):
+    yield ("field", "verdict", "BUY")
+    yield ("field", "confidence", 80)
+    yield ("explanation", "Strong ")
+    yield ("explanation", "quarter.")
+    yield ("result", {"verdict": "BUY", "confidence": 80, "ai_explanation": "Strong quarter.", "news": news})
+
+
+def _parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_emits_sources_as_they_arrive(monkeypatch):
+    monkeypatch.setattr(scrapers, "get_stock_price", _slow({"price": 1.0, "currency": "$"}, 0.0))
+    monkeypatch.setattr(scrapers, "get_historical_data", _slow({"points": []}, 0.3))
+    monkeypatch.setattr(scrapers, "get_news", _slow("1. headline", 0.1))
+    monkeypatch.setattr(scrapers, "get_reddit_posts", _slow("1. post", 0.2))
+    monkeypatch.setattr(scrapers, "get_indicators", lambda ticker: {"rsi_14": 50.0})
+    monkeypatch.setattr(main, "quick_analyze_stream", _fake_verdict_stream)
+
+    client = TestClient(main.app)
+    with client.stream("GET", "/api/analyze/stream", params={"ticker": "TSLA"}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    events = _parse_events(body)
+    assert [name for name, _ in events] == [
+        "price_data", "news", "social", "sentiment", "graph_data", "indicators",
+        "analysis_field", "analysis_field", "explanation", "explanation", "analysis", "done"
+    ]
+    assert events[5][1] == {"rsi_14": 50.0}
+    assert events[6][1] == {"field": "verdict", "value": "BUY"}
+    assert events[8][1] == {"delta": "Strong "}
+    assert events[10][1] == {"verdict": "BUY", "confidence": 80, "ai_explanation": "Strong quarter.", "news": "1. headline"}
+    assert events[11][1]["ticker"] == "TSLA"
+
+
+def test_stream_reports_errors_as_events(monkeypatch):
+    monkeypatch.setattr(scrapers, "get_stock_price", _slow({"price": 1.0}, 0))
+    monkeypatch.setattr(scrapers, "get_historical_data", _slow({"points": []}, 0))
+    monkeypatch.setattr(scrapers, "get_news", _slow("news", 0))
+    monkeypatch.setattr(scrapers, "get_reddit_posts", _slow("social", 0))
+    monkeypatch.setattr(scrapers, "get_indicators", lambda ticker: {})
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("model down")
+        yield
+
+    monkeypatch.setattr(main, "quick_analyze_stream", boom)
+
+    client = TestClient(main.app)
+    events = _parse_events(client.get("/api/analyze/stream", params={"ticker": "TSLA"}).text)
+    assert events[-1] == ("error", {"detail": "model down"})
+
+
+def test_concurrent_streams_of_a_ticker_share_one_run(monkeypatch):
+    monkeypatch.setattr(scrapers, "get_stock_price", _slow({"price": 1.0, "currency": "$"}, 0.0))
+    monkeypatch.setattr(scrapers, "get_historical_data", _slow({"points": [{"time": "2024-01-02", "value": 1.0}]}, 0.3))
+    monkeypatch.setattr(scrapers, "get_news", _slow("1. headline", 0.1))
+    monkeypatch.setattr(scrapers, "get_reddit_posts", _slow("1. post", 0.1))
+    monkeypatch.setattr(scrapers, "get_indicators", lambda ticker: {"rsi_14": 50.0})
+    monkeypatch.setattr(main, "_stream_flights", SharedStream(name="analyze_stream"))
+    runs, verdicts = [], []
+    real_iter = main.iter_all_data
+    monkeypatch.setattr(main, "iter_all_data", lambda ticker: runs.append(ticker) or real_iter(ticker))
+    monkeypatch.setattr(main, "quick_analyze_stream",
+                        lambda *args, **kwargs: verdicts.append(args[0]) or _fake_verdict_stream(*args, **kwargs))
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.ensure_future(client.get("/api/analyze/stream", params={"ticker": "TSLA"}))
+            # Joins after some sources were sent: those are replayed first.
+            await asyncio.sleep(0.2)
+            late = await client.get("/api/analyze/stream", params={"ticker": "tsla", "graph_format": "columns"})
+            return await first, late
+
+    first, late = asyncio.run(run())
+    assert runs == ["TSLA"] and verdicts == ["TSLA"]
+    first_events, late_events = _parse_events(first.text), _parse_events(late.text)
+    assert [name for name, _ in late_events] == [name for name, _ in first_events]
+    assert first_events[-1][0] == "done"
+    assert "points" in dict(first_events)["graph_data"]
+    assert dict(late_events)["graph_data"]["format"] == "columns"
+    assert main._stream_flights.stats()["coalesced_subscribers"] == 1
@@ -0,0 +1,57 @@
+import sys
+import os
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from api.backend import main
+
+SLOW = 0.4
+
+
+def _slow_fetch(ticker, prefetched=None):
+    time.sleep(SLOW / 2)
+    return {
+        "ticker": ticker,
+        "price_data": {"price": 1.0, "currency": "$"},
+        "graph_data": {"points": []},
+        "news": "news",
+        "social": "social",
+    }
+
+
+def _slow_analyze(ticker, price_data, news, social, indicators=None):
+    time.sleep(SLOW / 2)
+    return {"verdict": "HOLD", "confidence": 50}
+
+
+async def _run_concurrent(n):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.monotonic()
+        analyses = [client.get("/api/analyze", params={"ticker": f"T{i}"}) for i in range(n)]
+        tasks = [asyncio.ensure_future(a) for a in analyses]
+
+        await asyncio.sleep(0.05)
+        health_start = time.monotonic()
+        health = await client.get("/api/health")
+        health_elapsed = time.monotonic() - health_start
+
+        responses = await asyncio.gather(*tasks)
+        return responses, time.monotonic() - start, health, health_elapsed
+
+
+def test_slow_analyses_do_not_serialize(monkeypatch):
+    monkeypatch.setattr(main, "fetch_all_data", _slow_fetch)
+    monkeypatch.setattr(main, "quick_analyze", _slow_analyze)
+
+    n = min(6, main.ANALYZE_WORKERS)
+    responses, elapsed, health, health_elapsed = asyncio.run(_run_concurrent(n))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert [r.json()["ticker"] for r in responses] == [f"T{i}" for i in range(n)]
+    # Serialized, n analyses would take n * SLOW.
+    assert elapsed < SLOW * 2, f"{n} analyses took {elapsed:.2f}s"
+    assert health.status_code == 200
+    assert health_elapsed < SLOW / 2
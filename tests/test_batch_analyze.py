@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+import yfinance
+from fastapi.testclient import TestClient
+from api.backend import main, scrapers
+from api.backend.history_store import HistoryStore
+
+
+def _frame(closes):
+    index = pd.date_range(end=pd.Timestamp.today().normalize(), periods=len(closes), freq="D")
+    return pd.DataFrame({
+        "Open": closes, "High": [c + 1 for c in closes], "Low": [c - 1 for c in closes],
+        "Close": closes, "Volume": [1000] * len(closes),
+    }, index=index)
+
+
+def test_bulk_download_fills_quotes_and_history(monkeypatch):
+    store = HistoryStore(":memory:")
+    monkeypatch.setattr(scrapers, "get_history_store", lambda: store)
+    scrapers._quote_cache.clear()
+    downloads = []
+
+    def fake_download(tickers, **kwargs):
+        downloads.append((tickers, kwargs["period"]))
+        return pd.concat({"TSLA": _frame([100.0, 110.0]), "RELIANCE.NS": _frame([2900.0, 2871.0])}, axis=1)
+
+    monkeypatch.setattr(yfinance, "download", fake_download)
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "6mo")
+    result = scrapers.fetch_bulk_market_data(["TSLA", "RELIANCE.NS", "NOPE"])
+
+    # The download covers the bootstrap period, so indicators get enough bars.
+    assert downloads == [(["TSLA", "RELIANCE.NS", "NOPE"], "6mo")]
+    assert set(result) == {"TSLA", "RELIANCE.NS"}
+    assert result["TSLA"]["price_data"]["change_percent"] == 10.0
+    assert result["RELIANCE.NS"]["price_data"]["currency"] == "₹"
+    assert [p["value"] for p in result["TSLA"]["graph_data"]["points"]] == [100.0, 110.0]
+    # Later single-ticker requests hit the warm quote cache.
+    assert scrapers._quote_cache.get("TSLA")["price"] == 110.0
+    scrapers._quote_cache.clear()
+
+
+def test_batch_endpoint_returns_per_ticker_results(monkeypatch):
+    fetched = []
+
+    def fake_fetch(ticker, prefetched=None):
+        if ticker == "BAD":
+            raise RuntimeError("upstream exploded")
+        fetched.append((ticker, bool(prefetched)))
+        return {
+            "price_data": (prefetched or {}).get("price_data", {"price": 1.0}),
+            "graph_data": {"points": []},
+            "news": "news",
+            "social": "social",
+        }
+
+    monkeypatch.setattr(main, "fetch_bulk_market_data", lambda tickers: {"TSLA": {"price_data": {"price": 250.0}}})
+    monkeypatch.setattr(main, "fetch_all_data", fake_fetch)
+    monkeypatch.setattr(main, "quick_analyze", lambda *a, **k: {"verdict": "HOLD"})
+
+    client = TestClient(main.app)
+    response = client.post("/api/analyze/batch", json={"tickers": ["tsla", "AAPL", "BAD", "TSLA"]})
+    body = response.json()
+
+    assert response.status_code == 200
+    assert [r["ticker"] for r in body["results"]] == ["TSLA", "AAPL", "BAD"]
+    assert body["failed"] == 1
+    assert body["results"][0]["price_data"]["price"] == 250.0
+    assert body["results"][2] == {"success": False, "ticker": "BAD", "error": "upstream exploded"}
+    assert sorted(fetched) == [("AAPL", False), ("TSLA", True)]
+
+
+@pytest.mark.parametrize("tickers", [[], [" "], [f"T{i}" for i in range(main.BATCH_MAX_TICKERS + 1)]])
+def test_batch_endpoint_rejects_bad_sizes(tickers):
+    client = TestClient(main.app)
+    assert client.post("/api/analyze/batch", json={"tickers": tickers}).status_code == 400
@@ -0,0 +1,120 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from api.backend import breaker, scrapers
+from api.backend.breaker import CircuitBreaker, CircuitOpenError, guard, get_breaker
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    breaker.reset_breakers()
+    yield
+    breaker.reset_breakers()
+
+
+def _fail(name, times):
+    for _ in range(times):
+        with pytest.raises(ValueError):
+            with guard(name):
+                raise ValueError("boom")
+
+
+def test_opens_after_failure_rate_and_skips_calls():
+    _fail("twelvedata", breaker.BREAKER_MIN_CALLS)
+    assert get_breaker("twelvedata").state == breaker.STATE_OPEN
+
+    ran = []
+    with pytest.raises(CircuitOpenError):
+        with guard("twelvedata"):
+            ran.append(1)
+    assert ran == []
+    assert get_breaker("twelvedata").stats()["rejected"] == 1
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    b = CircuitBreaker("test", min_calls=2, open_seconds=0.05)
+    b.record(False, 0.01, "boom")
+    b.record(False, 0.01, "boom")
+    assert b.is_open()
+
+    time.sleep(0.06)
+    assert b.state == breaker.STATE_HALF_OPEN
+    assert b.allow()
+    assert not b.allow()  # only one probe at a time
+    b.record(True, 0.01)
+    assert b.state == breaker.STATE_CLOSED
+
+
+def test_failed_probe_reopens():
+    b = CircuitBreaker("test", min_calls=1, open_seconds=0.05)
+    b.record(False, 0.01, "boom")
+    time.sleep(0.06)
+    assert b.allow()
+    b.record(False, 0.01, "still down")
+    assert b.state == breaker.STATE_OPEN and b.stats()["last_error"] == "still down"
+
+
+def test_slow_successes_count_as_failures():
+    b = CircuitBreaker("test", min_calls=2, slow_call_seconds=0.5)
+    b.record(True, 1.0)
+    b.record(True, 2.0)
+    assert b.state == breaker.STATE_OPEN
+    assert "slow call" in b.last_error
+
+
+def test_open_twelve_data_circuit_skips_the_request(monkeypatch):
+    class Session:
+        calls = 0
+
+        def get(self, url, timeout=None):
+            Session.calls += 1
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(scrapers, "get_session", lambda: Session())
+    for _ in range(breaker.BREAKER_MIN_CALLS + 3):
+        assert scrapers.get_price_twelve_data("TSLA", "key") is None
+
+    assert Session.calls == breaker.BREAKER_MIN_CALLS
+    assert breaker.breaker_stats()["twelvedata"]["state"] == breaker.STATE_OPEN
+
+
+def test_breaker_stats_endpoint():
+    from api.backend import main
+    _fail("ddgs", breaker.BREAKER_MIN_CALLS)
+
+    stats = TestClient(main.app).get("/api/breaker-stats").json()
+    assert set(breaker.SOURCES) <= set(stats)
+    assert stats["ddgs"]["state"] == "open" and stats["ddgs"]["failures"] == breaker.BREAKER_MIN_CALLS
+    assert stats["gemini"]["state"] == "closed"
+
+
+def test_unknown_yfinance_symbols_do_not_count_as_failures(monkeypatch):
+    import yfinance
+
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        @property
+        def info(self):
+            if self.symbol == "DOWN":
+                raise ConnectionError("reset by peer")
+            raise KeyError("regularMarketPrice")
+
+        def history(self, period):
+            import pandas as pd
+            return pd.DataFrame()
+
+    monkeypatch.setattr(yfinance, "Ticker", Ticker)
+    for _ in range(breaker.BREAKER_MIN_CALLS):
+        assert scrapers._price_from_yfinance("NOSUCH", False) is None
+    stats = breaker.breaker_stats()["yfinance_info"]
+    assert stats["failures"] == 0 and stats["state"] == breaker.STATE_CLOSED
+
+    for _ in range(breaker.BREAKER_MIN_CALLS):
+        scrapers._price_from_yfinance("DOWN", False)
+    assert breaker.breaker_stats()["yfinance_info"]["state"] == breaker.STATE_OPEN
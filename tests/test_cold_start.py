@@ -0,0 +1,26 @@
+import sys
+import os
+import json
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use by the request paths that need them, never at import.
+HEAVY_MODULES = ["google.generativeai", "yfinance", "pandas", "requests", "praw", "GoogleNews",
+                 "duckduckgo_search", "uvicorn"]
+
+
+def _loaded_after(statement):
+    code = f"import sys, json; {statement}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_server_import_skips_heavy_sdks():
+    assert _loaded_after("import api.backend.main") == []
+
+
+def test_package_exports_load_lazily():
+    assert _loaded_after("import api.backend") == []
+    assert _loaded_after("from api.backend import quick_analyze") == []
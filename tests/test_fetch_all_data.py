@@ -0,0 +1,54 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import scrapers
+
+
+def _slow(value, delay):
+    def fetch(ticker):
+        time.sleep(delay)
+        return value
+    return fetch
+
+
+def _patch_sources(monkeypatch, delays):
+    monkeypatch.setattr(scrapers, "get_stock_price", _slow({"price": 1.0, "source": "test"}, delays[0]))
+    monkeypatch.setattr(scrapers, "get_historical_data", _slow({"points": [], "source": "test"}, delays[1]))
+    monkeypatch.setattr(scrapers, "get_news", _slow("1. [Test] headline", delays[2]))
+    monkeypatch.setattr(scrapers, "get_reddit_posts", _slow("1. [Reddit] post", delays[3]))
+    monkeypatch.setattr(scrapers, "get_indicators", lambda ticker: {"rsi_14": 50.0})
+
+
+def test_fetch_all_data_runs_sources_concurrently(monkeypatch):
+    _patch_sources(monkeypatch, [0.3, 0.3, 0.3, 0.3])
+
+    start = time.monotonic()
+    data = scrapers.fetch_all_data("TSLA")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.9, f"sources ran sequentially ({elapsed:.2f}s)"
+    assert data["ticker"] == "TSLA"
+    assert data["price_data"]["source"] == "test"
+    assert data["news"] == "1. [Test] headline"
+    assert data["social"] == "1. [Reddit] post"
+
+
+def test_late_source_gets_fallback(monkeypatch):
+    _patch_sources(monkeypatch, [0.05, 0.05, 2.0, 0.05])
+
+    start = time.monotonic()
+    data = scrapers.fetch_all_data("TSLA", deadlines={"news": 0.2})
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0
+    assert data["news"].startswith("News unavailable for TSLA")
+    assert data["price_data"]["source"] == "test"
+
+
+def test_sequential_mode_matches_keys(monkeypatch):
+    _patch_sources(monkeypatch, [0, 0, 0, 0])
+
+    data = scrapers.fetch_all_data("TSLA", concurrent=False)
+    assert set(data) == {"ticker", "timestamp", "price_data", "graph_data", "indicators", "news", "social", "sentiment"}
@@ -0,0 +1,72 @@
+import sys
+import os
+import gzip
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from api.backend import main, scrapers
+from api.backend.graph_format import encode_series, decode_series, format_graph
+from api.backend.history_store import HistoryStore
+
+
+def _bars(count):
+    start = date.today() - timedelta(days=count - 1)
+    return [{"time": (start + timedelta(days=i)).isoformat(), "close": 100.0 + i * 0.37} for i in range(count)]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = HistoryStore(":memory:")
+    monkeypatch.setattr(scrapers, "get_history_store", lambda: store)
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", lambda *a: (_bars(400), "yfinance", None))
+    return store
+
+
+@pytest.mark.parametrize("graph_format", ["columns", "delta"])
+def test_formats_carry_the_same_series(store, graph_format):
+    points = scrapers.get_historical_data("TSLA", period="1y", graph_format="points")
+    encoded = scrapers.get_historical_data("TSLA", period="1y", graph_format=graph_format)
+
+    assert encoded["format"] == graph_format and encoded["source"] == points["source"]
+    times, values = decode_series(encoded)
+    assert times == [p["time"] for p in points["points"]]
+    assert values == [p["value"] for p in points["points"]]
+    assert format_graph(encoded, "points") == points
+
+
+def test_delta_encodes_gaps_and_price_moves():
+    graph = encode_series(["2024-01-05", "2024-01-08", "2024-01-09"], [187.5, 187.62, 187.22], "delta")
+    assert graph["time_deltas"] == [0, 3, 1]
+    assert graph["value_deltas"] == [18750, 12, -40]
+    assert decode_series(graph) == (["2024-01-05", "2024-01-08", "2024-01-09"], [187.5, 187.62, 187.22])
+
+
+def test_empty_history_keeps_the_error():
+    graph = format_graph({"points": [], "error": "No history found"}, "delta")
+    assert graph["error"] == "No history found"
+    assert decode_series(graph) == ([], [])
+
+
+def test_analyze_reencodes_graph_and_compresses(store, monkeypatch):
+    def pipeline(ticker, prefetched=None):
+        return {"price_data": {"price": 1.0}, "graph_data": scrapers.get_historical_data(ticker, period="1y"),
+                "news": "", "social": ""}
+
+    monkeypatch.setattr(main, "fetch_all_data", pipeline)
+    monkeypatch.setattr(main, "quick_analyze", lambda *a, **k: {"verdict": "HOLD"})
+    client = TestClient(main.app)
+
+    plain = client.get("/api/analyze", params={"ticker": "TSLA"}, headers={"Accept-Encoding": "identity"})
+    delta = client.get("/api/analyze", params={"ticker": "TSLA", "graph_format": "delta"},
+                       headers={"Accept-Encoding": "gzip"})
+
+    assert "points" in plain.json()["graph_data"]
+    assert delta.headers["Content-Encoding"] == "gzip"
+    assert delta.json()["graph_data"]["format"] == "delta"
+    assert len(delta.json()["graph_data"]["value_deltas"]) == len(plain.json()["graph_data"]["points"])
+    assert "Server-Timing" in delta.headers
+    assert len(gzip.compress(delta.content)) < len(plain.content) / 4
+
+    assert client.get("/api/analyze", params={"ticker": "TSLA", "graph_format": "xml"}).status_code == 400
@@ -0,0 +1,100 @@
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from api.backend import scrapers
+
+
+@pytest.fixture(autouse=True)
+def fresh_hedge_state(monkeypatch):
+    monkeypatch.setattr(scrapers, "_primary_latencies", scrapers.deque(maxlen=200))
+    monkeypatch.setattr(scrapers, "_hedge_counts", {k: 0 for k in scrapers._hedge_counts})
+
+
+def _provider(name, delay, quote=True, calls=None):
+    def fetch():
+        if calls is not None:
+            calls.append(name)
+        time.sleep(delay)
+        return {"price": 1.0, "source": name} if quote else None
+    return fetch
+
+
+def test_fast_primary_never_fires_the_backup():
+    calls = []
+    quote = scrapers._hedged_quote(_provider("yfinance", 0.01, calls=calls),
+                                   _provider("TwelveData", 0.01, calls=calls), delay=0.2)
+
+    assert quote["source"] == "yfinance"
+    assert calls == ["yfinance"]
+    assert scrapers.hedge_stats()["hedged"] == 0
+
+
+def test_slow_primary_is_hedged_and_backup_wins():
+    start = time.monotonic()
+    quote = scrapers._hedged_quote(_provider("yfinance", 1.0), _provider("TwelveData", 0.02), delay=0.05)
+
+    assert quote["source"] == "TwelveData"
+    assert time.monotonic() - start < 0.5
+    stats = scrapers.hedge_stats()
+    assert stats["hedged"] == 1 and stats["backup_wins"] == 1
+
+
+def test_failed_primary_fires_backup_without_waiting():
+    start = time.monotonic()
+    quote = scrapers._hedged_quote(_provider("yfinance", 0.0, quote=False), _provider("TwelveData", 0.02), delay=1.0)
+
+    assert quote["source"] == "TwelveData"
+    assert time.monotonic() - start < 0.5
+
+
+def test_invalid_backup_waits_for_primary():
+    quote = scrapers._hedged_quote(_provider("yfinance", 0.2), _provider("TwelveData", 0.0, quote=False), delay=0.05)
+    assert quote["source"] == "yfinance"
+    assert scrapers.hedge_stats()["primary_wins"] == 1
+
+
+def test_primary_exception_within_the_delay_fires_backup():
+    def boom():
+        raise ConnectionError("reset")
+
+    quote = scrapers._hedged_quote(boom, _provider("TwelveData", 0.0), delay=0.2)
+    assert quote["source"] == "TwelveData"
+
+
+def test_failed_primaries_do_not_shrink_the_delay():
+    for _ in range(scrapers.HEDGE_MIN_SAMPLES * 2):
+        scrapers._timed_primary(lambda: None)
+        scrapers._hedged_quote(_provider("yfinance", 0.0, quote=False), _provider("TwelveData", 0.0), delay=1.0)
+    time.sleep(0.05)  # done callbacks
+
+    assert len(scrapers._primary_latencies) == 0
+    assert scrapers.hedge_delay() == scrapers.HEDGE_DEFAULT_DELAY
+
+
+def test_hedge_delay_tracks_primary_p95(monkeypatch):
+    assert scrapers.hedge_delay() == scrapers.HEDGE_DEFAULT_DELAY
+    for i in range(100):
+        scrapers._record_primary_latency(0.1 if i < 95 else 2.0)
+    assert scrapers.hedge_delay() == pytest.approx(2.0)
+
+    monkeypatch.setattr(scrapers, "HEDGE_PERCENTILE", 0.5)
+    assert scrapers.hedge_delay() == pytest.approx(0.1)
+
+
+def test_fetch_stock_price_hedges_when_enabled(monkeypatch):
+    released = threading.Event()
+    monkeypatch.setattr(scrapers, "HEDGE_QUOTES", True)
+    monkeypatch.setenv("TWELVE_DATA_API_KEY", "key")
+    monkeypatch.setattr(scrapers, "HEDGE_DEFAULT_DELAY", 0.05)
+    monkeypatch.setattr(scrapers, "_price_from_yfinance",
+                        lambda *a: released.wait(2) and {"price": 1.0, "source": "yfinance"})
+    monkeypatch.setattr(scrapers, "get_price_twelve_data", lambda *a: {"price": 2.0, "source": "TwelveData"})
+
+    try:
+        assert scrapers._fetch_stock_price("TSLA")["source"] == "TwelveData"
+    finally:
+        released.set()
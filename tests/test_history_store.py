@@ -0,0 +1,131 @@
+import sys
+import os
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from api.backend import scrapers
+from api.backend.history_store import HistoryStore
+
+
+def _bars(start_offset, count):
+    today = date.today()
+    return [{
+        "time": (today - timedelta(days=start_offset - i)).isoformat(),
+        "open": 10.0 + i, "high": 11.0 + i, "low": 9.0 + i,
+        "close": 10.5 + i, "volume": 1000.0,
+    } for i in range(count)]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = HistoryStore(":memory:")
+    monkeypatch.setattr(scrapers, "get_history_store", lambda: store)
+    return store
+
+
+def test_append_replaces_existing_bar():
+    store = HistoryStore(":memory:")
+    store.append("TSLA", "1day", [{"time": "2024-01-02", "close": 1.0}])
+    store.append("TSLA", "1day", [{"time": "2024-01-02", "close": 2.0}, {"time": "2024-01-03", "close": 3.0}])
+
+    bars = store.load("TSLA", "1day")
+    assert [b["close"] for b in bars] == [2.0, 3.0]
+    assert store.bounds("TSLA", "1day") == ("2024-01-02", "2024-01-03")
+    assert store.last_timestamp("AAPL", "1day") is None
+
+
+def test_second_request_fetches_only_the_delta(store, monkeypatch):
+    calls = []
+
+    def fake_fetch(yf_ticker, td_ticker, period, days, since):
+        calls.append(since)
+        if since is None:
+            return _bars(182, 182), "yfinance", None
+        return _bars(1, 2), "yfinance", None
+
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", fake_fetch)
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "6mo")
+
+    first = scrapers.get_historical_data("TSLA")
+    second = scrapers.get_historical_data("TSLA")
+
+    last_stored = (date.today() - timedelta(days=1)).isoformat()
+    assert calls == [None, last_stored]
+    assert len(first["points"]) == 30
+    assert len(second["points"]) == 31
+    assert second["points"][-1]["time"] == date.today().isoformat()
+
+
+def test_store_serves_history_when_delta_fetch_fails(store, monkeypatch):
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", lambda *a: (_bars(181, 182), "yfinance", None))
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "6mo")
+    scrapers.get_historical_data("TSLA")
+
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", lambda *a: ([], None, "down"))
+    data = scrapers.get_historical_data("TSLA")
+    assert data["source"] == "store"
+    assert len(data["points"]) == 31
+
+
+def test_longer_period_triggers_full_download(store, monkeypatch):
+    calls = []
+
+    def fake_fetch(yf_ticker, td_ticker, period, days, since):
+        calls.append(since)
+        return _bars(days - 1, days), "yfinance", None
+
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", fake_fetch)
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "1mo")
+    scrapers.get_historical_data("TSLA", period="1mo")
+    scrapers.get_historical_data("TSLA", period="1y")
+    assert calls == [None, None]
+
+
+def test_first_download_covers_the_bootstrap_period(store, monkeypatch):
+    periods = []
+
+    def fake_fetch(yf_ticker, td_ticker, period, days, since):
+        periods.append(period)
+        return _bars(29, 30), "yfinance", None
+
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", fake_fetch)
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "6mo")
+    scrapers.get_historical_data("TSLA", period="1mo")
+    scrapers.get_historical_data("AAPL", period="1y")
+    assert periods == ["6mo", "1y"]
+
+
+def test_short_stored_history_is_backfilled_to_the_bootstrap_period(store, monkeypatch):
+    # E.g. a ticker first stored by a 1mo bulk download.
+    store.append("TSLA", scrapers.HISTORY_INTERVAL, _bars(29, 30))
+    calls = []
+
+    def fake_fetch(yf_ticker, td_ticker, period, days, since):
+        calls.append((period, since))
+        return _bars(181, 182), "yfinance", None
+
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", fake_fetch)
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "6mo")
+    scrapers.get_historical_data("TSLA", period="1mo")
+    scrapers.get_historical_data("TSLA", period="1mo")
+
+    assert calls == [("6mo", None), ("6mo", date.today().isoformat())]
+    assert store.bounds("TSLA", scrapers.HISTORY_INTERVAL)[0] == (date.today() - timedelta(days=181)).isoformat()
+
+
+def test_recent_listing_is_covered_once_fully_loaded(store, monkeypatch):
+    calls = []
+
+    def fake_fetch(yf_ticker, td_ticker, period, days, since):
+        calls.append(since)
+        # Listed 40 days ago: a 6mo download returns only 40 bars.
+        return (_bars(40, 40) if since is None else _bars(1, 2)), "yfinance", None
+
+    monkeypatch.setattr(scrapers, "_fetch_history_bars", fake_fetch)
+    monkeypatch.setattr(scrapers, "HISTORY_BOOTSTRAP_PERIOD", "6mo")
+    scrapers.get_historical_data("NEWIPO")
+    scrapers.get_historical_data("NEWIPO")
+
+    assert calls == [None, (date.today() - timedelta(days=1)).isoformat()]
+    assert store.history_start("NEWIPO", scrapers.HISTORY_INTERVAL) == (date.today() - timedelta(days=40)).isoformat()
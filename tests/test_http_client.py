@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import http_client, scrapers
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return FakeResponse({"price": "250.5", "percent_change": "1.5", "name": "Tesla"})
+
+
+def test_session_is_shared_and_pooled():
+    http_client.close_session()
+    session = http_client.get_session()
+
+    assert http_client.get_session() is session
+    adapter = session.get_adapter("https://api.twelvedata.com")
+    assert adapter._pool_maxsize == http_client.HTTP_POOL_MAXSIZE
+    http_client.close_session()
+    assert http_client._session is None
+
+
+def test_twelve_data_uses_the_shared_session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(scrapers, "get_session", lambda: session)
+
+    quote = scrapers.get_price_twelve_data("TSLA", "key")
+
+    assert quote["price"] == 250.5
+    assert session.urls[0].startswith("https://api.twelvedata.com/quote?symbol=TSLA")
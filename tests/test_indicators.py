@@ -0,0 +1,107 @@
+import sys
+import os
+from datetime import date, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from api.backend import indicators, scrapers
+from api.backend.history_store import HistoryStore
+from api.backend.indicators import IncrementalIndicators, compute_indicators, latest_indicators, to_frame, FIELDS
+
+
+def _random_bars(count, seed=7):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, count)))
+    start = date.today() - timedelta(days=count)
+    return [{
+        "time": (start + timedelta(days=i)).isoformat(),
+        "open": float(c * 0.99), "high": float(c * 1.02), "low": float(c * 0.97),
+        "close": float(c), "volume": float(rng.integers(1000, 5000)),
+    } for i, c in enumerate(closes)]
+
+
+def _assert_same(a, b):
+    for field in FIELDS:
+        if a[field] is None or b[field] is None:
+            assert a[field] == b[field], field
+        else:
+            assert a[field] == pytest.approx(b[field], abs=1e-3), field
+
+
+def test_vectorized_values_on_a_simple_series():
+    bars = [{"time": f"2024-01-{i + 1:02d}", "open": c, "high": c + 1, "low": c - 1, "close": c, "volume": 100.0}
+            for i, c in enumerate(float(x) for x in range(1, 31))]
+    result = latest_indicators(to_frame(bars))
+
+    assert result["sma_20"] == pytest.approx(20.5)
+    assert result["sma_50"] is None
+    assert result["rsi_14"] == 100.0
+    assert result["bb_middle"] == pytest.approx(20.5)
+    assert result["atr_14"] == pytest.approx(2.0, abs=0.05)
+    assert result["volume_z_20"] is None
+    assert result["bars"] == 30
+
+
+def test_incremental_updates_match_full_recompute():
+    bars = _random_bars(120)
+    state = IncrementalIndicators(to_frame(bars[:60]))
+    for bar in bars[60:]:
+        result = state.update(bar)
+
+    _assert_same(result, latest_indicators(to_frame(bars)))
+    assert result["bars"] == 120
+
+
+def test_resending_the_last_bar_replaces_it():
+    bars = _random_bars(80)
+    state = IncrementalIndicators(to_frame(bars))
+    revised = dict(bars[-1], close=bars[-1]["close"] * 1.05, high=bars[-1]["close"] * 1.06)
+
+    result = state.update(revised)
+    _assert_same(result, latest_indicators(to_frame(bars[:-1] + [revised])))
+    assert result["bars"] == 80
+
+
+def test_indicators_for_folds_in_new_bars(monkeypatch):
+    monkeypatch.setattr(indicators, "_states", indicators.OrderedDict())
+    bars = _random_bars(100)
+    indicators.indicators_for("TSLA", bars[:98])
+
+    seeds = []
+    monkeypatch.setattr(indicators.IncrementalIndicators, "_seed", lambda self, frame: seeds.append(frame))
+    result = indicators.indicators_for("TSLA", bars)
+
+    assert seeds == []
+    _assert_same(result, latest_indicators(to_frame(bars)))
+
+
+@pytest.mark.parametrize("step", [1.0, 0.0], ids=["rising", "flat"])
+def test_incremental_matches_vectorized_without_losses(monkeypatch, step):
+    monkeypatch.setattr(indicators, "_states", indicators.OrderedDict())
+    bars = [{"time": (date(2024, 1, 1) + timedelta(days=i)).isoformat(), "open": 100 + i * step,
+             "high": 101 + i * step, "low": 99 + i * step, "close": 100 + i * step, "volume": 100.0}
+            for i in range(25)]
+    indicators.indicators_for("X", bars[:20])
+    result = indicators.indicators_for("X", bars)
+
+    expected = latest_indicators(to_frame(bars))
+    _assert_same(result, expected)
+    assert result["rsi_14"] == (100.0 if step else None)
+
+
+def test_compute_indicators_has_every_field():
+    frame = compute_indicators(to_frame(_random_bars(60)))
+    assert set(FIELDS) <= set(frame.columns)
+    assert frame["sma_50"].isna().sum() == 49
+
+
+def test_get_indicators_reads_the_history_store(monkeypatch):
+    store = HistoryStore(":memory:")
+    store.append("TSLA", "1day", _random_bars(60))
+    monkeypatch.setattr(scrapers, "get_history_store", lambda: store)
+    monkeypatch.setattr(indicators, "_states", indicators.OrderedDict())
+
+    result = scrapers.get_indicators("TSLA")
+    assert result["bars"] == 60 and result["sma_50"] is not None
+    assert scrapers.get_indicators("AAPL") == {"error": "No history found"}
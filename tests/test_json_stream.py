@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import brain
+from api.backend.json_stream import IncrementalJSONParser
+
+RESPONSE = json.dumps({
+    "verdict": "buy",
+    "confidence": 82,
+    "reasons": ["Earnings beat", "Margin \"expansion\"", "Strong guidance"],
+    "ai_explanation": "Tesla's deliveries\nbeat estimates — momentum looks strong.",
+    "risk_level": "MEDIUM",
+    "target_price": None,
+}, ensure_ascii=False)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_fields_complete_in_order_from_tiny_chunks():
+    parser = IncrementalJSONParser()
+    completed = []
+    for chunk in _chunks(RESPONSE, 3):
+        completed.extend(parser.feed(chunk))
+
+    assert [k for k, _ in completed] == ["verdict", "confidence", "reasons", "ai_explanation", "risk_level", "target_price"]
+    assert parser.fields == json.loads(RESPONSE)
+    assert parser.done
+
+
+def test_verdict_is_available_before_explanation_finishes():
+    parser = IncrementalJSONParser()
+    cut = RESPONSE.index("momentum")
+    parser.feed("```json\n" + RESPONSE[:cut])
+
+    assert parser.fields["verdict"] == "buy"
+    assert parser.fields["confidence"] == 82
+    assert "ai_explanation" not in parser.fields
+    assert parser.partial("ai_explanation") == "Tesla's deliveries\nbeat estimates — "
+
+
+def test_partial_drops_cut_off_escapes():
+    parser = IncrementalJSONParser()
+    parser.feed('{"ai_explanation": "line one\\')
+    assert parser.partial("ai_explanation") == "line one"
+    parser.feed('nline two \\u00')
+    assert parser.partial("ai_explanation") == "line one\nline two "
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StreamingModel:
+    def generate_content(self, prompt, stream=False):
+        assert stream
+        return [_Chunk(c) for c in _chunks(RESPONSE, 7)]
+
+
+def test_analyze_stream_emits_fields_then_explanation_deltas():
+    analyst = brain.FinancialAnalyst.__new__(brain.FinancialAnalyst)
+    analyst.model = _StreamingModel()
+
+    events = list(analyst.analyze_stream("context"))
+
+    assert events[0] == ("field", "verdict", "BUY")
+    assert events[1] == ("field", "confidence", 82)
+    explanation = "".join(e[1] for e in events if e[0] == "explanation")
+    assert explanation == json.loads(RESPONSE)["ai_explanation"]
+    assert events[-1][0] == "result"
+    assert events[-1][1]["verdict"] == "BUY"
+
+
+def test_analyze_stream_without_model_yields_fallback():
+    analyst = brain.FinancialAnalyst.__new__(brain.FinancialAnalyst)
+    analyst.model = None
+
+    events = list(analyst.analyze_stream("context"))
+    assert len(events) == 1
+    assert events[0][0] == "result" and events[0][1]["verdict"] == "HOLD"
@@ -0,0 +1,102 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from api.backend import main, metrics, scrapers, breaker
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.reset_metrics()
+    breaker.reset_breakers()
+    yield
+    metrics.reset_metrics()
+
+
+def _patch_sources(monkeypatch, news_delay=0.0):
+    def news(ticker):
+        time.sleep(news_delay)
+        return "1. [Test] headline"
+
+    monkeypatch.setattr(scrapers, "get_stock_price", lambda t: {"price": 1.0, "currency": "$", "source": "test"})
+    monkeypatch.setattr(scrapers, "get_historical_data", lambda t: {"points": []})
+    monkeypatch.setattr(scrapers, "get_news", news)
+    monkeypatch.setattr(scrapers, "get_reddit_posts", lambda t: "1. [Reddit] post")
+    monkeypatch.setattr(scrapers, "get_indicators", lambda t: {"rsi_14": 50.0})
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_stages_are_timed_and_timeouts_counted(monkeypatch):
+    _patch_sources(monkeypatch, news_delay=0.3)
+    scrapers.fetch_all_data("TSLA", deadlines={"news": 0.05})
+
+    text = metrics.render_prometheus()
+    for key in ("price_data", "graph_data", "social", "indicators", "sentiment"):
+        assert _sample(text, f'trackbets_stage_duration_seconds_count{{stage="{key}"}}') == 1
+    assert _sample(text, 'trackbets_stage_fallbacks_total{reason="timeout",stage="news"}') == 1
+
+
+def test_upstream_calls_and_rejections_are_exported():
+    for _ in range(breaker.BREAKER_MIN_CALLS):
+        with pytest.raises(ValueError):
+            with breaker.guard("googlenews"):
+                raise ValueError("boom")
+    with pytest.raises(breaker.CircuitOpenError):
+        with breaker.guard("googlenews"):
+            pass
+
+    text = metrics.render_prometheus()
+    assert _sample(text, 'trackbets_upstream_duration_seconds_count{source="googlenews"}') == 5
+    assert _sample(text, 'trackbets_upstream_errors_total{source="googlenews"}') == 5
+    assert _sample(text, 'trackbets_upstream_rejected_total{source="googlenews"}') == 1
+    assert _sample(text, 'trackbets_circuit_state{source="googlenews"}') == 2
+
+
+def test_large_counters_are_exported_exactly():
+    metrics.inc("trackbets_stage_fallbacks_total", 1234567, stage="news", reason="error")
+    metrics.inc("trackbets_stage_fallbacks_total", 0.5, stage="social", reason="error")
+
+    text = metrics.render_prometheus()
+    assert 'trackbets_stage_fallbacks_total{reason="error",stage="news"} 1234567\n' in text
+    assert 'trackbets_stage_fallbacks_total{reason="error",stage="social"} 0.5\n' in text
+
+
+def test_cache_hit_ratio_is_exported():
+    cache = main.TTLCache(maxsize=4, name="test-metrics")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    text = metrics.render_prometheus()
+    assert _sample(text, 'trackbets_cache_hit_ratio{cache="test-metrics"}') == 0.5
+    assert _sample(text, 'trackbets_cache_lookups_total{cache="test-metrics",result="miss"}') == 1
+
+
+def test_server_timing_merges_repeated_stages():
+    header = metrics.server_timing([("twelvedata", 0.1), ("news", 0.2), ("twelvedata", 0.05)], total=0.4)
+    assert header == "twelvedata;dur=150.0, news;dur=200.0, total;dur=400.0"
+
+
+def test_analyze_response_has_server_timing(monkeypatch):
+    _patch_sources(monkeypatch)
+    monkeypatch.setattr(main, "fetch_all_data", scrapers.fetch_all_data)
+    monkeypatch.setattr(main, "quick_analyze", lambda *a, **k: {"verdict": "HOLD", "confidence": 50})
+
+    client = TestClient(main.app)
+    response = client.get("/api/analyze", params={"ticker": "TSLA"})
+    assert response.status_code == 200
+    names = [part.split(";")[0] for part in response.headers["Server-Timing"].split(", ")]
+    assert {"price_data", "news", "social", "graph_data", "verdict", "total"} <= set(names)
+
+    text = client.get("/api/metrics").text
+    assert "# TYPE trackbets_stage_duration_seconds histogram" in text
+    assert _sample(text, 'trackbets_stage_duration_seconds_count{stage="verdict"}') == 1
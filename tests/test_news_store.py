@@ -0,0 +1,76 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import scrapers
+from api.backend.cache import TTLCache
+from api.backend.news_store import NewsStore, normalize_url
+
+
+def _article(title, url=None, hours_ago=1.0, now=None):
+    now = now or time.time()
+    return {"title": title, "url": url, "publisher": "Wire", "published": now - hours_ago * 3600}
+
+
+def test_duplicates_are_dropped_by_title_or_url():
+    store = NewsStore()
+    first = store.ingest("TSLA", [_article("Tesla beats estimates", "https://x.com/a?utm=1"),
+                                  _article("Tesla BEATS estimates!")])
+    again = store.ingest("tsla", [_article("Tesla beats estimates (updated)", "http://www.x.com/a/"),
+                                  _article("Recall announced", "https://y.com/b")])
+
+    assert [a["title"] for a in first] == ["Tesla beats estimates"]
+    assert [a["title"] for a in again] == ["Recall announced"]
+    assert store.stats()["duplicates"] == 2
+    assert normalize_url("https://WWW.X.com/a/?q=1#f") == "x.com/a"
+
+
+def test_window_is_bounded_and_flags_new_items():
+    now = time.time()
+    store = NewsStore(window=3, max_age_days=1)
+    store.ingest("TSLA", [_article(f"Old {i}", hours_ago=10 + i, now=now) for i in range(3)], now=now)
+    store.ingest("TSLA", [_article("Fresh", hours_ago=0.5, now=now), _article("Ancient", hours_ago=48, now=now)],
+                 now=now)
+
+    window = store.window("TSLA")
+    assert [a["title"] for a in window] == ["Fresh", "Old 0", "Old 1"]
+    assert [a["new"] for a in window] == [True, False, False]
+
+    # An evicted article seen again is not re-added as new
+    assert store.ingest("TSLA", [_article("Old 2", hours_ago=12, now=now)], now=now) == []
+
+
+def test_get_news_refreshes_only_the_last_day(monkeypatch):
+    store = NewsStore()
+    monkeypatch.setattr(scrapers, "get_news_store", lambda: store)
+    monkeypatch.setattr(scrapers, "_recent_items", TTLCache(maxsize=16, ttl=60))
+    periods = []
+    pages = [
+        [{"title": "Tesla beats estimates", "media": "Reuters", "link": "https://r.com/1"}],
+        [{"title": "Tesla beats estimates", "media": "Reuters", "link": "https://r.com/1"},
+         {"title": "Tesla recall widens", "media": "AP", "link": "https://ap.com/2"}],
+    ]
+
+    class FakeGoogleNews:
+        def __init__(self, lang, period):
+            periods.append(period)
+        def clear(self):
+            pass
+        def search(self, query):
+            pass
+        def results(self):
+            return pages[len(periods) - 1]
+
+    import GoogleNews
+    monkeypatch.setattr(GoogleNews, "GoogleNews", FakeGoogleNews)
+
+    assert scrapers.get_news("TSLA") == "1. [NEW] [Reuters] Tesla beats estimates"
+    second = scrapers.get_news("TSLA")
+
+    assert periods == ["7d", "1d"]
+    assert "[NEW] [AP] Tesla recall widens" in second
+    assert "[NEW] [Reuters]" not in second
+    items = scrapers._recent_items.get(("news", "TSLA"))
+    assert sorted((a["title"], a["new"]) for a in items) == [("Tesla beats estimates", False),
+                                                               ("Tesla recall widens", True)]
@@ -0,0 +1,101 @@
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import prefetch, ratelimit, scrapers
+from api.backend.prefetch import Prefetcher
+
+
+def test_frequent_tickers_get_promoted(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_PROMOTE_THRESHOLD", 3)
+    prefetcher = Prefetcher(hot_tickers=["TSLA"], warm=lambda t: None)
+
+    for _ in range(4):
+        prefetcher.record_request("AAPL")
+    prefetcher.record_request("NVDA")
+    for _ in range(5):
+        prefetcher.record_request("TSLA")
+
+    assert prefetcher.promoted() == ["AAPL"]
+    assert prefetcher.hot_set() == ["TSLA", "AAPL"]
+
+
+def test_request_counts_decay(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_PROMOTE_THRESHOLD", 3)
+    monkeypatch.setattr(prefetch, "PREFETCH_HALF_LIFE", 0.05)
+    prefetcher = Prefetcher(hot_tickers=[], warm=lambda t: None)
+
+    for _ in range(4):
+        prefetcher.record_request("AAPL")
+    assert prefetcher.promoted() == ["AAPL"]
+    time.sleep(0.15)
+    assert prefetcher.promoted() == []
+
+
+def test_run_once_warms_hot_set_at_background_priority():
+    seen = []
+    prefetcher = Prefetcher(hot_tickers=["TSLA", "BTC-USD"],
+                            warm=lambda t: seen.append((t, ratelimit._priority.get())))
+    prefetcher.run_once()
+
+    assert seen == [("TSLA", ratelimit.PRIORITY_BACKGROUND), ("BTC-USD", ratelimit.PRIORITY_BACKGROUND)]
+    assert prefetcher.status()["warmed"] == 2
+
+
+def test_failures_do_not_stop_the_pass():
+    def warm(ticker):
+        if ticker == "BAD":
+            raise RuntimeError("boom")
+
+    prefetcher = Prefetcher(hot_tickers=["BAD", "TSLA"], warm=warm)
+    prefetcher.run_once()
+    assert prefetcher.warmed == 1 and prefetcher.failures == 1
+
+
+def test_background_loop_starts_and_stops(monkeypatch):
+    monkeypatch.setattr(prefetch, "PREFETCH_INITIAL_DELAY", 0)
+    seen = []
+    prefetcher = Prefetcher(hot_tickers=["TSLA"], interval=0.02, warm=seen.append)
+
+    prefetcher.start()
+    time.sleep(0.15)
+    prefetcher.stop()
+
+    assert len(seen) >= 2
+    assert not prefetcher.status()["running"]
+
+
+def test_warm_ticker_refreshes_every_layer(monkeypatch):
+    calls = []
+    monkeypatch.setattr(prefetch, "refresh_quote", lambda t: calls.append("quote") or {"price": 1.0})
+
+    def fake_fetch(ticker, prefetched=None):
+        calls.append(("fetch", prefetched))
+        return {"price_data": prefetched["price_data"], "news": "n", "social": "s"}
+
+    monkeypatch.setattr(prefetch, "fetch_all_data", fake_fetch)
+    monkeypatch.setattr(prefetch, "quick_analyze", lambda *a, **k: calls.append("verdict"))
+
+    prefetch.warm_ticker("TSLA")
+    assert calls == ["quote", ("fetch", {"price_data": {"price": 1.0}}), "verdict"]
+
+
+def test_background_fan_out_uses_its_own_pool(monkeypatch):
+    threads = {}
+
+    def source(key):
+        def fetch(ticker):
+            threads.setdefault(ratelimit.current_priority(), set()).add(threading.current_thread().name)
+            return {"source": "test"} if key != "news" else "n"
+        return fetch
+
+    monkeypatch.setattr(scrapers, "_data_sources", lambda: {k: source(k) for k in ("price_data", "news")})
+    monkeypatch.setattr(scrapers, "_derived_stages", lambda: {})
+    list(scrapers.iter_all_data("TSLA"))
+    with ratelimit.background_priority():
+        list(scrapers.iter_all_data("TSLA"))
+
+    assert all(name.startswith("scraper") for name in threads[ratelimit.PRIORITY_INTERACTIVE])
+    assert all(name.startswith("background") for name in threads[ratelimit.PRIORITY_BACKGROUND])
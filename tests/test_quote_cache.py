@@ -0,0 +1,75 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from api.backend import scrapers
+from api.backend.cache import TTLCache
+
+
+@pytest.fixture
+def fake_upstream(monkeypatch):
+    calls = []
+
+    def fetch(ticker):
+        calls.append(ticker)
+        return {"price": 100.0 + len(calls), "source": "yfinance"}
+
+    monkeypatch.setattr(scrapers, "_fetch_stock_price", fetch)
+    scrapers._quote_cache.clear()
+    yield calls
+    scrapers._quote_cache.clear()
+
+
+def test_lru_eviction_and_ttl():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.06)
+    assert cache.lookup("a") == (None, "miss")
+
+
+def test_market_classification():
+    assert scrapers._market_of("BTC-USD") == "crypto"
+    assert scrapers._market_of("RELIANCE.NS") == "india"
+    assert scrapers._market_of("TSLA") == "us"
+
+
+def test_repeat_quote_is_served_from_cache(fake_upstream):
+    first = scrapers.get_stock_price("TSLA")
+    second = scrapers.get_stock_price("tsla")
+
+    assert first == second
+    assert len(fake_upstream) == 1
+    stats = scrapers.quote_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+
+def test_stale_quote_is_served_then_refreshed(fake_upstream, monkeypatch):
+    monkeypatch.setitem(scrapers.QUOTE_TTL, "us", 0.01)
+    first = scrapers.get_stock_price("TSLA")
+    time.sleep(0.02)
+
+    stale = scrapers.get_stock_price("TSLA")
+    assert stale == first
+
+    deadline = time.monotonic() + 2
+    while len(fake_upstream) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(fake_upstream) == 2
+    assert scrapers.quote_cache_stats()["stale_hits"] == 1
+
+
+def test_mock_quotes_are_not_cached(monkeypatch):
+    scrapers._quote_cache.clear()
+    monkeypatch.setattr(scrapers, "_fetch_stock_price", lambda t: {"price": 1, "source": "Emergency Mock"})
+    scrapers.get_stock_price("TSLA")
+    assert len(scrapers._quote_cache) == 0
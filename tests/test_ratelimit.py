@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import ratelimit
+from api.backend.ratelimit import TokenBucket, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+
+def test_burst_then_rate_limited():
+    bucket = TokenBucket("test", per_minute=600, burst=3)
+
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert not bucket.acquire(timeout=0)
+
+    start = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert 0.05 < time.monotonic() - start < 0.5
+    assert bucket.stats()["interactive"]["rejected"] == 1
+
+
+def test_interactive_requests_jump_the_background_queue():
+    bucket = TokenBucket("test", per_minute=300, burst=1)
+    bucket.acquire(timeout=0)
+    order = []
+
+    def take(priority, label):
+        bucket.acquire(priority=priority, timeout=5)
+        order.append(label)
+
+    background = [threading.Thread(target=take, args=(PRIORITY_BACKGROUND, f"bg{i}")) for i in range(2)]
+    for t in background:
+        t.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=take, args=(PRIORITY_INTERACTIVE, "user"))
+    interactive.start()
+
+    for t in background + [interactive]:
+        t.join()
+    assert order[0] == "user"
+    assert bucket.stats()["background"]["granted"] == 2
+
+
+def test_priority_follows_context_into_pool_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    seen = []
+    monkeypatch.setattr(ratelimit, "get_bucket", lambda p: type("B", (), {
+        "acquire": lambda self, priority, timeout: seen.append(priority) or True
+    })())
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        ratelimit.submit_with_context(pool, ratelimit.acquire, "twelvedata").result()
+        with ratelimit.background_priority():
+            ratelimit.submit_with_context(pool, ratelimit.acquire, "twelvedata").result()
+
+    assert seen == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
+
+
+def test_limits_come_from_environment(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_GEMINI", "30:2")
+    ratelimit.reset_scheduler()
+    try:
+        stats = ratelimit.scheduler_stats()["gemini"]
+        assert stats["rate_per_minute"] == 30 and stats["burst"] == 2
+    finally:
+        ratelimit.reset_scheduler()
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+from api.backend import replay, scrapers
+
+
+@pytest.fixture(autouse=True)
+def no_cassette():
+    replay.stop()
+    yield
+    replay.stop()
+
+
+def test_frames_and_datetimes_roundtrip():
+    frame = pd.DataFrame({"Close": [1.5, 2.5], "Volume": [10, 20]},
+                         index=pd.to_datetime(["2024-01-02", "2024-01-03"]))
+    back = replay.decode(replay.encode({"hist": frame, "when": pd.Timestamp("2024-01-02").to_pydatetime()}))
+
+    assert back["hist"]["Close"].tolist() == [1.5, 2.5]
+    assert list(back["hist"].index) == list(frame.index)
+    assert back["when"].year == 2024
+
+
+def test_replay_serves_recorded_payloads_without_calling_upstream(tmp_path):
+    path = str(tmp_path / "c.jsonl.gz")
+    replay.start_recording(path)
+    assert replay.upstream("twelvedata", "TSLA|quote", lambda: {"close": "101.5"}) == {"close": "101.5"}
+    with pytest.raises(ValueError):
+        replay.upstream("googlenews", "TSLA|1d", lambda: (_ for _ in ()).throw(ValueError("blocked")))
+    replay.stop()
+
+    def live():
+        raise AssertionError("upstream called during replay")
+
+    cassette = replay.start_replay(path, speed=0)
+    assert replay.upstream("twelvedata", "TSLA|quote", live) == {"close": "101.5"}
+    with pytest.raises(replay.ReplayedUpstreamError, match="blocked"):
+        replay.upstream("googlenews", "TSLA|1d", live)
+    with pytest.raises(replay.ReplayMissError):
+        replay.upstream("twelvedata", "AAPL|quote", live)
+    assert (cassette.hits, cassette.misses) == (2, 1)
+
+
+def test_unknown_key_falls_back_to_same_ticker(tmp_path):
+    path = str(tmp_path / "c.jsonl.gz")
+    replay.start_recording(path)
+    replay.upstream("yfinance_history", "TSLA|2024-01-01", lambda: [1])
+    replay.stop()
+
+    replay.start_replay(path, speed=0)
+    assert replay.upstream("yfinance_history", "TSLA|2024-02-01", lambda: [2]) == [1]
+
+
+def test_stream_chunks_are_replayed(tmp_path):
+    path = str(tmp_path / "c.jsonl.gz")
+    replay.start_recording(path)
+    opened = replay.upstream_stream("gemini", "TSLA|abc", lambda: iter([type("C", (), {"text": t}) for t in ("{\"a\"", ": 1}")]))
+    assert "".join(c.text for c in opened) == "{\"a\": 1}"
+    replay.stop()
+
+    replay.start_replay(path, speed=0)
+    chunks = replay.upstream_stream("gemini", "TSLA|abc", lambda: pytest.fail("stream opened during replay"))
+    assert [c.text for c in chunks] == ["{\"a\"", ": 1}"]
+
+
+def test_twelvedata_quote_replays_offline(tmp_path, monkeypatch):
+    class Session:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def get(self, url, timeout=None):
+            if self.payload is None:
+                raise ConnectionError("offline")
+            return type("R", (), {"json": lambda _self: self.payload})()
+
+    path = str(tmp_path / "c.jsonl.gz")
+
+    monkeypatch.setattr(scrapers, "get_session", lambda: Session({"price": "250.0", "percent_change": "4.1",
+                                                                  "name": "Tesla"}))
+    replay.start_recording(path)
+    recorded = scrapers.get_price_twelve_data("TSLA", "test-key")
+    replay.stop()
+
+    monkeypatch.setattr(scrapers, "get_session", lambda: Session(None))
+    replay.start_replay(path, speed=0)
+    assert scrapers.get_price_twelve_data("TSLA", "test-key") == recorded
+    assert recorded["price"] == 250.0
@@ -0,0 +1,120 @@
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.backend import sentiment, scrapers
+from api.backend.brain import rule_based_verdict
+from api.backend.cache import TTLCache
+from api.backend.sentiment import score_texts, score_text, aggregate_sentiment, item_weight
+
+
+def test_matches_whole_words_only():
+    assert score_text("A sense of belonging at the shortbread factory")["label"] == "🟡 Neutral"
+    assert score_text("Going long, this breakout is strong")["label"] == "🟢 Bullish"
+    assert score_text("Short it before the crash")["label"] == "🔴 Bearish"
+
+
+def test_batch_scores_each_text_separately():
+    results = score_texts(["Buy the dip", "", "Sell everything, avoid", "Quarterly results out", "UPGRADED!"])
+
+    assert [r["label"] for r in results] == ["🟢 Bullish", "🟡 Neutral", "🔴 Bearish", "🟡 Neutral", "🟢 Bullish"]
+    assert results[0]["score"] == 0.5
+    assert results[2]["score"] == -round(2 / 3, 4)
+    assert results[1] == {"score": 0.0, "label": "🟡 Neutral", "bullish": 0.0, "bearish": 0.0}
+
+
+def test_scores_are_bounded_and_ordered():
+    mild = score_text("strong quarter")["score"]
+    loud = score_text("bullish breakout, buy calls, to the moon")["score"]
+    assert 0 < mild < loud < 1
+    assert score_texts([]) == []
+
+
+def test_item_weight_favours_recent_upvoted_news():
+    now = time.time()
+    fresh = item_weight({"source": "news", "published": now}, now)
+    day_old = item_weight({"source": "news", "published": now - 86400}, now)
+    upvoted = item_weight({"source": "reddit", "published": now, "upvotes": 500}, now)
+
+    assert day_old == fresh / 2
+    assert upvoted > fresh > item_weight({"source": "ddgs", "published": now}, now)
+
+
+def test_aggregate_weights_items_into_overall_score():
+    now = time.time()
+    news = [
+        {"title": "Analysts upgrade, shares surge", "source": "news", "published": now},
+        {"title": "Shares plunge on fraud probe", "source": "news", "published": now - 7 * 86400},
+    ]
+    social = [{"title": "Buy calls", "source": "reddit", "published": now, "upvotes": 1200}]
+
+    result = aggregate_sentiment(news, social, now=now)
+    assert 0.4 < result["overall_score"] <= 1
+    assert result["label"] == "🟢 Bullish"
+    assert result["news"]["count"] == 2 and result["social"]["count"] == 1
+    assert result["news"]["items"][1]["score"] < 0
+    assert rule_based_verdict({"price": {"pe": 20}, "sentiment": result})[0] == "BUY"
+    assert aggregate_sentiment([], [])["overall_score"] == 0.0
+
+
+def test_item_scores_are_cached_by_content(monkeypatch):
+    monkeypatch.setattr(sentiment, "_score_cache", TTLCache(maxsize=16, ttl=60))
+    batches = []
+    real = sentiment.score_texts
+    monkeypatch.setattr(sentiment, "score_texts", lambda texts: batches.append(list(texts)) or real(texts))
+
+    sentiment.score_items(["Stock rallies", "Stock slumps"])
+    sentiment.score_items(["stock  RALLIES", "New headline beats"])
+    assert batches == [["Stock rallies", "Stock slumps"], ["New headline beats"]]
+
+
+def test_aggregated_sentiment_reuses_fetched_items(monkeypatch):
+    monkeypatch.setattr(scrapers, "_recent_items", TTLCache(maxsize=16, ttl=60))
+    calls = []
+
+    def fake_news(ticker):
+        calls.append("news")
+        scrapers._remember_items("news", ticker, [{"title": "Strong growth, buy", "source": "news"}])
+        return "1. [Test] Strong growth, buy"
+
+    monkeypatch.setattr(scrapers, "get_news", fake_news)
+    monkeypatch.setattr(scrapers, "get_reddit_posts", lambda ticker: calls.append("social") or "")
+
+    assert scrapers.get_aggregated_sentiment("TSLA", fetch_missing=False)["overall_score"] == 0.0
+    result = scrapers.get_aggregated_sentiment("tsla")
+    assert result["news"]["count"] == 1 and result["overall_score"] > 0
+    assert calls == ["news", "social"]
+
+    scrapers.get_aggregated_sentiment("TSLA")
+    assert calls == ["news", "social", "social"]
+
+
+def test_reddit_posts_share_the_item_score_cache(monkeypatch):
+    monkeypatch.setattr(sentiment, "_score_cache", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(scrapers, "_recent_items", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(scrapers, "acquire", lambda provider: True)
+    monkeypatch.setenv("REDDIT_CLIENT_ID", "id")
+    monkeypatch.setenv("REDDIT_CLIENT_SECRET", "secret")
+
+    class Post:
+        selftext, score, created_utc = "", 10, time.time()
+
+        def __init__(self, title):
+            self.title = title
+
+    class Reddit:
+        def subreddit(self, name):
+            return type("Sub", (), {"search": lambda _self, *a, **k: [Post(f"Buy {name}")]})()
+
+    monkeypatch.setattr(scrapers, "_get_reddit_client", lambda *a: Reddit())
+    batches = []
+    real = sentiment.score_texts
+    monkeypatch.setattr(sentiment, "score_texts", lambda texts: batches.append(list(texts)) or real(texts))
+
+    scrapers.get_reddit_posts("TSLA")
+    scrapers.get_reddit_posts("TSLA")
+    assert len(batches) == 1 and len(batches[0]) == 4
+    # The aggregate scores the same posts from the cache.
+    scrapers.get_aggregated_sentiment("TSLA", fetch_missing=False)
+    assert len(batches) == 1
@@ -0,0 +1,53 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from api.backend import brain, main
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    counts = {"configure": 0, "model": 0}
+
+    def configure(api_key):
+        counts["configure"] += 1
+
+    class FakeModel:
+        def __init__(self, name):
+            counts["model"] += 1
+
+    genai = pytest.importorskip("google.generativeai")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(genai, "configure", configure)
+    monkeypatch.setattr(genai, "GenerativeModel", FakeModel)
+    brain.shutdown_analyst()
+    yield counts
+    brain.shutdown_analyst()
+
+
+def test_model_is_configured_once(fake_genai):
+    first = brain.FinancialAnalyst()
+    second = brain.FinancialAnalyst()
+
+    assert first.model is second.model
+    assert fake_genai == {"configure": 1, "model": 1}
+
+
+def test_get_analyst_is_shared_across_threads(fake_genai):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        analysts = list(pool.map(lambda _: brain.get_analyst(), range(32)))
+
+    assert all(a is analysts[0] for a in analysts)
+    assert fake_genai["model"] == 1
+
+
+def test_lifespan_builds_and_releases_analyst(fake_genai):
+    with TestClient(main.app) as client:
+        assert client.get("/api/health").status_code == 200
+        # Built in the background at startup; a request-path lookup reuses it.
+        brain.get_analyst()
+        assert fake_genai["model"] == 1
+    assert brain._analyst is None
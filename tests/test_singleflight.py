@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from api.backend import main
+from api.backend.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def run():
+        return await asyncio.gather(*(flights.do("TSLA", work) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == {"value": 42} for r in results)
+    assert flights.stats()["coalesced_waiters"] == 4
+    assert flights.stats()["inflight_keys"] == 0
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(flights.do("TSLA", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_analyze_endpoint_coalesces_same_ticker(monkeypatch):
+    runs = []
+
+    def slow_run(ticker, prefetched=None):
+        runs.append(ticker)
+        time.sleep(0.2)
+        return {"success": True, "ticker": ticker}
+
+    monkeypatch.setattr(main, "run_analysis", slow_run)
+    monkeypatch.setattr(main, "_analysis_flights", SingleFlight(name="analyze"))
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            tickers = ["tsla", "TSLA", " Tsla ", "TSLA", "AAPL"]
+            return await asyncio.gather(*(client.get("/api/analyze", params={"ticker": t}) for t in tickers))
+
+    responses = asyncio.run(run())
+    assert [r.json()["ticker"] for r in responses] == ["TSLA", "TSLA", "TSLA", "TSLA", "AAPL"]
+    assert sorted(runs) == ["AAPL", "TSLA"]
+    assert main._analysis_flights.stats()["coalesced_waiters"] == 3
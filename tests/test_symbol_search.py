@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import pytest
+from fastapi.testclient import TestClient
+from api.backend import main
+from api.backend.cache import TTLCache
+from api.backend.symbols import SymbolIndex, get_symbol_index, SYMBOLS_PATH, edit_distance
+
+
+@pytest.mark.parametrize("query,ticker", [
+    ("Zomato", "ETERNAL.NS"), ("Tata", "TATAMOTORS.NS"), ("Reliance", "RELIANCE.NS"),
+    ("Adani", "ADANIENT.NS"), ("Mahindra", "M&M.NS"), ("HDFC", "HDFCBANK.NS"), ("wipro", "WIPRO.NS"),
+])
+def test_rebrands_and_brand_names_resolve_locally(query, ticker):
+    best = get_symbol_index().search(query)[0]
+    assert best["ticker"] == ticker and best["match"] == "exact"
+
+
+def test_prefix_and_typo_lookup():
+    index = get_symbol_index()
+    assert index.search("appl")[0]["ticker"] == "AAPL"
+    assert {m["ticker"] for m in index.search("tata")} >= {"TATAMOTORS.NS", "TCS.NS", "TATASTEEL.NS"}
+    assert index.search("relaince")[0] == {**index.search("reliance")[0], "match": "fuzzy"}
+    assert index.search("nvdia")[0]["ticker"] == "NVDA"
+    assert index.search("qqqzzx") == []
+    assert edit_distance("wirpo", "wipro", 2) == 1
+
+
+def test_long_queries_skip_the_fuzzy_pass():
+    index = get_symbol_index()
+    start = time.perf_counter()
+    assert index.search("relaince " * 40) == []
+    assert time.perf_counter() - start < 0.1
+
+
+class FakeAnalyst:
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    def search_ticker(self, query):
+        self.calls.append(query)
+        return self.answers.get(query, {"error": "Search failed"})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "get_symbol_index", lambda: SymbolIndex().load_csv(SYMBOLS_PATH))
+    monkeypatch.setattr(main, "_search_misses", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(main, "_search_learned", TTLCache(maxsize=16, ttl=60))
+    monkeypatch.setattr(main, "get_stock_price", lambda ticker: {"price": 1.0, "source": "yfinance"})
+    return TestClient(main.app)
+
+
+def test_search_uses_the_llm_only_for_misses(client, monkeypatch):
+    index = SymbolIndex().load_csv(SYMBOLS_PATH)
+    monkeypatch.setattr(main, "get_symbol_index", lambda: index)
+    analyst = FakeAnalyst({"Hyundai Motor India": {"ticker": "HYUNDAI.NS", "name": "Hyundai Motor India Ltd",
+                                                    "currency": "INR", "exchange": "NSE"}})
+    monkeypatch.setattr(main, "get_analyst", lambda: analyst)
+
+    hit = client.post("/api/search", json={"query": "zomato"}).json()
+    assert hit["ticker"] == "ETERNAL.NS" and hit["source"] == "index"
+
+    miss = client.post("/api/search", json={"query": "Hyundai Motor India"}).json()
+    assert miss["ticker"] == "HYUNDAI.NS" and miss["source"] == "ai"
+    learned = client.post("/api/search", json={"query": "hyundai motor india"}).json()
+    assert learned["ticker"] == "HYUNDAI.NS" and learned["source"] == "learned"
+    assert index.search("hyundai motor india") == []
+
+    for _ in range(2):
+        assert "error" in client.post("/api/search", json={"query": "Qqqzzx Holdings"}).json()
+    assert analyst.calls == ["Hyundai Motor India", "Qqqzzx Holdings"]
+
+
+def test_unquotable_answers_are_not_learned(client, monkeypatch):
+    analyst = FakeAnalyst({"Made Up Corp": {"ticker": "MADEUP.NS", "name": "Made Up Corp"}})
+    monkeypatch.setattr(main, "get_analyst", lambda: analyst)
+    monkeypatch.setattr(main, "get_stock_price", lambda ticker: {"price": 1.0, "source": "Emergency Mock"})
+
+    for _ in range(2):
+        assert client.post("/api/search", json={"query": "Made Up Corp"}).json()["source"] == "ai"
+    assert analyst.calls == ["Made Up Corp", "Made Up Corp"]
+    assert len(main._search_learned) == 0
+
+
+def test_empty_query_is_rejected(client):
+    assert client.post("/api/search", json={"query": "  "}).status_code == 400
+
+
+def test_oversized_query_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(main, "get_analyst", lambda: pytest.fail("LLM asked about an oversized query"))
+    assert client.post("/api/search", json={"query": "x" * 1024}).status_code == 422
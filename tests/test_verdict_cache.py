@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from api.backend import brain
+
+
+class CountingAnalyst:
+    calls = 0
+
+    def analyze(self, context, analysis_type="Investment Decision"):
+        CountingAnalyst.calls += 1
+        return {"verdict": "BUY", "confidence": 80, "reasons": [], "ai_explanation": "ok"}
+
+
+@pytest.fixture(autouse=True)
+def fake_analyst(monkeypatch):
+    CountingAnalyst.calls = 0
+    monkeypatch.setattr(brain, "get_analyst", CountingAnalyst)
+    brain._verdict_cache.clear()
+    yield
+    brain._verdict_cache.clear()
+
+
+NEWS = "1. [Reuters] Tesla beats estimates\n2. [CNBC] Deliveries rise"
+SOCIAL = "1. [r/stocks] (🟢 Bullish) TSLA to the moon | ⬆️ 120"
+
+
+def test_same_inputs_skip_the_model():
+    brain.quick_analyze("TSLA", {"price": 250.00}, NEWS, SOCIAL)
+    result = brain.quick_analyze("TSLA", {"price": 250.40}, NEWS, SOCIAL)
+
+    assert CountingAnalyst.calls == 1
+    assert result["verdict"] == "BUY"
+    assert brain.verdict_cache_stats()["hits"] == 1
+
+
+def test_fingerprint_ignores_order_numbering_and_votes():
+    reordered = "1. [CNBC] Deliveries rise\n2. [Reuters] Tesla beats estimates"
+    more_votes = "1. [r/stocks] (🟢 Bullish) TSLA to the moon | ⬆️ 340"
+
+    assert brain.analysis_fingerprint("TSLA", {"price": 250}, NEWS, SOCIAL) == \
+        brain.analysis_fingerprint("tsla", {"price": 250}, reordered, more_votes)
+
+
+def test_fingerprint_ignores_new_tags():
+    tagged = "1. [NEW] [Reuters] Tesla beats estimates\n2. [CNBC] Deliveries rise"
+
+    assert brain.analysis_fingerprint("TSLA", {"price": 250}, NEWS, SOCIAL) == \
+        brain.analysis_fingerprint("TSLA", {"price": 250}, tagged, SOCIAL)
+
+
+def test_changed_inputs_miss_the_cache():
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS, SOCIAL)
+    brain.quick_analyze("TSLA", {"price": 270.0}, NEWS, SOCIAL)
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS + "\n3. [WSJ] Recall announced", SOCIAL)
+
+    assert CountingAnalyst.calls == 3
+
+
+def test_fallback_verdicts_are_not_cached(monkeypatch):
+    monkeypatch.setattr(CountingAnalyst, "analyze", lambda self, ctx: {"verdict": "HOLD", "error": "quota"})
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS, SOCIAL)
+    assert len(brain._verdict_cache) == 0
+
+
+def test_new_indicators_miss_the_cache():
+    indicators = {"as_of": "2024-01-02", "rsi_14": 55.2, "sma_20": 240.1}
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS, SOCIAL, indicators)
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS, SOCIAL, dict(indicators))
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS, SOCIAL, dict(indicators, as_of="2024-01-03"))
+    brain.quick_analyze("TSLA", {"price": 250.0}, NEWS, SOCIAL, dict(indicators, rsi_14=71.8))
+
+    assert CountingAnalyst.calls == 3